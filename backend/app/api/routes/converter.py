@@ -1,23 +1,89 @@
 """
 Converter API routes for DWG to PDF conversion with natural language processing
 """
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse
+from functools import lru_cache
 from typing import Optional, Dict, Any
-import uuid
 import os
-import json
-from pathlib import Path
+import re
+import orjson
 from typing import Dict, Any
 from app.tasks.converter_tasks import process_dwg_conversion_with_params
-from app.services.jobs import JobService
+from app.api.routes.jobs import get_job_service
+from app.core.settings import get_settings
+from app.services.jobs import JobService, new_job_id, write_upload
 from app.models.jobs import JobCreate, JobStatus
 import logging
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/converter", tags=["converter"])
+router = APIRouter()
+
+# Margin patterns paired with the factor converting the captured value to mm
+_MARGIN_PATTERNS = (
+    (re.compile(r'(\d+)\s*mm'), 1.0),  # e.g., "10mm", "10 mm"
+    (re.compile(r'(\d+(?:\.\d+)?)\s*cm'), 10.0),  # e.g., "1.5cm", "1.5 cm"
+    (re.compile(r'边距\s*(\d+)'), 1.0),  # Chinese pattern: "边距10"
+)
+
+# Paper size tokens; ASCII-only boundaries so "A4纸" matches but "a4paper" does not
+_PAPER_RE = re.compile(r'(?<![a-z0-9])(a[0-4]|letter|legal)(?![a-z0-9])')
+_PAPER_MAP = {
+    "a0": "A0",
+    "a1": "A1",
+    "a2": "A2",
+    "a3": "A3",
+    "a4": "A4",
+    "letter": "Letter",
+    "legal": "Legal",
+}
+
+# Keyword groups by category, scanned in a single pass over the request
+_KEYWORD_GROUPS = (
+    # Color modes
+    ("monochrome", ("黑白", "黑白色", "单色", "monochrome", "black and white")),
+    ("grayscale", ("灰度", "grayscale", "gray", "灰色")),
+    ("color", ("彩色", "color", "彩色打印", "彩印")),
+    # Layout
+    ("center", ("居中", "center", "中间对齐")),
+    ("left", ("左对齐", "left align")),
+    ("auto_fit", ("自动适应", "auto fit", "自动调整", "自适应")),
+    ("manual", ("不自动", "manual", "手动", "固定尺寸")),
+    # Quality
+    ("quality", ("高清", "high quality", "高质量", "hq")),
+)
+
+def _build_keyword_table(groups) -> Dict[str, str]:
+    """Map each keyword to its category, rejecting literals listed more than once"""
+    table: Dict[str, str] = {}
+    for category, words in groups:
+        for word in words:
+            if word in table:
+                raise ValueError(f"keyword {word!r} listed for both {table[word]!r} and {category!r}")
+            table[word] = category
+    return table
+
+_KEYWORDS = _build_keyword_table(_KEYWORD_GROUPS)
+
+# Zero-width lookahead so overlapping keywords (e.g. "不自动适应") are all reported;
+# longest first so keywords sharing a prefix resolve to the most specific one
+_KEYWORD_RE = re.compile(
+    "(?=(%s))" % "|".join(re.escape(word) for word in sorted(_KEYWORDS, key=len, reverse=True))
+)
+
+# Layer extraction patterns
+_LAYER_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'只导出["\']?([^"\']+)["\']?图层',  # "只导出"墙体"图层"
+        r'导出["\']?([^"\']+)["\']?图层',   # "导出"墙体"图层"
+        r'图层["\']?([^"\']+)["\']?',      # "图层"墙体""
+        r'layer["\']?([^"\']+)["\']?',    # "layer"walls""
+        r'仅包含["\']?([^"\',]+)["\']?(?:和|及|与|["\']?\s*["\']?)(["\']?([^"\',]+)["\']?)\s*图层',  # "仅包含"墙体"和"门窗"图层"
+    )
+)
 
 class AnalysisRequest(BaseModel):
     """Request model for natural language analysis"""
@@ -36,6 +102,32 @@ def analyze_natural_language_request(user_request: str) -> Dict[str, Any]:
     :return: Dictionary of conversion parameters
     """
 
+    params = dict(_analyze_normalized_request(_normalize_request(user_request)))
+    if params["layers"] is not None:
+        params["layers"] = list(params["layers"])
+    return params
+
+@lru_cache(maxsize=1024)
+def _normalize_request(user_request: str) -> str:
+    """
+    Lowercase and collapse whitespace so equivalent presets share a cache entry;
+    memoized on the raw text so repeated requests skip the lower/split/join work
+
+    :param user_request: Raw request text
+    :return: Normalized request text
+    """
+    return " ".join(user_request.lower().split())
+
+@lru_cache(maxsize=1024)
+def _analyze_normalized_request(request_lower: str) -> tuple[tuple[str, Any], ...]:
+    """
+    Analyze a normalized request; returns immutable items so cached results
+    cannot be mutated by callers
+
+    :param request_lower: Lowercased, whitespace-collapsed request text
+    :return: Tuple of (parameter, value) pairs
+    """
+
     # Default parameters
     params = {
         "auto_fit": True,
@@ -47,81 +139,52 @@ def analyze_natural_language_request(user_request: str) -> Dict[str, Any]:
         "layers": None  # List of specific layers to export
     }
 
-    # Convert to lowercase for easier matching
-    request_lower = user_request.lower()
-
-    # Paper size detection
-    paper_sizes = {
-        "a4": "A4",
-        "a3": "A3",
-        "a2": "A2",
-        "a1": "A1",
-        "a0": "A0",
-        "letter": "Letter",
-        "legal": "Legal"
-    }
+    # Collect every keyword hit in one scan over the request
+    categories = {_KEYWORDS[match.group(1)] for match in _KEYWORD_RE.finditer(request_lower)}
 
-    for size_key, size_value in paper_sizes.items():
-        if size_key in request_lower:
-            params["paper_size"] = size_value
-            break
+    # Paper size detection (first size mentioned wins)
+    paper_match = _PAPER_RE.search(request_lower)
+    if paper_match:
+        params["paper_size"] = _PAPER_MAP[paper_match.group(1)]
 
     # Margin detection (look for numbers followed by 'mm' or 'cm')
-    import re
-    margin_patterns = [
-        r'(\d+)\s*mm',  # e.g., "10mm", "10 mm"
-        r'(\d+(?:\.\d+)?)\s*cm',  # e.g., "1.5cm", "1.5 cm"
-        r'边距\s*(\d+)',  # Chinese pattern: "边距10"
-    ]
-
-    for pattern in margin_patterns:
-        match = re.search(pattern, request_lower)
+    for pattern, scale in _MARGIN_PATTERNS:
+        match = pattern.search(request_lower)
         if match:
-            margin_value = float(match.group(1))
-            if 'cm' in pattern:
-                margin_value *= 10  # Convert cm to mm
-            params["margin"] = margin_value
+            params["margin"] = float(match.group(1)) * scale
             break
 
     # Color/Grayscale/Monochrome detection
-    if any(word in request_lower for word in ["黑白", "黑白色", "单色", "monochrome", "black and white"]):
+    if "monochrome" in categories:
         params["monochrome"] = True
         params["grayscale"] = False
-    elif any(word in request_lower for word in ["灰度", "grayscale", "gray", "灰色"]):
+    elif "grayscale" in categories:
         params["grayscale"] = True
         params["monochrome"] = False
-    elif any(word in request_lower for word in ["彩色", "color", "彩色打印", "彩印"]):
+    elif "color" in categories:
         params["grayscale"] = False
         params["monochrome"] = False
 
     # Layout settings
-    if any(word in request_lower for word in ["居中", "center", "中间对齐"]):
+    if "center" in categories:
         params["center"] = True
-    elif any(word in request_lower for word in ["左对齐", "left align", "左对齐"]):
+    elif "left" in categories:
         params["center"] = False
 
-    if any(word in request_lower for word in ["自动适应", "auto fit", "自动调整", "自适应"]):
+    if "auto_fit" in categories:
         params["auto_fit"] = True
-    elif any(word in request_lower for word in ["不自动", "manual", "手动", "固定尺寸"]):
+    elif "manual" in categories:
         params["auto_fit"] = False
 
     # Quality settings
-    if any(word in request_lower for word in ["高清", "high quality", "高质量", "hq"]):
+    if "quality" in categories:
         # Could be used for future quality parameter
         pass
 
     # Layer extraction detection
-    layer_patterns = [
-        r'只导出["\']?([^"\']+)["\']?图层',  # "只导出"墙体"图层"
-        r'导出["\']?([^"\']+)["\']?图层',   # "导出"墙体"图层"
-        r'图层["\']?([^"\']+)["\']?',      # "图层"墙体""
-        r'layer["\']?([^"\']+)["\']?',    # "layer"walls""
-        r'仅包含["\']?([^"\',]+)["\']?(?:和|及|与|["\']?\s*["\']?)(["\']?([^"\',]+)["\']?)\s*图层',  # "仅包含"墙体"和"门窗"图层"
-    ]
-
     detected_layers = []
-    for pattern in layer_patterns:
-        matches = re.findall(pattern, request_lower, re.IGNORECASE)
+    for pattern in _LAYER_PATTERNS:
+        matches = pattern.findall(request_lower)
         for match in matches:
             if isinstance(match, tuple):
                 # Handle tuple from the last pattern (multiple layers)
@@ -134,9 +197,9 @@ def analyze_natural_language_request(user_request: str) -> Dict[str, Any]:
 
     # Remove duplicates
     if detected_layers:
-        params["layers"] = list(set(detected_layers))
+        params["layers"] = tuple(set(detected_layers))
 
-    return params
+    return tuple(params.items())
 
 def generate_requirements_summary(params: Dict[str, Any], user_request: str) -> str:
     """
@@ -184,7 +247,7 @@ async def analyze_request(request: AnalysisRequest):
     :return: Analyzed parameters and requirements summary
     """
     try:
-        logger.info(f"Analyzing request: {request.request}")
+        logger.info("Analyzing request: %s", request.request)
 
         # Analyze the natural language request
         params = analyze_natural_language_request(request.request)
@@ -192,21 +255,20 @@ async def analyze_request(request: AnalysisRequest):
         # Generate human-readable summary
         summary = generate_requirements_summary(params, request.request)
 
-        logger.info(f"Analyzed parameters: {params}")
+        logger.info("Analyzed parameters: %s", params)
 
-        return AnalysisResponse(
-            params=params,
-            interpreted_requirements=summary
-        )
+        # Return the response directly; response_model only documents the schema
+        return ORJSONResponse({"params": params, "interpreted_requirements": summary})
 
     except Exception as e:
-        logger.error(f"Error analyzing request: {str(e)}")
+        logger.error("Error analyzing request: %s", e)
         raise HTTPException(status_code=500, detail=f"分析失败: {str(e)}")
 
 @router.post("/convert-dwg")
 async def convert_dwg_file(
     dwg_file: UploadFile = File(..., description="DWG file to convert"),
-    params: str = Form(..., description="JSON string of conversion parameters")
+    params: str = Form(..., description="JSON string of conversion parameters"),
+    job_service: JobService = Depends(get_job_service),
 ):
     """
     Convert DWG file to PDF with specified parameters
@@ -222,53 +284,54 @@ async def convert_dwg_file(
 
         # Parse parameters
         try:
-            conversion_params = json.loads(params)
-        except json.JSONDecodeError:
+            conversion_params = orjson.loads(params)
+        except orjson.JSONDecodeError:
             raise HTTPException(status_code=400, detail="参数格式错误")
 
         # Generate job ID
-        job_id = str(uuid.uuid4())
+        job_id = new_job_id()
 
         # Create job directory
-        job_dir = Path("storage") / "jobs" / job_id
-        job_dir.mkdir(parents=True, exist_ok=True)
+        job_dir = job_service.create_job_dir(job_id)
 
         # Save uploaded file
         dwg_path = job_dir / f"input_{dwg_file.filename}"
 
-        with open(dwg_path, "wb") as f:
-            f.write(await dwg_file.read())
+        stored_dwg = await write_upload(dwg_file, dwg_path, kind="original")
 
         # Create job record
         job_data = JobCreate(
             id=job_id,
             origin_filename=dwg_file.filename,
             target_filename="output.pdf",
-            status=JobStatus.PENDING
+            status=JobStatus.QUEUED
         )
 
-        job_service = JobService(Path("storage"))
-        job = job_service.create_job_from_data(job_data)
+        job = job_service.create_job_from_data(job_data, original_files=[stored_dwg])
 
         # Start conversion task
-        process_dwg_conversion_with_params.delay(job_id, str(dwg_path), conversion_params)
+        # Eager runs record a failed task on the job instead of failing the submission
+        if get_settings().celery_task_always_eager:
+            process_dwg_conversion_with_params.apply(args=(job_id, str(dwg_path), conversion_params), throw=False)
+        else:
+            process_dwg_conversion_with_params.delay(job_id, str(dwg_path), conversion_params)
 
-        logger.info(f"Started DWG conversion job {job_id} for file {dwg_file.filename}")
+        logger.info("Started DWG conversion job %s for file %s", job_id, dwg_file.filename)
 
         return {
             "job_id": job_id,
-            "status": "processing",
+            "status": "queued",
             "message": "转换任务已提交"
         }
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error starting DWG conversion: {str(e)}")
+        logger.error("Error starting DWG conversion: %s", e)
         raise HTTPException(status_code=500, detail=f"转换失败: {str(e)}")
 
 @router.get("/job/{job_id}")
-async def get_conversion_job_status(job_id: str):
+async def get_conversion_job_status(job_id: str, job_service: JobService = Depends(get_job_service)):
     """
     Get conversion job status and results
 
@@ -276,7 +339,6 @@ async def get_conversion_job_status(job_id: str):
     :return: Job status and results
     """
     try:
-        job_service = JobService(Path("storage"))
         job = job_service.load_job(job_id)
 
         # Get task result if completed
@@ -301,11 +363,11 @@ async def get_conversion_job_status(job_id: str):
         }
 
     except Exception as e:
-        logger.error(f"Error getting job status: {str(e)}")
+        logger.error("Error getting job status: %s", e)
         raise HTTPException(status_code=500, detail=f"获取任务状态失败: {str(e)}")
 
 @router.get("/job/{job_id}/download")
-async def download_converted_file(job_id: str):
+async def download_converted_file(job_id: str, job_service: JobService = Depends(get_job_service)):
     """
     Download converted PDF file
 
@@ -313,25 +375,28 @@ async def download_converted_file(job_id: str):
     :return: PDF file download
     """
     try:
-        job_service = JobService(Path("storage"))
-
         # Get the converted file
         try:
             report_file = job_service.get_report_file(job_id, "pdf")
         except Exception:
             raise HTTPException(status_code=404, detail="转换文件未找到")
 
-        if not report_file.path or not Path(report_file.path).exists():
+        if not report_file.path:
+            raise HTTPException(status_code=404, detail="转换文件未找到")
+        try:
+            stat_result = os.stat(report_file.path)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="转换文件未找到")
 
         return FileResponse(
             path=report_file.path,
             filename=report_file.name,
-            media_type="application/pdf"
+            media_type="application/pdf",
+            stat_result=stat_result
         )
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error downloading converted file: {str(e)}")
+        logger.error("Error downloading converted file: %s", e)
         raise HTTPException(status_code=500, detail=f"下载失败: {str(e)}")
\ No newline at end of file
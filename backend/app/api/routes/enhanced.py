@@ -1,20 +1,21 @@
 """
 Enhanced API routes for AutoCAD integration
 """
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
 from fastapi.responses import FileResponse, JSONResponse
 from typing import Optional
-import uuid
+import asyncio
 import os
-from pathlib import Path
 from app.tasks.enhanced_jobs import process_dwg_files_with_autocad
-from app.services.jobs import JobService
+from app.api.routes.jobs import get_job_service
+from app.core.settings import get_settings
+from app.services.jobs import JobService, new_job_id, write_upload
 from app.models.jobs import JobCreate, JobStatus
 import logging
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/enhanced", tags=["enhanced"])
+router = APIRouter()
 
 @router.post("/process-dwg")
 async def process_dwg_files(
@@ -25,7 +26,8 @@ async def process_dwg_files(
     paper_size: Optional[str] = Form(None),
     margin: Optional[float] = Form(None),
     grayscale: bool = Form(False),
-    monochrome: bool = Form(False)
+    monochrome: bool = Form(False),
+    job_service: JobService = Depends(get_job_service),
 ):
     """
     Process DWG files using AutoCAD integration
@@ -42,44 +44,49 @@ async def process_dwg_files(
     """
     try:
         # Generate job ID
-        job_id = str(uuid.uuid4())
+        job_id = new_job_id()
         
         # Create job directory
-        job_dir = Path("storage") / "jobs" / job_id
-        job_dir.mkdir(parents=True, exist_ok=True)
+        job_dir = job_service.create_job_dir(job_id)
         
         # Save uploaded files
         origin_path = job_dir / f"origin_{origin_file.filename}"
         target_path = job_dir / f"target_{target_file.filename}"
         
-        with open(origin_path, "wb") as f:
-            f.write(await origin_file.read())
-        
-        with open(target_path, "wb") as f:
-            f.write(await target_file.read())
+        stored_origin, stored_target = await asyncio.gather(
+            write_upload(origin_file, origin_path, kind="original"),
+            write_upload(target_file, target_path, kind="revised"),
+        )
         
         # Create job record
         job_data = JobCreate(
             id=job_id,
             origin_filename=origin_file.filename,
             target_filename=target_file.filename,
-            status=JobStatus.PENDING
+            status=JobStatus.QUEUED
         )
         
-        job_service = JobService(Path("storage"))
-        job = job_service.create_job_from_data(job_data)
+        job = job_service.create_job_from_data(
+            job_data,
+            original_files=[stored_origin],
+            revised_files=[stored_target],
+        )
         
         # Start processing task
-        process_dwg_files_with_autocad.delay(job_id, str(origin_path), str(target_path))
+        # Eager runs record a failed task on the job instead of failing the submission
+        if get_settings().celery_task_always_eager:
+            process_dwg_files_with_autocad.apply(args=(job_id, str(origin_path), str(target_path)), throw=False)
+        else:
+            process_dwg_files_with_autocad.delay(job_id, str(origin_path), str(target_path))
         
-        return {"job_id": job_id, "status": "processing"}
+        return {"job_id": job_id, "status": "queued"}
         
     except Exception as e:
-        logger.error(f"Error processing DWG files: {str(e)}")
+        logger.error("Error processing DWG files: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/job/{job_id}")
-async def get_enhanced_job_status(job_id: str):
+async def get_enhanced_job_status(job_id: str, job_service: JobService = Depends(get_job_service)):
     """
     Get enhanced job status
     
@@ -87,7 +94,6 @@ async def get_enhanced_job_status(job_id: str):
     :return: Job status and results
     """
     try:
-        job_service = JobService(Path("storage"))
         job = job_service.load_job(job_id)
 
         # Get task result if completed
@@ -98,5 +104,5 @@ async def get_enhanced_job_status(job_id: str):
         return {"job_id": job_id, "status": job.status}
         
     except Exception as e:
-        logger.error(f"Error getting job status: {str(e)}")
+        logger.error("Error getting job status: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -1,37 +1,51 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import os
 from pathlib import Path
 
 from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 
+from app.core.clock import utc_now_iso
 from app.core.settings import get_settings
-from app.models import Envelope, JobCreatedPayload, JobDiffPayload, JobListPayload, JobStatusPayload, JobSummary
-from app.services import JobService
+from app.models import Envelope, JobCreatedPayload, JobDiffPayload, JobListPayload, JobStatusPayload, ok
+from app.services import JobService, cached_job_service
 from app.tasks import process_job_task
 
 
 router = APIRouter()
 
-SUPPORTED_CONTENT_TYPES = {
-    "application/dwg",
-    "application/octet-stream",
-    "application/acad",
-    "image/vnd.dwg",
-}
-
+SUPPORTED_CONTENT_TYPES: frozenset[str] = frozenset(
+    {
+        "application/dwg",
+        "application/octet-stream",
+        "application/acad",
+        "image/vnd.dwg",
+    }
+)
 
 def get_job_service() -> JobService:
     settings = get_settings()
-    return JobService(Path(settings.storage_dir))
+    return cached_job_service(settings.storage_dir)
+
+
+def _envelope_response(payload, status_code: int = status.HTTP_200_OK) -> ORJSONResponse:
+    """Serialize an already-validated payload directly.
+
+    Returning a response object skips FastAPI's re-validation of the body against
+    ``response_model``, which is kept on the routes for the OpenAPI schema, and
+    ``ok`` builds the envelope without constructing an ``Envelope`` model.
+    """
+
+    return ORJSONResponse(ok(payload), status_code=status_code)
 
 
 def _validate_upload(upload: UploadFile, field_name: str) -> None:
-    if upload.content_type is None:
+    content_type = upload.content_type
+    if content_type is None:
         return
 
-    if upload.content_type.lower() not in SUPPORTED_CONTENT_TYPES:
+    if content_type.lower() not in SUPPORTED_CONTENT_TYPES:
         raise HTTPException(status_code=400, detail=f"{field_name} has an unsupported content type")
 
 
@@ -44,22 +58,12 @@ async def list_jobs(
     limit: int = Query(20, ge=1, le=100, description="Maximum number of jobs to return"),
     offset: int = Query(0, ge=0, description="Number of jobs to skip"),
     job_service: JobService = Depends(get_job_service),
-) -> Envelope[JobListPayload]:
+) -> ORJSONResponse:
     """Return paginated comparison jobs sorted by last update time."""
 
-    total, jobs = job_service.list_jobs(limit=limit, offset=offset)
-    summaries = [
-        JobSummary(
-            job_id=job.job_id,
-            status=job.status,
-            progress=job.progress,
-            created_at=job.created_at,
-            updated_at=job.updated_at,
-        )
-        for job in jobs
-    ]
-    payload = JobListPayload(total=total, limit=limit, offset=offset, jobs=summaries)
-    return Envelope(data=payload)
+    total, summaries = job_service.list_jobs_summary(limit=limit, offset=offset)
+    payload = JobListPayload.model_construct(total=total, limit=limit, offset=offset, jobs=summaries)
+    return _envelope_response(payload)
 
 
 @router.post(
@@ -72,22 +76,22 @@ async def create_job(
     original_dwg: UploadFile = File(...),
     revised_dwg: UploadFile = File(...),
     job_service: JobService = Depends(get_job_service),
-) -> Envelope[JobCreatedPayload]:
+) -> ORJSONResponse:
     """Accept two DWG files and enqueue a comparison job."""
 
     _validate_upload(original_dwg, "original_dwg")
     _validate_upload(revised_dwg, "revised_dwg")
 
     metadata = await job_service.create_job(original_dwg, revised_dwg)
-    enqueue_logs = metadata.logs + [
+    job_service.append_log(
+        metadata.job_id,
         {
             "step": "enqueue",
             "status": "queued",
             "level": "info",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-        }
-    ]
-    metadata = job_service.update_metadata(metadata.job_id, logs=enqueue_logs)
+            "timestamp": utc_now_iso(),
+        },
+    )
 
     settings = get_settings()
     if settings.celery_task_always_eager:
@@ -99,7 +103,7 @@ async def create_job(
             raise HTTPException(status_code=500, detail="Failed to enqueue job") from exc
 
     payload = JobCreatedPayload(job_id=metadata.job_id, status=metadata.status)
-    return Envelope(data=payload)
+    return _envelope_response(payload, status_code=status.HTTP_202_ACCEPTED)
 
 
 @router.get(
@@ -110,7 +114,7 @@ async def create_job(
 async def get_job_status(
     job_id: str,
     job_service: JobService = Depends(get_job_service),
-) -> Envelope[JobStatusPayload]:
+) -> ORJSONResponse:
     """Return the current status for a comparison job."""
 
     try:
@@ -118,7 +122,7 @@ async def get_job_status(
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail="Job not found") from exc
 
-    return Envelope(data=status_payload)
+    return _envelope_response(status_payload)
 
 
 @router.get(
@@ -129,7 +133,7 @@ async def get_job_status(
 async def get_job_diff(
     job_id: str,
     job_service: JobService = Depends(get_job_service),
-) -> Envelope[JobDiffPayload]:
+) -> ORJSONResponse:
     """Return diff payload for a job."""
 
     try:
@@ -137,7 +141,7 @@ async def get_job_diff(
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail="Diff not found") from exc
 
-    return Envelope(data=diff_payload)
+    return _envelope_response(diff_payload)
 
 
 @router.get(
@@ -155,11 +159,15 @@ async def download_job_artefact(
         raise HTTPException(status_code=404, detail="Artefact not found") from exc
 
     path = Path(stored_file.path)
-    if not path.exists():
-        raise HTTPException(status_code=404, detail="Artefact file missing")
+    try:
+        # Stat once and hand the result to FileResponse instead of stat-ing again
+        stat_result = os.stat(path)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail="Artefact file missing") from exc
 
     return FileResponse(
         path=path,
         filename=stored_file.name,
         media_type=stored_file.content_type or "application/octet-stream",
+        stat_result=stat_result,
     )
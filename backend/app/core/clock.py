@@ -0,0 +1,23 @@
+"""Cheap UTC timestamp formatting for log entries."""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def _format_second(epoch_second: int) -> str:
+    return datetime.fromtimestamp(epoch_second, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def utc_now_iso() -> str:
+    """Return the current UTC time in ISO 8601 format with microsecond precision.
+
+    The date/time prefix is formatted once per wall-clock second and reused, so
+    bursts of log entries only pay for the microsecond suffix.
+    """
+
+    epoch_second, nanoseconds = divmod(time.time_ns(), 1_000_000_000)
+    return f"{_format_second(epoch_second)}.{nanoseconds // 1000:06d}+00:00"
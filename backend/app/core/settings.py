@@ -34,6 +34,13 @@ class Settings(BaseSettings):
         default=True,
         description="Whether eager tasks should propagate exceptions",
     )
+    parallel_dwg_conversion: bool = Field(
+        default=False,
+        description=(
+            "Convert both drawings of an enhanced job concurrently; each worker process then keeps "
+            "two AutoCAD sessions open for its lifetime instead of one"
+        ),
+    )
 
     model_config = SettingsConfigDict(env_file=".env", env_prefix="FLOORPLAN_", case_sensitive=False)
 
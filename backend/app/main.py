@@ -3,6 +3,7 @@ from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.router import api_router
 from app.core.settings import get_settings
@@ -26,6 +27,7 @@ def create_app() -> FastAPI:
         title=settings.api_title,
         version=settings.api_version,
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
     app.add_middleware(
         CORSMiddleware,
@@ -14,11 +14,12 @@ from .jobs import (
     JobSummary,
     StoredFile,
 )
-from .responses import Envelope, HealthData
+from .responses import Envelope, HealthData, ok
 
 __all__ = [
     "Envelope",
     "HealthData",
+    "ok",
     "DiffEntity",
     "DiffPolygon",
     "DiffSummary",
@@ -30,7 +30,8 @@ class StoredFile(BaseModel):
     name: str = Field(description="Original filename without path")
     path: str = Field(description="Absolute path to the file on disk")
     size: int = Field(ge=0, description="File size in bytes")
-    checksum: str = Field(description="SHA256 checksum")
+    checksum: str = Field(description="Hex digest of the file contents")
+    algorithm: str = Field(default="sha256", description="Hash algorithm used for the checksum")
     content_type: str | None = Field(default=None, description="Optional MIME type")
     kind: str | None = Field(default=None, description="Logical category of the file (e.g. original, diff)")
 
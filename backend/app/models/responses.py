@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Generic, TypeVar
+from typing import Any, Generic, TypeVar
 
 from pydantic import BaseModel, Field
 
@@ -19,3 +19,9 @@ class HealthData(BaseModel):
     """健康检查响应负载。"""
 
     status: str = Field(default="ok", description="服务状态")
+
+
+def ok(data: BaseModel | None = None) -> dict[str, Any]:
+    """构造成功响应的 JSON 数据（与 ``Envelope(data=data)`` 一致），跳过包装模型的校验。"""
+
+    return {"code": 0, "data": None if data is None else data.model_dump(mode="json"), "message": ""}
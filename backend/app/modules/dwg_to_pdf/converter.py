@@ -1,30 +1,181 @@
 """
 DWG to PDF converter module using AutoCAD
 """
+import atexit
+import hashlib
+import json
 import os
+import shutil
 import tempfile
 from pathlib import Path
 import logging
-from typing import Optional, Tuple
+import mmap
+from typing import List, Optional, Tuple
 import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor
 import time
-import win32com.client
-import pythoncom
+from functools import lru_cache
+
+try:  # pragma: no cover - optional dependency (Windows only)
+    import win32com.client
+    from win32com.client import gencache
+    import pythoncom
+
+    AUTOCAD_AVAILABLE = True
+except ImportError:  # pragma: no cover - executed when pywin32 missing
+    AUTOCAD_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Polling used instead of a fixed sleep while AutoCAD finishes loading a drawing
+QUIESCENT_POLL_INTERVAL = 0.05
+QUIESCENT_TIMEOUT = 30.0
+
+AUTOCAD_PROG_ID = "AutoCAD.Application"
+
+# Upper bound on concurrent AutoCAD processes (memory / licence limits)
+MAX_AUTOCAD_WORKERS = 4
+
+# Content-addressed cache of converted PDFs
+DEFAULT_CACHE_DIR = Path(tempfile.gettempdir()) / "dwg2pdf"
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 ** 3
+CACHE_KEY_VERSION = "1"
+
+
+_com_state = threading.local()
+
+
+def _ensure_com_initialized() -> None:
+    """
+    Initialize COM once per thread and keep the apartment for its lifetime
+
+    Repeated CoInitialize/CoUninitialize pairs tear down apartment state the
+    long-lived AutoCAD connection depends on.
+    """
+    if getattr(_com_state, "initialized", False):
+        return
+    pythoncom.CoInitialize()
+    _com_state.initialized = True
+    if threading.current_thread() is threading.main_thread():
+        atexit.register(pythoncom.CoUninitialize)
+
+
+def _dispatch_autocad(private: bool = False):
+    """
+    Connect to AutoCAD through early-bound (makepy) wrappers
+
+    Early binding calls the typed vtable slots generated from the AutoCAD
+    type library instead of resolving every member through
+    ``IDispatch::Invoke``. Falls back to late binding when the wrappers
+    cannot be generated (e.g. read-only gen_py cache).
+
+    :param private: Start a new AutoCAD process instead of attaching to a
+        running one (``Dispatch`` always returns the same single-threaded server)
+    :return: AutoCAD application object
+    """
+    if private:
+        acad = win32com.client.DispatchEx(AUTOCAD_PROG_ID)
+        try:
+            return gencache.EnsureDispatch(acad)
+        except Exception as e:
+            logger.warning("Early binding unavailable, using late-bound dispatch: %s", e)
+            return acad
+    try:
+        return gencache.EnsureDispatch(AUTOCAD_PROG_ID)
+    except Exception as e:
+        logger.warning("Early binding unavailable, using late-bound dispatch: %s", e)
+        return win32com.client.Dispatch(AUTOCAD_PROG_ID)
+
 class DWGToPDFConverter:
     """
     A class to handle DWG to PDF conversion using AutoCAD
+
+    The AutoCAD COM instance is started lazily and kept alive while the
+    converter is open (``with DWGToPDFConverter() as converter: ...``), so a
+    batch of drawings pays the AutoCAD start-up cost only once.
     """
     
-    def __init__(self, autocad_path: Optional[str] = None):
+    def __init__(self,
+                 autocad_path: Optional[str] = None,
+                 cache_dir: Optional[Path] = None,
+                 use_cache: bool = True,
+                 cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 private_instance: bool = False):
         """
         Initialize the converter
         
         :param autocad_path: Path to AutoCAD executable (optional)
+        :param cache_dir: Directory for cached PDFs (defaults to DEFAULT_CACHE_DIR)
+        :param use_cache: Reuse earlier conversions of identical input and options
+        :param cache_max_bytes: Size bound of the cache, oldest entries are evicted first
+        :param private_instance: Start a dedicated AutoCAD process that is quit on close
         """
         self.autocad_path = autocad_path
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR) if use_cache else None
+        self.cache_max_bytes = cache_max_bytes
+        self.private_instance = private_instance
+        self._acad = None
+        self._owner_thread = None
+
+    def __enter__(self) -> "DWGToPDFConverter":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def open(self):
+        """
+        Start (or reuse) the AutoCAD COM instance
+
+        :return: AutoCAD application object
+        """
+        if self._acad is not None and self._owner_thread != threading.get_ident():
+            raise RuntimeError("AutoCAD instance belongs to another thread; use one converter per thread")
+        if self._acad is None:
+            if not AUTOCAD_AVAILABLE:
+                raise RuntimeError("pywin32 is required to drive AutoCAD")
+            _ensure_com_initialized()
+            acad = _dispatch_autocad(private=self.private_instance)
+            acad.Visible = False  # Run in background
+            self._acad = acad
+            self._owner_thread = threading.get_ident()
+        return self._acad
+
+    def close(self) -> None:
+        """
+        Release the AutoCAD COM instance, quitting it if this converter started it
+
+        The thread's COM apartment stays initialized for later conversions.
+        """
+        acad, self._acad = self._acad, None
+        self._owner_thread = None
+        if acad is not None and self.private_instance:
+            try:
+                acad.Quit()
+            except Exception as e:
+                logger.warning("Could not quit private AutoCAD instance: %s", e)
+
+    def convert_batch(self, jobs: List[Tuple[str, str]], **options) -> List[bool]:
+        """
+        Convert several DWG files while reusing a single AutoCAD instance
+
+        :param jobs: List of (input_path, output_path) pairs
+        :param options: Conversion options passed to :meth:`convert`
+        :return: Conversion result for each job
+        """
+        owns_instance = self._acad is None
+        try:
+            self.open()
+        except Exception as e:
+            logger.error("Error starting AutoCAD: %s", e)
+            return [False] * len(jobs)
+        try:
+            return [self.convert(input_path, output_path, **options) for input_path, output_path in jobs]
+        finally:
+            if owns_instance:
+                self.close()
     
     def convert(self, 
                 input_path: str, 
@@ -34,7 +185,8 @@ class DWGToPDFConverter:
                 paper_size: Optional[str] = None,
                 margin: Optional[float] = None,
                 grayscale: bool = False,
-                monochrome: bool = False) -> bool:
+                monochrome: bool = False,
+                layers: Optional[List[str]] = None) -> bool:
         """
         Convert DWG file to PDF using AutoCAD
         
@@ -46,92 +198,288 @@ class DWGToPDFConverter:
         :param margin: Paper margin in mm
         :param grayscale: Convert to grayscale
         :param monochrome: Convert to monochrome (black/white)
+        :param layers: Only plot these layers (all layers when omitted)
         :return: True if conversion successful, False otherwise
         """
         try:
             # Validate input file
             input_path = Path(input_path)
-            if not input_path.exists():
-                logger.error(f"Input file does not exist: {input_path}")
+            try:
+                input_stat = input_path.stat()  # Single stat, reused for the cache key
+            except FileNotFoundError:
+                logger.error("Input file does not exist: %s", input_path)
                 return False
             
             # Create output directory if it doesn't exist
             output_path = Path(output_path)
             output_path.parent.mkdir(parents=True, exist_ok=True)
+
+            # Reuse a previous conversion of identical input and options
+            cached_path = None
+            if self.cache_dir is not None:
+                options = {
+                    "auto_fit": auto_fit,
+                    "center": center,
+                    "paper_size": paper_size,
+                    "margin": margin,
+                    "grayscale": grayscale,
+                    "monochrome": monochrome,
+                    "layers": sorted(layers) if layers else None,
+                }
+                cached_path = self.cache_dir / f"{_cache_key(input_path, options, input_stat.st_size)}.pdf"
+                if self._restore_from_cache(cached_path, output_path):
+                    logger.info("Reused cached conversion of %s for %s", input_path, output_path)
+                    return True
             
             # Use AutoCAD to convert DWG to PDF
-            success = self._convert_with_autocad(input_path, output_path)
+            success = self._convert_with_autocad(input_path, output_path, layers=layers)
+
+            if success and cached_path is not None:
+                self._store_in_cache(output_path, cached_path)
             
             if success:
-                logger.info(f"Successfully converted {input_path} to {output_path}")
+                logger.info("Successfully converted %s to %s", input_path, output_path)
             else:
-                logger.error(f"Failed to convert {input_path} to PDF")
+                logger.error("Failed to convert %s to PDF", input_path)
             
             return success
             
         except Exception as e:
-            logger.error(f"Error during conversion: {str(e)}")
+            logger.error("Error during conversion: %s", e)
             return False
     
-    def _convert_with_autocad(self, input_path: Path, output_path: Path) -> bool:
+    def _convert_with_autocad(self, input_path: Path, output_path: Path, layers: Optional[List[str]] = None) -> bool:
         """
         Convert DWG to PDF using AutoCAD COM interface
         
         :param input_path: Path to input DWG file
         :param output_path: Path to output PDF file
+        :param layers: Only plot these layers (all layers when omitted)
         :return: True if successful, False otherwise
         """
+        owns_instance = self._acad is None
+        doc = None
         try:
-            # Initialize COM
-            pythoncom.CoInitialize()
-            
-            # Connect to AutoCAD
-            acad = win32com.client.Dispatch("AutoCAD.Application")
-            acad.Visible = False  # Run in background
+            # Connect to AutoCAD (reused while the converter is open)
+            acad = self.open()
             
             # Open the DWG file
             doc = acad.Documents.Open(str(input_path))
             
             # Wait for document to load
-            time.sleep(1)
+            self._wait_until_quiescent(acad)
             
-            # Set the active layout to Model
-            layout = None
-            for layout_obj in doc.Layouts:
-                if layout_obj.Name == "Model":
-                    layout = layout_obj
-                    break
-            
-            if layout is None:
+            # Set the active layout to Model (name-indexed lookup, one COM call)
+            layouts = doc.Layouts
+            try:
+                layout = layouts.Item("Model")
+            except pythoncom.com_error:
                 # If Model layout not found, use the first layout
-                layout = doc.Layouts.Item(0)
+                layout = layouts.Item(0)
             
             # Set the layout as current
             doc.ActiveLayout = layout
+
+            if layers:
+                self._isolate_layers(doc, layers)
             
             # Export to PDF
             doc.Export(str(output_path), "PDF", "")
             
-            # Close the document without saving
-            doc.Close(SaveChanges=False)
-            
-            # Clean up
-            del doc
-            del acad
-            
-            # Uninitialize COM
-            pythoncom.CoUninitialize()
-            
             return True
             
         except Exception as e:
-            logger.error(f"Error converting with AutoCAD: {str(e)}")
-            try:
-                pythoncom.CoUninitialize()
-            except:
-                pass
+            logger.error("Error converting with AutoCAD: %s", e)
+            # Drop a possibly dead instance so the next conversion reconnects
+            owns_instance = True
             return False
 
+        finally:
+            # Close the document without saving, also when the export failed,
+            # so a reused instance does not accumulate open drawings
+            if doc is not None:
+                try:
+                    doc.Close(SaveChanges=False)
+                except Exception as e:
+                    logger.warning("Could not close %s in AutoCAD: %s", input_path, e)
+            if owns_instance:
+                self.close()
+
+    @staticmethod
+    def _isolate_layers(doc, layers: List[str]) -> None:
+        """
+        Switch off every layer that is not selected for export
+
+        The drawing is closed without saving, so the source file is untouched.
+
+        :param doc: AutoCAD document object
+        :param layers: Names of the layers to keep (case-insensitive)
+        """
+        wanted = {name.casefold() for name in layers}
+        layer_objs = list(doc.Layers)
+        if not any(layer.Name.casefold() in wanted for layer in layer_objs):
+            logger.warning("None of the requested layers %s exist, exporting all layers", layers)
+            return
+        for layer in layer_objs:
+            layer.LayerOn = layer.Name.casefold() in wanted
+
+    @staticmethod
+    def _restore_from_cache(cached_path: Path, output_path: Path) -> bool:
+        """
+        Copy a cached PDF to the requested output path
+
+        An existing output is only replaced once the copy is complete, so a
+        cache miss never loses it, and the output never shares an inode with
+        the cache entry.
+
+        :param cached_path: Cache entry for the conversion
+        :param output_path: Path to output PDF file
+        :return: True on cache hit, False otherwise
+        """
+        if not cached_path.exists():
+            return False
+        try:
+            _copy_atomically(cached_path, output_path)
+            os.utime(cached_path)  # Mark as recently used for eviction
+            return True
+        except FileNotFoundError:  # Evicted between the check and the copy
+            return False
+        except OSError as e:
+            logger.warning("Could not reuse cached PDF %s: %s", cached_path, e)
+            return False
+
+    def _store_in_cache(self, output_path: Path, cached_path: Path) -> None:
+        """
+        Atomically add a copy of a converted PDF to the cache and enforce its size bound
+
+        :param output_path: Freshly converted PDF
+        :param cached_path: Cache entry to create
+        """
+        try:
+            cached_path.parent.mkdir(parents=True, exist_ok=True)
+            _copy_atomically(output_path, cached_path)
+            _evict_cache(cached_path.parent, self.cache_max_bytes)
+        except OSError as e:
+            logger.warning("Could not cache converted PDF %s: %s", output_path, e)
+
+    @staticmethod
+    def _wait_until_quiescent(acad, timeout: float = QUIESCENT_TIMEOUT) -> None:
+        """
+        Poll AutoCAD until it is idle instead of sleeping for a fixed time
+
+        :param acad: AutoCAD application object
+        :param timeout: Maximum number of seconds to wait
+        """
+        deadline = time.monotonic() + timeout
+        while not acad.GetAcadState().IsQuiescent:
+            if time.monotonic() >= deadline:
+                raise TimeoutError("AutoCAD did not become idle in time")
+            time.sleep(QUIESCENT_POLL_INTERVAL)
+
+
+def _cache_key(input_path: Path, options: dict, size: int) -> str:
+    """
+    Content hash of a DWG file combined with the conversion options
+
+    :param input_path: Path to input DWG file
+    :param options: Conversion options
+    :param size: Size of the input file in bytes (from the caller's stat)
+    :return: Hex digest identifying the conversion
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(CACHE_KEY_VERSION.encode())
+    digest.update(str(size).encode())
+    digest.update(json.dumps(options, sort_keys=True).encode())
+    if size:
+        # Hash the mapped file directly instead of copying it into Python buffers
+        with open(input_path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            digest.update(mapped)
+    return digest.hexdigest()
+
+
+def _copy_atomically(source: Path, destination: Path) -> None:
+    """
+    Copy ``source`` next to ``destination`` and move it into place in one rename
+
+    Readers of ``destination`` see either the old file or the complete copy.
+    """
+    staging_path = destination.with_name(f".{destination.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        shutil.copyfile(source, staging_path)
+        os.replace(staging_path, destination)
+    finally:
+        staging_path.unlink(missing_ok=True)
+
+
+def _evict_cache(cache_dir: Path, max_bytes: int) -> None:
+    """
+    Remove least recently used cache entries until the cache fits max_bytes
+    """
+    entries = []
+    total = 0
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".pdf"):
+            info = entry.stat()
+            entries.append((info.st_mtime, info.st_size, entry.path))
+            total += info.st_size
+    if total <= max_bytes:
+        return
+    for _, size, path in sorted(entries):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            continue
+        total -= size
+        if total <= max_bytes:
+            break
+
+
+_thread_state = threading.local()
+
+
+def _thread_converter() -> DWGToPDFConverter:
+    """
+    Return the long-lived converter owned by the current thread
+
+    COM objects are bound to the thread that created them, so each worker
+    thread keeps its own AutoCAD connection open across conversions.
+    """
+    converter = getattr(_thread_state, "converter", None)
+    if converter is None:
+        converter = DWGToPDFConverter()
+        _thread_state.converter = converter
+    return converter
+
+
+@lru_cache(maxsize=1)
+def _autocad_registered() -> bool:
+    """
+    Check once per process whether AutoCAD can be dispatched
+
+    Resolves the ProgID without launching AutoCAD; a negative result is cached
+    so machines without AutoCAD do not retry a failing Dispatch per request.
+    """
+    if not AUTOCAD_AVAILABLE:
+        logger.warning("pywin32 is not installed; DWG to PDF conversion is unavailable")
+        return False
+    try:
+        pythoncom.MakeIID(AUTOCAD_PROG_ID)
+    except pythoncom.com_error:
+        logger.warning("%s is not registered; DWG to PDF conversion is unavailable", AUTOCAD_PROG_ID)
+        return False
+    return True
+
+
+def get_converter() -> Optional[DWGToPDFConverter]:
+    """
+    Return the current thread's converter for the available backend
+
+    :return: Converter, or None when no conversion backend is installed
+    """
+    if not _autocad_registered():
+        return None
+    return _thread_converter()
+
 
 def convert_dwg_to_pdf(input_path: str, output_path: str, **kwargs) -> bool:
     """
@@ -142,5 +490,72 @@ def convert_dwg_to_pdf(input_path: str, output_path: str, **kwargs) -> bool:
     :param kwargs: Additional options for conversion
     :return: True if conversion successful, False otherwise
     """
-    converter = DWGToPDFConverter()
-    return converter.convert(input_path, output_path, **kwargs)
\ No newline at end of file
+    converter = get_converter()
+    if converter is None:
+        return False
+    try:
+        converter.open()
+    except Exception as e:
+        logger.error("Error starting AutoCAD: %s", e)
+        return False
+    return converter.convert(input_path, output_path, **kwargs)
+
+
+def _init_worker() -> None:
+    """
+    Process-pool initializer: start this worker's own AutoCAD process once
+
+    Attaching with ``Dispatch`` would hand every worker the same running
+    AutoCAD, so the worker launches a private server with ``DispatchEx`` and
+    quits it when the worker process exits.
+    """
+    if not _autocad_registered():
+        return
+    converter = DWGToPDFConverter(private_instance=True)
+    _thread_state.converter = converter
+    try:
+        _ensure_com_initialized()
+        # Registered after CoUninitialize, so atexit quits AutoCAD first; also
+        # covers an instance restarted by a later conversion
+        atexit.register(converter.close)
+        converter.open()
+    except Exception as e:
+        logger.error("Error starting AutoCAD in worker %s: %s", os.getpid(), e)
+
+
+def _convert_in_worker(job: Tuple[str, str], options: dict) -> bool:
+    """
+    Convert one (input_path, output_path) job inside a pool worker
+    """
+    input_path, output_path = job
+    return convert_dwg_to_pdf(input_path, output_path, **options)
+
+
+def _default_workers() -> int:
+    return max(1, min((os.cpu_count() or 2) // 2, MAX_AUTOCAD_WORKERS))
+
+
+def convert_many(jobs: List[Tuple[str, str]], workers: Optional[int] = None, **options) -> List[bool]:
+    """
+    Convert many DWG files in parallel, one private AutoCAD process per worker
+
+    AutoCAD's COM server is single-threaded, so parallelism comes from
+    separate AutoCAD processes; each worker keeps its own instance open for
+    all the jobs it receives and quits it on exit.
+
+    :param jobs: List of (input_path, output_path) pairs
+    :param workers: Number of worker processes (capped at MAX_AUTOCAD_WORKERS)
+    :param options: Conversion options passed to :meth:`DWGToPDFConverter.convert`
+    :return: Conversion result for each job, in input order
+    """
+    if not _autocad_registered():
+        return [False] * len(jobs)
+    if workers is None:
+        workers = _default_workers()
+    workers = max(1, min(workers, MAX_AUTOCAD_WORKERS, len(jobs) or 1))
+
+    if workers == 1:
+        return DWGToPDFConverter().convert_batch(jobs, **options)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        return list(executor.map(_convert_in_worker, jobs, [options] * len(jobs)))
@@ -9,7 +9,7 @@ from pathlib import Path
 backend_path = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(backend_path))
 
-from modules.dwg_to_pdf.converter import DWGToPDFConverter
+from modules.dwg_to_pdf.converter import convert_many
 
 def test_conversion():
     """Test the DWG to PDF conversion"""
@@ -33,20 +33,21 @@ def test_conversion():
     output_dir = Path(__file__).parent.parent.parent.parent.parent / "temp" / "pdf_output"
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Convert each DWG file
-    converter = DWGToPDFConverter()
-    
-    for dwg_file in dwg_files[:2]:  # Limit to first 2 files for testing
-        output_file = output_dir / f"{dwg_file.stem}_converted.pdf"
+    # Convert the DWG files in parallel, one AutoCAD instance per worker process
+    jobs = [
+        (dwg_file, output_dir / f"{dwg_file.stem}_converted.pdf")
+        for dwg_file in dwg_files[:2]  # Limit to first 2 files for testing
+    ]
+    for dwg_file, output_file in jobs:
         print(f"\nConverting {dwg_file.name} to {output_file.name}...")
-        
-        success = converter.convert(
-            input_path=str(dwg_file),
-            output_path=str(output_file),
-            auto_fit=True,
-            center=True
-        )
-        
+
+    results = convert_many(
+        [(str(dwg_file), str(output_file)) for dwg_file, output_file in jobs],
+        auto_fit=True,
+        center=True
+    )
+    
+    for (dwg_file, output_file), success in zip(jobs, results):
         if success:
             print(f"Successfully converted {dwg_file.name}")
             if output_file.exists():
@@ -1,14 +1,17 @@
 """Business service modules exported for external use."""
 
-from .jobs import JobService
-from .parsing import ParsedEntity, match_entities, normalize_entities_by_grid, parse_dxf
+from .jobs import JobService, cached_job_service
+from .parsing import ParsedEntity, iter_dxf, match_entities, normalize_entities_by_grid, parse_dxf, parse_pair
 from .reports import render_diff_pdf
 
 __all__ = [
     "JobService",
+    "cached_job_service",
     "ParsedEntity",
+    "iter_dxf",
     "match_entities",
     "normalize_entities_by_grid",
     "parse_dxf",
+    "parse_pair",
     "render_diff_pdf",
 ]
@@ -1,18 +1,257 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import os
 import secrets
 import sqlite3
-from datetime import datetime, timezone
-from hashlib import sha256
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Callable
 
+import orjson
+import ormsgpack
+from blake3 import blake3
 from fastapi import UploadFile
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+from app.models.jobs import JobCreate, JobDiffPayload, JobMetadata, JobStatusPayload, JobSummary, StoredFile
+
+CHUNK_SIZE = 4 * 1024 * 1024
+JOB_ID_BATCH = 16
+META_CACHE_SIZE = 256
+CHECKSUM_ALGORITHM = "blake3"
+
+# StoredFile lists, stored MessagePack-encoded one row per (job_id, slot) in
+# job_json; logs live in the append-only job_logs table instead
+_FILE_SLOTS = ("original_files", "revised_files", "converted_files", "reports")
+
+_CREATE_JOBS_TABLE = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL,
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL
+)
+"""
+_CREATE_JOB_JSON_TABLE = """
+CREATE TABLE IF NOT EXISTS job_json (
+    job_id TEXT NOT NULL,
+    slot TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (job_id, slot)
+)
+"""
+_CREATE_JOB_LOGS_TABLE = """
+CREATE TABLE IF NOT EXISTS job_logs (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    ts TEXT,
+    level TEXT,
+    payload BLOB NOT NULL,
+    PRIMARY KEY (job_id, seq)
+)
+"""
+_INSERT_JOB_ROW = "INSERT INTO jobs (job_id, status, progress, created_at, updated_at) VALUES (?, ?, ?, ?, ?)"
+_INSERT_LOG_ROW = "INSERT INTO job_logs (job_id, seq, ts, level, payload) VALUES (?, ?, ?, ?, ?)"
+
+# Hot-path statements live at module level so every call passes the identical
+# string and hits the connection's prepared-statement cache
+STATEMENT_CACHE_SIZE = 256
+_SELECT_JOB = "SELECT job_id, status, progress, created_at, updated_at FROM jobs WHERE job_id = ?"
+_SELECT_JOB_PAGE = """
+SELECT job_id, status, progress, created_at, updated_at
+FROM jobs
+ORDER BY updated_at DESC
+LIMIT ? OFFSET ?
+"""
+_COUNT_JOBS = "SELECT COUNT(*) FROM jobs"
+_UPSERT_JOB = """
+INSERT INTO jobs (job_id, status, progress, created_at, updated_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(job_id) DO UPDATE SET
+    status=excluded.status,
+    progress=excluded.progress,
+    created_at=excluded.created_at,
+    updated_at=excluded.updated_at
+"""
+_UPSERT_JOB_JSON = """
+INSERT INTO job_json (job_id, slot, data) VALUES (?, ?, ?)
+ON CONFLICT(job_id, slot) DO UPDATE SET data=excluded.data
+"""
+_TOUCH_JOB = "UPDATE jobs SET updated_at = ? WHERE job_id = ?"
+# NULL keeps the stored value, so one statement serves every status/progress combination
+_UPDATE_JOB_STATE = """
+UPDATE jobs SET
+    status = COALESCE(?, status),
+    progress = COALESCE(?, progress),
+    updated_at = ?
+WHERE job_id = ?
+"""
+_APPEND_LOG = """
+INSERT INTO job_logs (job_id, seq, ts, level, payload)
+SELECT ?, COALESCE(MAX(seq), -1) + 1, ?, ?, ? FROM job_logs WHERE job_id = ?
+"""
+_DELETE_LOGS = "DELETE FROM job_logs WHERE job_id = ?"
+# JSON1 picks the message out of the newest error entry inside SQLite, so no
+# log payload is decoded in Python
+_SELECT_LAST_ERROR = """
+SELECT COALESCE(
+    NULLIF(json_extract(entry, '$.error'), ''),
+    NULLIF(json_extract(entry, '$.details'), ''),
+    NULLIF(json_extract(entry, '$.message'), '')
+) AS last_error
+FROM (SELECT seq, CAST(payload AS TEXT) AS entry FROM job_logs WHERE job_id = ? AND level = 'error')
+WHERE last_error IS NOT NULL
+ORDER BY seq DESC
+LIMIT 1
+"""
+
+# Per-connection settings; WAL itself is persisted in the database file
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA wal_autocheckpoint=1000",
+)
+
+# Timestamps are stored as integer microseconds since the Unix epoch (UTC)
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+_job_id_buffer = threading.local()
+
+
+def new_job_id() -> str:
+    """Return a random (version 4) UUID hex string for a new job.
+
+    Random bytes are drawn from ``os.urandom`` in batches of ``JOB_ID_BATCH``
+    identifiers per thread; the batch is discarded after a fork so child
+    processes never reuse bytes buffered by their parent.
+    """
+
+    buffer = _job_id_buffer
+    pid = os.getpid()
+    if getattr(buffer, "pid", None) != pid or buffer.offset >= len(buffer.data):
+        buffer.data = os.urandom(16 * JOB_ID_BATCH)
+        buffer.offset = 0
+        buffer.pid = pid
+    start = buffer.offset
+    buffer.offset = start + 16
+    return uuid.UUID(bytes=buffer.data[start : start + 16], version=4).hex
+
+
+def _write_all(fd: int, data: memoryview) -> None:
+    while data:
+        written = os.write(fd, data)
+        data = data[written:]
+
+
+def _copy_and_hash(source: BinaryIO, destination: Path) -> tuple[int, str]:
+    hasher = blake3(max_threads=blake3.AUTO)
+    size = 0
+    # One reusable buffer per copy; readinto avoids allocating a bytes object per chunk
+    buffer = bytearray(CHUNK_SIZE)
+    view = memoryview(buffer)
+    source.seek(0)
+    # Unbuffered descriptor: chunks go straight to write(2) without a BufferedWriter copy
+    fd = os.open(destination, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        while count := source.readinto(buffer):
+            chunk = view[:count]
+            _write_all(fd, chunk)
+            hasher.update(chunk)
+            size += count
+    finally:
+        os.close(fd)
+    return size, hasher.hexdigest()
+
+
+async def write_upload(upload: UploadFile, destination: Path, *, kind: str | None = None) -> StoredFile:
+    """Stream an uploaded file to disk in fixed-size chunks, hashing it on the way.
+
+    The copy runs in the threadpool so large drawings do not block the event loop.
+    """
+
+    size, checksum = await run_in_threadpool(_copy_and_hash, upload.file, destination)
+    return StoredFile(
+        name=destination.name,
+        path=str(destination.resolve()),
+        size=size,
+        checksum=checksum,
+        algorithm=CHECKSUM_ALGORITHM,
+        content_type=upload.content_type,
+        kind=kind,
+    )
+
+
+def _dumps(value: Any) -> bytes:
+    """Serialize to UTF-8 JSON bytes for the job_logs payload column."""
+
+    return orjson.dumps(value)
 
-from app.models.jobs import JobCreate, JobDiffPayload, JobMetadata, JobStatusPayload, StoredFile
 
-CHUNK_SIZE = 1024 * 1024
+def _pack_files(files: list[StoredFile]) -> bytes:
+    """Serialize a StoredFile list to MessagePack for the job_json BLOB column."""
+
+    return ormsgpack.packb([_dump_stored_file(file) for file in files])
+
+
+def _compile_dumper(model: type[BaseModel]) -> Callable[[Any], dict[str, Any]]:
+    """Generate a dict builder specialised on ``model``'s fields.
+
+    The generated function reads attributes directly instead of walking the
+    schema like ``model_dump``, so it only suits flat models whose fields are
+    already JSON-native.
+    """
+
+    items = ", ".join(f"{name!r}: obj.{name}" for name in model.model_fields)
+    namespace: dict[str, Any] = {}
+    exec(f"def dump(obj):\n    return {{{items}}}\n", namespace)
+    return namespace["dump"]
+
+
+_dump_stored_file = _compile_dumper(StoredFile)
+_STORED_FILE_KEYS = frozenset(StoredFile.model_fields)
+
+
+def _load_stored_file(item: dict[str, Any]) -> StoredFile:
+    # Rows written by _pack_files carry exactly the model's fields and were
+    # validated on the way in; older or foreign rows take the validating path
+    if item.keys() == _STORED_FILE_KEYS:
+        return StoredFile.model_construct(**item)
+    return StoredFile.model_validate(item)
+
+
+def _to_micros(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def _log_level(entry: dict[str, Any]) -> str | None:
+    # Failed steps count as errors even when the entry carries no explicit level
+    if entry.get("status") == "failed":
+        return "error"
+    return entry.get("level")
+
+
+def _log_rows(job_id: str, logs: list[dict[str, Any]], start: int = 0) -> list[tuple[Any, ...]]:
+    return [
+        (job_id, seq, entry.get("timestamp"), _log_level(entry), _dumps(entry))
+        for seq, entry in enumerate(logs, start)
+    ]
 
 
 class JobService:
@@ -25,6 +264,11 @@ class JobService:
         self._jobs_dir.mkdir(parents=True, exist_ok=True)
         self._meta_dir.mkdir(parents=True, exist_ok=True)
         self._db_path = self._meta_dir / "jobs.db"
+        self._local = threading.local()
+        # job_id -> (updated_at, metadata) for fully loaded jobs, oldest first; the
+        # cached models are private copies, and callers always get their own copy
+        self._meta_cache: dict[str, tuple[int, JobMetadata]] = {}
+        self._meta_lock = threading.Lock()
         self._initialize_database()
         self._migrate_legacy_metadata()
 
@@ -32,14 +276,17 @@ class JobService:
         """Persist uploaded files and create initial metadata."""
 
         job_id = self._generate_job_id()
-        job_dir = self._jobs_dir / job_id
+        job_dir = self.create_job_dir(job_id)
         original_dir = job_dir / "original"
         revised_dir = job_dir / "revised"
-        original_dir.mkdir(parents=True, exist_ok=True)
-        revised_dir.mkdir(parents=True, exist_ok=True)
+        original_dir.mkdir(exist_ok=True)
+        revised_dir.mkdir(exist_ok=True)
 
-        original_file = await self._save_upload(original_dir, original, kind="original")
-        revised_file = await self._save_upload(revised_dir, revised, kind="revised")
+        # Distinct uploads and destinations, so both copies can run in the threadpool at once
+        original_file, revised_file = await asyncio.gather(
+            self._save_upload(original_dir, original, kind="original"),
+            self._save_upload(revised_dir, revised, kind="revised"),
+        )
 
         now = datetime.now(timezone.utc)
         metadata = JobMetadata(
@@ -54,11 +301,16 @@ class JobService:
         self._write_metadata(metadata)
         return metadata
 
-    def create_job_from_data(self, job_data: JobCreate) -> JobMetadata:
+    def create_job_from_data(
+        self,
+        job_data: JobCreate,
+        *,
+        original_files: list[StoredFile] | None = None,
+        revised_files: list[StoredFile] | None = None,
+    ) -> JobMetadata:
         """Create job metadata from JobCreate data (for enhanced jobs)."""
 
-        job_dir = self._jobs_dir / job_data.id
-        job_dir.mkdir(parents=True, exist_ok=True)
+        self.create_job_dir(job_data.id)
 
         now = datetime.now(timezone.utc)
         metadata = JobMetadata(
@@ -67,12 +319,23 @@ class JobService:
             progress=0.0,
             created_at=now,
             updated_at=now,
-            original_files=[],  # Will be populated when files are saved
-            revised_files=[],
+            original_files=original_files or [],
+            revised_files=revised_files or [],
         )
         self._write_metadata(metadata)
         return metadata
 
+    def create_job_dir(self, job_id: str) -> Path:
+        """Create (if needed) and return the storage directory for a job.
+
+        Parents are recreated too, since the service outlives the process's
+        view of the storage dir if it is cleaned or remounted.
+        """
+
+        job_dir = self._jobs_dir / job_id
+        job_dir.mkdir(parents=True, exist_ok=True)
+        return job_dir
+
     def load_job(self, job_id: str) -> JobMetadata:
         """Read job metadata from storage."""
 
@@ -81,22 +344,66 @@ class JobService:
     def get_job_status(self, job_id: str) -> JobStatusPayload:
         """Convert metadata into the public status payload."""
 
-        job = self.load_job(job_id)
-        last_error: str | None = None
-        for entry in reversed(job.logs):
-            if entry.get("level") == "error" or entry.get("status") == "failed":
-                last_error = entry.get("error") or entry.get("details") or entry.get("message")
-                if last_error:
-                    break
+        # Only the slots the payload needs; uploaded/converted file lists are skipped
+        job = self._read_metadata(job_id, slots=("reports",))
         return JobStatusPayload(
             job_id=job.job_id,
             status=job.status,
             progress=job.progress,
             reports=job.reports,
             logs=job.logs,
-            last_error=last_error,
+            last_error=self._last_error(job_id),
         )
 
+    def append_log(self, job_id: str, entry: dict[str, Any]) -> None:
+        """Append one log entry without rewriting the job's existing logs."""
+
+        with self._connect() as conn:
+            # Bumping updated_at also invalidates cached metadata in other processes
+            if conn.execute(_TOUCH_JOB, (_to_micros(datetime.now(timezone.utc)), job_id)).rowcount == 0:
+                raise FileNotFoundError(f"metadata not found for job {job_id}")
+            conn.execute(
+                _APPEND_LOG,
+                (job_id, entry.get("timestamp"), _log_level(entry), _dumps(entry), job_id),
+            )
+        self._forget_metadata(job_id)
+
+    def append_logs(self, job_id: str, entries: list[dict[str, Any]], **updates) -> None:
+        """Append log entries and update metadata fields in a single transaction.
+
+        ``updates`` may set ``status``, ``progress`` and file slots. Nothing is
+        read back: the ``jobs`` row is updated in place and only the named file
+        slots are rewritten.
+        """
+
+        unsupported = updates.keys() - {"status", "progress", *_FILE_SLOTS}
+        if unsupported:
+            raise ValueError(f"append_logs cannot update {', '.join(sorted(unsupported))}")
+        progress = updates.get("progress")
+        with self._connect() as conn:
+            # Bumping updated_at also invalidates cached metadata in other processes
+            state = (
+                updates.get("status"),
+                None if progress is None else float(progress),
+                _to_micros(datetime.now(timezone.utc)),
+                job_id,
+            )
+            if conn.execute(_UPDATE_JOB_STATE, state).rowcount == 0:
+                raise FileNotFoundError(f"metadata not found for job {job_id}")
+            conn.executemany(
+                _APPEND_LOG,
+                [(job_id, entry.get("timestamp"), _log_level(entry), _dumps(entry), job_id) for entry in entries],
+            )
+            conn.executemany(
+                _UPSERT_JOB_JSON,
+                [(job_id, slot, _pack_files(updates[slot])) for slot in _FILE_SLOTS if slot in updates],
+            )
+        self._forget_metadata(job_id)
+
+    def _last_error(self, job_id: str) -> str | None:
+        row = self._connect().execute(_SELECT_LAST_ERROR, (job_id,)).fetchone()
+        return row["last_error"] if row else None
+
     def list_jobs(self, *, limit: int = 20, offset: int = 0) -> tuple[int, list[JobMetadata]]:
         """Return jobs sorted by updated_at descending with pagination."""
 
@@ -106,25 +413,52 @@ class JobService:
             raise ValueError("offset cannot be negative")
 
         with self._connect() as conn:
-            total_row = conn.execute("SELECT COUNT(*) AS count FROM jobs").fetchone()
-            total = int(total_row["count"]) if total_row else 0
+            total = conn.execute(_COUNT_JOBS).fetchone()[0]
             if total == 0:
                 return 0, []
 
-            cursor = conn.execute(
-                """
-                SELECT job_id, status, progress, created_at, updated_at,
-                       original_files, revised_files, converted_files, reports, logs
-                FROM jobs
-                ORDER BY updated_at DESC
-                LIMIT ? OFFSET ?
-                """,
-                (limit, offset),
-            )
-            jobs = [self._row_to_metadata(row) for row in cursor.fetchall()]
+            rows = conn.execute(_SELECT_JOB_PAGE, (limit, offset)).fetchall()
+            job_ids = [row["job_id"] for row in rows]
+            slot_data = self._load_slots(conn, job_ids, _FILE_SLOTS)
+            logs = self._load_logs(conn, job_ids)
 
+        jobs = [
+            self._row_to_metadata(row, slot_data.get(row["job_id"], {}), logs.get(row["job_id"], []))
+            for row in rows
+        ]
         return total, jobs
 
+    def list_jobs_summary(self, *, limit: int = 20, offset: int = 0) -> tuple[int, list[JobSummary]]:
+        """Return job summaries sorted by updated_at descending with pagination.
+
+        Only the scalar columns are read (from the covering index), so no JSON
+        slots or logs are decoded; use ``list_jobs`` when full metadata is needed.
+        """
+
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        if offset < 0:
+            raise ValueError("offset cannot be negative")
+
+        with self._connect() as conn:
+            total = conn.execute(_COUNT_JOBS).fetchone()[0]
+            if total == 0:
+                return 0, []
+            rows = conn.execute(_SELECT_JOB_PAGE, (limit, offset)).fetchall()
+
+        # Columns were validated when the job was written, so skip re-validation
+        summaries = [
+            JobSummary.model_construct(
+                job_id=row["job_id"],
+                status=row["status"],
+                progress=float(row["progress"]),
+                created_at=_from_micros(row["created_at"]),
+                updated_at=_from_micros(row["updated_at"]),
+            )
+            for row in rows
+        ]
+        return total, summaries
+
     def get_job_diff(self, job_id: str) -> JobDiffPayload:
         """Load diff payload for a given job."""
 
@@ -138,7 +472,7 @@ class JobService:
         path = Path(diff_file.path)
         if not path.exists():
             raise FileNotFoundError(f"diff file missing for job {job_id}")
-        return JobDiffPayload.model_validate_json(path.read_text(encoding="utf-8"))
+        return JobDiffPayload.model_validate_json(path.read_bytes())
 
     def get_report_file(self, job_id: str, kind: str) -> StoredFile:
         """Return a stored report file for the given kind."""
@@ -166,7 +500,11 @@ class JobService:
         return metadata
 
     def update_metadata(self, job_id: str, **updates) -> JobMetadata:
-        """Update selected fields of the stored metadata."""
+        """Update selected fields of the stored metadata.
+
+        Stored logs are only rewritten when ``logs`` is passed explicitly; use
+        ``append_log`` to add a single entry.
+        """
 
         job = self.load_job(job_id)
         new_job = job.model_copy(
@@ -175,146 +513,232 @@ class JobService:
                 "updated_at": datetime.now(timezone.utc),
             }
         )
-        self._write_metadata(new_job)
+        self._write_metadata(new_job, write_logs="logs" in updates)
         return new_job
 
-    def _write_metadata(self, metadata: JobMetadata) -> None:
-        payload = self._serialize_metadata(metadata)
+    def _write_metadata(self, metadata: JobMetadata, *, write_logs: bool = True) -> None:
+        scalars, slots = self._serialize_metadata(metadata)
         with self._connect() as conn:
-            conn.execute(
-                """
-                INSERT INTO jobs (
-                    job_id, status, progress, created_at, updated_at,
-                    original_files, revised_files, converted_files, reports, logs
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(job_id) DO UPDATE SET
-                    status=excluded.status,
-                    progress=excluded.progress,
-                    created_at=excluded.created_at,
-                    updated_at=excluded.updated_at,
-                    original_files=excluded.original_files,
-                    revised_files=excluded.revised_files,
-                    converted_files=excluded.converted_files,
-                    reports=excluded.reports,
-                    logs=excluded.logs
-                """,
-                payload,
-            )
+            conn.execute(_UPSERT_JOB, scalars)
+            conn.executemany(_UPSERT_JOB_JSON, slots)
+            if write_logs:
+                conn.execute(_DELETE_LOGS, (metadata.job_id,))
+                conn.executemany(_INSERT_LOG_ROW, _log_rows(metadata.job_id, metadata.logs))
+        if write_logs:
+            self._cache_metadata(scalars[4], metadata)
+        else:
+            # Logs were not written, so the model may miss entries appended meanwhile
+            self._forget_metadata(metadata.job_id)
+
+    def _cache_metadata(self, updated_at: int, metadata: JobMetadata) -> None:
+        # Keep a private copy so later changes to the caller's model cannot leak in
+        entry = (updated_at, metadata.model_copy(deep=True))
+        with self._meta_lock:
+            cache = self._meta_cache
+            cache.pop(metadata.job_id, None)
+            cache[metadata.job_id] = entry
+            while len(cache) > META_CACHE_SIZE:
+                cache.pop(next(iter(cache)), None)
+
+    def _forget_metadata(self, job_id: str) -> None:
+        with self._meta_lock:
+            self._meta_cache.pop(job_id, None)
+
+    def _read_metadata(self, job_id: str, slots: tuple[str, ...] = _FILE_SLOTS) -> JobMetadata:
+        """Load a job, serving it from the cache while its updated_at is unchanged.
+
+        Only full loads are cached; a cached model is also returned for
+        narrower ``slots`` requests since it is a superset.
+        """
 
-    def _read_metadata(self, job_id: str) -> JobMetadata:
         with self._connect() as conn:
-            row = conn.execute(
-                """
-                SELECT job_id, status, progress, created_at, updated_at,
-                       original_files, revised_files, converted_files, reports, logs
-                FROM jobs
-                WHERE job_id = ?
-                """,
-                (job_id,),
-            ).fetchone()
-        if row is None:
-            raise FileNotFoundError(f"metadata not found for job {job_id}")
-        return self._row_to_metadata(row)
-
-    def _serialize_metadata(self, metadata: JobMetadata) -> tuple[Any, ...]:
-        return (
+            row = conn.execute(_SELECT_JOB, (job_id,)).fetchone()
+            if row is None:
+                raise FileNotFoundError(f"metadata not found for job {job_id}")
+            with self._meta_lock:
+                cached = self._meta_cache.get(job_id)
+            if cached is not None and cached[0] == row["updated_at"]:
+                return cached[1].model_copy(deep=True)
+            slot_data = self._load_slots(conn, [job_id], slots)
+            logs = self._load_logs(conn, [job_id])
+        metadata = self._row_to_metadata(row, slot_data.get(job_id, {}), logs.get(job_id, []))
+        if slots == _FILE_SLOTS:
+            self._cache_metadata(row["updated_at"], metadata)
+        return metadata
+
+    @staticmethod
+    def _load_slots(
+        conn: sqlite3.Connection, job_ids: list[str], slots: tuple[str, ...]
+    ) -> dict[str, dict[str, Any]]:
+        if not job_ids or not slots:
+            return {}
+        cursor = conn.execute(
+            f"""
+            SELECT job_id, slot, data FROM job_json
+            WHERE job_id IN ({", ".join("?" * len(job_ids))})
+              AND slot IN ({", ".join("?" * len(slots))})
+            """,
+            (*job_ids, *slots),
+        )
+        result: dict[str, dict[str, Any]] = {}
+        for row in cursor:
+            result.setdefault(row["job_id"], {})[row["slot"]] = ormsgpack.unpackb(row["data"])
+        return result
+
+    @staticmethod
+    def _load_logs(conn: sqlite3.Connection, job_ids: list[str]) -> dict[str, list[dict[str, Any]]]:
+        if not job_ids:
+            return {}
+        cursor = conn.execute(
+            f"""
+            SELECT job_id, payload FROM job_logs
+            WHERE job_id IN ({", ".join("?" * len(job_ids))})
+            ORDER BY job_id, seq
+            """,
+            job_ids,
+        )
+        result: dict[str, list[dict[str, Any]]] = {}
+        for row in cursor:
+            result.setdefault(row["job_id"], []).append(orjson.loads(row["payload"]))
+        return result
+
+    def _serialize_metadata(self, metadata: JobMetadata) -> tuple[tuple[Any, ...], list[tuple[str, str, bytes]]]:
+        scalars = (
             metadata.job_id,
             metadata.status,
             float(metadata.progress),
-            metadata.created_at.isoformat(),
-            metadata.updated_at.isoformat(),
-            json.dumps([file.model_dump() for file in metadata.original_files], ensure_ascii=False),
-            json.dumps([file.model_dump() for file in metadata.revised_files], ensure_ascii=False),
-            json.dumps([file.model_dump() for file in metadata.converted_files], ensure_ascii=False),
-            json.dumps([file.model_dump() for file in metadata.reports], ensure_ascii=False),
-            json.dumps(metadata.logs, ensure_ascii=False),
+            _to_micros(metadata.created_at),
+            _to_micros(metadata.updated_at),
         )
-
-    def _row_to_metadata(self, row: sqlite3.Row) -> JobMetadata:
-        def _parse_files(value: str) -> list[StoredFile]:
-            data = json.loads(value)
-            return [StoredFile.model_validate(item) for item in data]
-
-        return JobMetadata(
+        slots = [
+            (metadata.job_id, slot, _pack_files(getattr(metadata, slot)))
+            for slot in _FILE_SLOTS
+        ]
+        return scalars, slots
+
+    def _row_to_metadata(self, row: sqlite3.Row, slots: dict[str, Any], logs: list[dict[str, Any]]) -> JobMetadata:
+        files = {slot: [_load_stored_file(item) for item in slots.get(slot, ())] for slot in _FILE_SLOTS}
+        # Scalars were validated before they were written, so skip re-validation
+        return JobMetadata.model_construct(
             job_id=row["job_id"],
             status=row["status"],
             progress=float(row["progress"]),
-            created_at=datetime.fromisoformat(row["created_at"]),
-            updated_at=datetime.fromisoformat(row["updated_at"]),
-            original_files=_parse_files(row["original_files"]),
-            revised_files=_parse_files(row["revised_files"]),
-            converted_files=_parse_files(row["converted_files"]),
-            reports=_parse_files(row["reports"]),
-            logs=json.loads(row["logs"] or "[]"),
+            created_at=_from_micros(row["created_at"]),
+            updated_at=_from_micros(row["updated_at"]),
+            logs=logs,
+            **files,
         )
 
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._db_path)
-        conn.row_factory = sqlite3.Row
+        """Return this thread's long-lived connection, opening it on first use.
+
+        Reusing the connection keeps SQLite's page cache warm across calls;
+        ``with conn:`` blocks still commit or roll back per operation. A
+        connection inherited through ``fork`` is never reused by the child.
+        """
+
+        local = self._local
+        pid = os.getpid()
+        conn = getattr(local, "conn", None)
+        if conn is None or local.pid != pid:
+            conn = sqlite3.connect(self._db_path, cached_statements=STATEMENT_CACHE_SIZE)
+            conn.row_factory = sqlite3.Row
+            for pragma in _CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            local.conn = conn
+            local.pid = pid
         return conn
 
     def _initialize_database(self) -> None:
-        with self._connect() as conn:
+        conn = self._connect()
+        # WAL turns each status-tick upsert into an append instead of a
+        # rollback-journal rewrite with a full fsync
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "logs" in columns:
+                self._split_legacy_jobs_table(conn)
+            conn.execute(_CREATE_JOBS_TABLE)
+            conn.execute(_CREATE_JOB_JSON_TABLE)
+            conn.execute(_CREATE_JOB_LOGS_TABLE)
+            # Covers the job listing query, so pages are served from the index alone
             conn.execute(
                 """
-                CREATE TABLE IF NOT EXISTS jobs (
-                    job_id TEXT PRIMARY KEY,
-                    status TEXT NOT NULL,
-                    progress REAL NOT NULL,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    original_files TEXT NOT NULL,
-                    revised_files TEXT NOT NULL,
-                    converted_files TEXT NOT NULL,
-                    reports TEXT NOT NULL,
-                    logs TEXT NOT NULL
-                )
+                CREATE INDEX IF NOT EXISTS idx_jobs_updated_cover
+                ON jobs(updated_at DESC, job_id, status, progress, created_at)
                 """
             )
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_updated_at ON jobs(updated_at)")
+
+    @staticmethod
+    def _split_legacy_jobs_table(conn: sqlite3.Connection) -> None:
+        """Move the original single-table schema into jobs, job_json and job_logs rows.
+
+        Text timestamps become integer microseconds and JSON file lists become
+        MessagePack, so every row is written in its final format in one pass.
+        The legacy table (and its updated_at index) is dropped afterwards.
+        """
+
+        conn.execute("BEGIN")
+        conn.execute("ALTER TABLE jobs RENAME TO jobs_legacy")
+        conn.execute(_CREATE_JOBS_TABLE)
+        conn.execute(_CREATE_JOB_JSON_TABLE)
+        conn.execute(_CREATE_JOB_LOGS_TABLE)
+        for row in conn.execute("SELECT * FROM jobs_legacy").fetchall():
+            job_id = row["job_id"]
+            conn.execute(
+                _INSERT_JOB_ROW,
+                (
+                    job_id,
+                    row["status"],
+                    row["progress"],
+                    _to_micros(datetime.fromisoformat(row["created_at"])),
+                    _to_micros(datetime.fromisoformat(row["updated_at"])),
+                ),
+            )
+            conn.executemany(
+                _UPSERT_JOB_JSON,
+                [(job_id, slot, ormsgpack.packb(orjson.loads(row[slot]))) for slot in _FILE_SLOTS],
+            )
+            conn.executemany(_INSERT_LOG_ROW, _log_rows(job_id, orjson.loads(row["logs"])))
+        conn.execute("DROP TABLE jobs_legacy")
 
     def _migrate_legacy_metadata(self) -> None:
         legacy_files = sorted(self._meta_dir.glob("*.json"))
         if not legacy_files:
             return
-        for path in legacy_files:
-            job_id = path.stem
-            with self._connect() as conn:
-                exists = conn.execute("SELECT 1 FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
-            if exists:
-                continue
-            try:
-                legacy_metadata = JobMetadata.model_validate_json(path.read_text(encoding="utf-8"))
-            except Exception:
-                continue
-            self._write_metadata(legacy_metadata)
+        with self._connect() as conn:
+            existing = {row["job_id"] for row in conn.execute("SELECT job_id FROM jobs")}
+            scalar_rows = []
+            slot_rows = []
+            log_rows = []
+            for path in legacy_files:
+                if path.stem in existing:
+                    continue
+                try:
+                    legacy_metadata = JobMetadata.model_validate_json(path.read_bytes())
+                except Exception:
+                    continue
+                scalars, slots = self._serialize_metadata(legacy_metadata)
+                scalar_rows.append(scalars)
+                slot_rows.extend(slots)
+                log_rows.extend(_log_rows(legacy_metadata.job_id, legacy_metadata.logs))
+            if scalar_rows:
+                # One transaction for the whole migration instead of a commit per file
+                conn.executemany(
+                    """
+                    INSERT OR IGNORE INTO jobs (job_id, status, progress, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    scalar_rows,
+                )
+                conn.executemany("INSERT OR IGNORE INTO job_json (job_id, slot, data) VALUES (?, ?, ?)", slot_rows)
+                conn.executemany(_INSERT_LOG_ROW, log_rows)
 
     async def _save_upload(self, target_dir: Path, upload: UploadFile, *, kind: str | None = None) -> StoredFile:
         filename = self._safe_filename(upload.filename)
-        target_path = target_dir / filename
-
-        hasher = sha256()
-        size = 0
-
+        stored_file = await write_upload(upload, target_dir / filename, kind=kind)
         await upload.seek(0)
-        with target_path.open("wb") as handle:
-            while True:
-                chunk = await upload.read(CHUNK_SIZE)
-                if not chunk:
-                    break
-                handle.write(chunk)
-                hasher.update(chunk)
-                size += len(chunk)
-        await upload.seek(0)
-
-        return StoredFile(
-            name=filename,
-            path=str(target_path.resolve()),
-            size=size,
-            checksum=hasher.hexdigest(),
-            content_type=upload.content_type,
-            kind=kind,
-        )
+        return stored_file
 
     @staticmethod
     def _safe_filename(filename: str | None) -> str:
@@ -327,3 +751,14 @@ class JobService:
         timestamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
         suffix = secrets.token_hex(4)
         return f"{timestamp}-{suffix}"
+
+
+@lru_cache(maxsize=8)
+def cached_job_service(storage_root: str) -> JobService:
+    """Return a shared JobService for the given storage root.
+
+    Construction creates directories, initialises the database and scans for
+    legacy metadata, so callers on hot paths should reuse one instance.
+    """
+
+    return JobService(Path(storage_root))
@@ -2,7 +2,7 @@
 
 The module provides two execution paths:
 
-* If the optional CAD stack (`ezdxf`, `numpy`, `shapely`, `rtree`) is installed, it
+* If the optional CAD stack (`ezdxf`, `shapely`, `rtree`) is installed, it
   performs the richer geometry parsing and alignment that was prototyped by the
   previous iteration of the project.
 * Otherwise it falls back to a lightweight, deterministic stub so that the rest of
@@ -10,16 +10,22 @@ The module provides two execution paths:
 """
 from __future__ import annotations
 
+import hashlib
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, replace
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, Iterator, Literal, cast
+from typing import Callable, Iterable, Iterator, Literal, cast
+
+import numpy as np
+import numpy.typing as npt
 
 try:  # pragma: no cover - optional dependency imports
     import re
-    from math import cos, radians, sin, tau, isclose
+    from math import radians, tau
 
     import ezdxf
-    import numpy as np
+    import shapely
     from ezdxf.lldxf.const import DXFStructureError
     from ezdxf.math import Matrix44, Vec3
     from rtree import index
@@ -30,22 +36,39 @@ except ImportError:  # pragma: no cover - executed when deps missing
     CAD_STACK_AVAILABLE = False
 
 
-@dataclass(slots=True)
+# eq=False: the generated __eq__ would compare vertex arrays element-wise
+@dataclass(slots=True, eq=False)
 class ParsedEntity:
-    """Lightweight representation of a geometry entity."""
+    """Lightweight representation of a geometry entity.
+
+    ``vertices`` is stored as a C-contiguous ``(N, 2)`` float64 array; any
+    sequence of ``(x, y)`` pairs passed in is converted on construction.
+    """
 
     entity_id: str
     entity_type: str
-    vertices: list[tuple[float, float]]
+    vertices: npt.NDArray[np.float64]
     layer: str | None = None
     color: int | None = None
     linetype: str | None = None
     source: Literal["original", "revised"] | None = None
 
+    def __post_init__(self) -> None:
+        self.vertices = np.ascontiguousarray(self.vertices, dtype=np.float64).reshape(-1, 2)
+
+
+# Vertex templates for the stub entities, shifted by a per-file offset
+_STUB_WALL = np.array([(0, 0), (60, 0), (60, 30)], dtype=np.float64)
+_STUB_DOOR = np.array([(80, 20), (100, 20), (100, 40)], dtype=np.float64)
+
+
+@lru_cache(maxsize=1024)
+def _stem_offset(seed: str) -> int:
+    return sum(map(ord, seed)) % 30
+
 
 def _stub_seed(path: Path) -> int:
-    stem = path.stem[-2:]
-    return sum(ord(ch) for ch in stem) % 30
+    return _stem_offset(path.stem[-2:])
 
 
 def _stub_entities(path: Path, source: Literal["original", "revised"] | None = None) -> list[ParsedEntity]:
@@ -54,7 +77,7 @@ def _stub_entities(path: Path, source: Literal["original", "revised"] | None = N
         ParsedEntity(
             entity_id=f"{path.stem}-wall",
             entity_type="WALL",
-            vertices=[(0 + offset, 0 + offset), (60 + offset, 0 + offset), (60 + offset, 30 + offset)],
+            vertices=_STUB_WALL + offset,
             layer="STUB",
             color=7,
             source=source,
@@ -62,7 +85,7 @@ def _stub_entities(path: Path, source: Literal["original", "revised"] | None = N
         ParsedEntity(
             entity_id=f"{path.stem}-door",
             entity_type="DOOR",
-            vertices=[(80 + offset, 20 + offset), (100 + offset, 20 + offset), (100 + offset, 40 + offset)],
+            vertices=_STUB_DOOR + offset,
             layer="STUB",
             color=3,
             source=source,
@@ -74,54 +97,78 @@ def _stub_entities(path: Path, source: Literal["original", "revised"] | None = N
 def parse_dxf(path: Path, *, source: Literal["original", "revised"] | None = None) -> list[ParsedEntity]:
     """Parse the given DXF file and return simplified entities."""
 
+    return list(iter_dxf(path, source=source))
+
+
+def parse_pair(
+    original_path: Path, revised_path: Path, *, parallel: Literal["thread", "process"] = "thread"
+) -> tuple[list[ParsedEntity], list[ParsedEntity]]:
+    """Parse the original and revised drawings concurrently.
+
+    ``"process"`` sidesteps the GIL for very large drawings at the cost of
+    pickling the parsed entities back; threads are cheaper for typical sizes.
+    """
+
+    executor_type: type[Executor] = ProcessPoolExecutor if parallel == "process" else ThreadPoolExecutor
+    with executor_type(max_workers=2) as executor:
+        original = executor.submit(parse_dxf, original_path, source="original")
+        revised = executor.submit(parse_dxf, revised_path, source="revised")
+        return original.result(), revised.result()
+
+
+def iter_dxf(path: Path, *, source: Literal["original", "revised"] | None = None) -> Iterator[ParsedEntity]:
+    """Yield simplified entities from the given DXF file one at a time.
+
+    Callers that only stream the entities onward (e.g. into serialization)
+    avoid holding the whole parsed list in memory.
+    """
+
     if not CAD_STACK_AVAILABLE:
-        return _stub_entities(path, source)
+        yield from _stub_entities(path, source)
+        return
 
     try:
         doc = ezdxf.readfile(path)
         msp = doc.modelspace()
     except (DXFStructureError, FileNotFoundError, OSError) as exc:  # pragma: no cover - heavy path
         if CAD_STACK_AVAILABLE:
-            return _stub_entities(path, source)
+            yield from _stub_entities(path, source)
+            return
         raise RuntimeError(f"Failed to parse DXF file {path}: {exc}") from exc
 
-    def _iter_entities() -> Iterator[ParsedEntity]:
-        for insert in msp.query("INSERT"):
-            try:
-                insert.explode()
-            except Exception:  # pragma: no cover - best effort explode
-                continue
+    for insert in msp.query("INSERT"):
+        try:
+            insert.explode()
+        except Exception:  # pragma: no cover - best effort explode
+            continue
+
+    for entity in msp:
+        if not hasattr(entity, "dxf"):
+            continue
+        dxftype = entity.dxftype()
+        vertices = _extract_vertices(entity, dxftype)
+        if vertices is None or len(vertices) == 0:
+            continue
+        dxf = entity.dxf
+        yield ParsedEntity(
+            entity_id=str(dxf.handle),
+            entity_type=dxftype,
+            vertices=vertices,
+            layer=getattr(dxf, "layer", None),
+            color=_safe_color(getattr(dxf, "color", None)),
+            linetype=getattr(dxf, "linetype", None),
+            source=source,
+        )
 
-        def _safe_color(value: int | None) -> int | None:
-            if value is None:
-                return None
-            try:
-                color_value = int(value)
-            except (TypeError, ValueError):
-                return None
-            return color_value if color_value > 0 else None
-
-        for entity in msp:
-            if not hasattr(entity, "dxf"):
-                continue
-            vertices = _extract_vertices(entity)
-            if not vertices:
-                continue
-            layer = getattr(entity.dxf, "layer", None)
-            color = _safe_color(getattr(entity.dxf, "color", None))
-            linetype = getattr(entity.dxf, "linetype", None)
-            data = ParsedEntity(
-                entity_id=str(entity.dxf.handle),
-                entity_type=entity.dxftype(),
-                vertices=vertices,
-                layer=layer,
-                color=color,
-                linetype=linetype,
-                source=source,
-            )
-            yield data
 
-    return list(_iter_entities())
+def _safe_color(value: int | None) -> int | None:
+    if value is None:
+        return None
+    try:
+        color_value = int(value)
+    except (TypeError, ValueError):
+        return None
+    return color_value if color_value > 0 else None
 
 
 def normalize_entities_by_grid(
@@ -133,108 +180,201 @@ def normalize_entities_by_grid(
 
 
 def match_entities(original: Iterable[ParsedEntity], revised: Iterable[ParsedEntity]) -> dict[str, list[ParsedEntity]]:
-    original_list = list(original)
-    revised_list = list(revised)
+    # Materialize each input once; generators are consumed here and lists are used as-is
+    original_list = original if isinstance(original, list) else list(original)
+    revised_list = revised if isinstance(revised, list) else list(revised)
 
     if not CAD_STACK_AVAILABLE:
-        original_ids = {entity.entity_id for entity in original_list}
-        revised_ids = {entity.entity_id for entity in revised_list}
-        added = [entity for entity in revised_list if entity.entity_id not in original_ids]
-        removed = [entity for entity in original_list if entity.entity_id not in revised_ids]
-        return {"added": added, "removed": removed, "modified": []}
-
-    original_geoms = {i: _to_geometry(entity) for i, entity in enumerate(original_list)}
-    revised_geoms = {i: _to_geometry(entity) for i, entity in enumerate(revised_list)}
-
-    original_geoms = {i: geom for i, geom in original_geoms.items() if geom is not None and not geom.is_empty}
-    revised_geoms = {i: geom for i, geom in revised_geoms.items() if geom is not None and not geom.is_empty}
-
-    spatial_index = index.Index()
-    for idx_value, geom in original_geoms.items():
-        spatial_index.insert(idx_value, geom.bounds)
-
-    matched_original: set[int] = set()
-    matched_revised: set[int] = set()
-
-    for revised_idx, revised_geom in revised_geoms.items():
-        for candidate_idx in spatial_index.intersection(revised_geom.bounds):
-            if candidate_idx in matched_original:
-                continue
-            original_geom = original_geoms.get(candidate_idx)
-            if original_geom is None:
-                continue
-            if original_geom.equals(revised_geom):
-                matched_original.add(candidate_idx)
-                matched_revised.add(revised_idx)
-                break
+        return _match_by_id(original_list, revised_list)
 
-    added = [revised_list[i] for i in revised_geoms if i not in matched_revised]
-    removed = [original_list[i] for i in original_geoms if i not in matched_original]
+    original_idx, original_geoms = _present_geometries(original_list)
+    revised_idx, revised_geoms = _present_geometries(revised_list)
+
+    tree = shapely.STRtree(original_geoms)
+    matched_original = np.zeros(original_idx.size, dtype=bool)
+    matched_revised = np.zeros(revised_idx.size, dtype=bool)
+    unmatched = original_idx.size
+
+    def _block_pairs(start: int) -> tuple[np.ndarray, np.ndarray]:
+        return _equal_pairs(tree, original_geoms, revised_geoms[start : start + _MATCH_QUERY_BLOCK], start)
+
+    starts = range(0, revised_geoms.size, _MATCH_QUERY_BLOCK)
+    # GEOS work releases the GIL, so large drawings check blocks on a thread pool;
+    # the one-to-one assignment below still consumes the blocks in order
+    executor = ThreadPoolExecutor() if revised_geoms.size > _PARALLEL_MATCH_THRESHOLD else None
+    try:
+        for positions, candidates in executor.map(_block_pairs, starts) if executor else map(_block_pairs, starts):
+            if not unmatched:
+                # Every original is taken; the remaining revised geometries are all added
+                break
+            for position, candidate in zip(positions.tolist(), candidates.tolist()):
+                if matched_revised[position] or matched_original[candidate]:
+                    continue
+                matched_original[candidate] = True
+                matched_revised[position] = True
+                unmatched -= 1
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+    added = [revised_list[i] for i in revised_idx[~matched_revised]]
+    removed = [original_list[i] for i in original_idx[~matched_original]]
 
     return {"added": added, "removed": removed, "modified": []}
 
 
+def _vertex_hashes(entities: list[ParsedEntity]) -> np.ndarray:
+    """Fold each entity's vertices into a 64-bit digest of their float64 bytes."""
+
+    return np.fromiter(
+        (
+            int.from_bytes(
+                hashlib.blake2b(entity.vertices.tobytes(), digest_size=8).digest(),
+                "little",
+            )
+            for entity in entities
+        ),
+        dtype=np.uint64,
+        count=len(entities),
+    )
+
+
+def _match_by_id(original: list[ParsedEntity], revised: list[ParsedEntity]) -> dict[str, list[ParsedEntity]]:
+    """Hash-join entities on ``entity_id``; shared ids whose geometry differs are modified."""
+
+    original_ids = np.array([entity.entity_id for entity in original], dtype=str)
+    revised_ids = np.array([entity.entity_id for entity in revised], dtype=str)
+
+    added_idx = np.flatnonzero(~np.isin(revised_ids, original_ids))
+    removed_idx = np.flatnonzero(~np.isin(original_ids, revised_ids))
+    _, common_original, common_revised = np.intersect1d(original_ids, revised_ids, return_indices=True)
+    changed = _vertex_hashes([original[i] for i in common_original]) != _vertex_hashes(
+        [revised[i] for i in common_revised]
+    )
+    modified_idx = np.sort(common_revised[changed])
+
+    # Only the (usually small) change sets are turned back into entity lists
+    return {
+        "added": [revised[i] for i in added_idx],
+        "removed": [original[i] for i in removed_idx],
+        "modified": [revised[i] for i in modified_idx],
+    }
+
+
 # ----- Rich CAD branch helpers (only evaluated when dependencies exist) -----
 
 if CAD_STACK_AVAILABLE:
 
-    def _vec2_to_tuple(value) -> tuple[float, float]:
-        try:
-            return (float(value.x), float(value.y))
-        except AttributeError:
-            return (float(value[0]), float(value[1]))
-
-    def _extract_vertices(entity) -> list[tuple[float, float]] | None:
-        if entity.dxftype() in {"LINE", "XLINE", "RAY"}:
-            return [_vec2_to_tuple(entity.dxf.start.vec2), _vec2_to_tuple(entity.dxf.end.vec2)]
-        if entity.dxftype() == "LWPOLYLINE":
-            try:
-                return [(float(x), float(y)) for x, y in entity.get_points("xy")]
-            except TypeError:
-                return [(float(x), float(y)) for x, y, *_ in entity.get_points()]
-        if entity.dxftype() == "POLYLINE":
-            try:
-                return [_vec2_to_tuple(vertex.dxf.location.vec2) for vertex in entity.vertices()]
-            except AttributeError:
-                return [(float(x), float(y)) for x, y, *_ in entity.points()]
-        if entity.dxftype() == "CIRCLE":
-            center = entity.dxf.center
-            radius = float(getattr(entity.dxf, "radius", 0))
-            if radius <= 0:
-                return None
-            steps = 64
-            return [
-                (
-                    float(center.x + radius * cos(tau * i / steps)),
-                    float(center.y + radius * sin(tau * i / steps)),
-                )
-                for i in range(steps)
-            ]
-        if entity.dxftype() == "ARC":
-            center = entity.dxf.center
-            radius = float(getattr(entity.dxf, "radius", 0))
-            if radius <= 0:
-                return None
-            start_angle = radians(getattr(entity.dxf, "start_angle", 0.0))
-            end_angle = radians(getattr(entity.dxf, "end_angle", 0.0))
-            if end_angle < start_angle:
-                end_angle += tau
-            steps = 48
-            return [
-                (
-                    float(center.x + radius * cos(start_angle + (end_angle - start_angle) * i / steps)),
-                    float(center.y + radius * sin(start_angle + (end_angle - start_angle) * i / steps)),
-                )
-                for i in range(steps + 1)
-            ]
-        if entity.dxftype() == "ELLIPSE":
+    # R-trees here are built once per call and never modified, so pack leaves densely
+    _RTREE_LEAF_CAPACITY = 100
+    _RTREE_FILL_FACTOR = 0.9
+    # Revised geometries per STRtree query; bounds the candidate arrays on drawings with heavy overlap
+    _MATCH_QUERY_BLOCK = 256
+    # Below this many revised geometries, thread start-up costs more than it saves
+    _PARALLEL_MATCH_THRESHOLD = 5_000
+
+    # Unit-circle samples shared by every CIRCLE entity
+    _CIRCLE_STEPS = 64
+    _CIRCLE_ANGLES = np.linspace(0.0, tau, _CIRCLE_STEPS, endpoint=False)
+    _CIRCLE_COS = np.cos(_CIRCLE_ANGLES)
+    _CIRCLE_SIN = np.sin(_CIRCLE_ANGLES)
+    _ARC_STEPS = 48
+
+    # Upper bound on label x segment distances evaluated per NumPy block
+    _GRID_DISTANCE_BLOCK = 1 << 20
+
+    def _bulk_index(bounds: list[tuple[int, tuple[float, float, float, float]]]):
+        """Bulk-load an R-tree (STR packing) instead of inserting entries one by one."""
+
+        if not bounds:
+            # libspatialindex rejects an empty bulk-load stream
+            return index.Index()
+        properties = index.Property(leaf_capacity=_RTREE_LEAF_CAPACITY, fill_factor=_RTREE_FILL_FACTOR)
+        return index.Index(((idx_value, box, None) for idx_value, box in bounds), properties=properties)
+
+    def _equal_pairs(
+        tree: "shapely.STRtree", original_geoms: np.ndarray, block: np.ndarray, offset: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return ``(revised position, original position)`` pairs of equal geometries.
+
+        Envelope candidates for the whole block come from one tree query and
+        are tested in one vectorized call. Pairs are ordered by revised
+        position, then by original position, so ties go to the lowest original.
+        """
+
+        query_idx, tree_idx = tree.query(block)
+        equal = shapely.equals(block[query_idx], original_geoms[tree_idx])
+        query_idx, tree_idx = query_idx[equal], tree_idx[equal]
+        order = np.lexsort((tree_idx, query_idx))
+        return query_idx[order] + offset, tree_idx[order]
+
+    _POINT_DTYPE = np.dtype((np.float64, 2))
+
+    def _xy_array(points) -> npt.NDArray[np.float64]:
+        """Pack the x/y components of tuples or Vec2/Vec3 points into an (N, 2) array."""
+
+        return np.fromiter(((point[0], point[1]) for point in points), dtype=_POINT_DTYPE)
+
+    def _line_vertices(entity) -> npt.NDArray[np.float64] | None:
+        dxf = entity.dxf
+        return _xy_array((dxf.start, dxf.end))
+
+    def _lwpolyline_vertices(entity) -> npt.NDArray[np.float64] | None:
+        # LWPOLYLINE keeps its points as packed (x, y, start_width, end_width, bulge) doubles
+        values = getattr(getattr(entity, "lwpoints", None), "values", None)
+        if values is not None:
+            return np.ascontiguousarray(np.asarray(values, dtype=np.float64).reshape(-1, 5)[:, :2])
+        return np.fromiter(entity.get_points("xy"), dtype=_POINT_DTYPE)
+
+    def _polyline_vertices(entity) -> npt.NDArray[np.float64] | None:
+        # Polyline.vertices is a list in ezdxf 1.x; points() yields Vec3 locations
+        return _xy_array(entity.points())
+
+    def _circle_vertices(entity) -> npt.NDArray[np.float64] | None:
+        dxf = entity.dxf
+        radius = float(getattr(dxf, "radius", 0))
+        if radius <= 0:
             return None
-        if entity.dxftype() == "SPLINE":
+        center = dxf.center
+        return np.column_stack((center.x + radius * _CIRCLE_COS, center.y + radius * _CIRCLE_SIN))
+
+    def _arc_vertices(entity) -> npt.NDArray[np.float64] | None:
+        dxf = entity.dxf
+        radius = float(getattr(dxf, "radius", 0))
+        if radius <= 0:
             return None
+        center = dxf.center
+        start_angle = radians(getattr(dxf, "start_angle", 0.0))
+        end_angle = radians(getattr(dxf, "end_angle", 0.0))
+        if end_angle < start_angle:
+            end_angle += tau
+        angles = np.linspace(start_angle, end_angle, _ARC_STEPS + 1)
+        return np.column_stack((center.x + radius * np.cos(angles), center.y + radius * np.sin(angles)))
+
+    def _no_vertices(entity) -> None:
+        return None
+
+    def _nested_vertices(entity) -> npt.NDArray[np.float64] | None:
         if hasattr(entity, "vertices"):
-            return [_vec2_to_tuple(v.dxf.location.vec2) for v in entity.vertices]
+            return _xy_array(vertex.dxf.location for vertex in entity.vertices)
         return None
 
+    # Entity types without an entry fall back to _nested_vertices
+    _EXTRACTORS: dict[str, Callable[[object], npt.NDArray[np.float64] | None]] = {
+        "LINE": _line_vertices,
+        "XLINE": _line_vertices,
+        "RAY": _line_vertices,
+        "LWPOLYLINE": _lwpolyline_vertices,
+        "POLYLINE": _polyline_vertices,
+        "CIRCLE": _circle_vertices,
+        "ARC": _arc_vertices,
+        "ELLIPSE": _no_vertices,
+        "SPLINE": _no_vertices,
+    }
+
+    def _extract_vertices(entity, dxftype: str | None = None) -> npt.NDArray[np.float64] | None:
+        return _EXTRACTORS.get(dxftype or entity.dxftype(), _nested_vertices)(entity)
+
 
     @dataclass(slots=True)
     class _GridAxis:
@@ -243,44 +383,126 @@ if CAD_STACK_AVAILABLE:
         line: LineString
 
 
+    def _within(a: np.ndarray, b: np.ndarray, tolerance: float) -> np.ndarray:
+        """Element-wise ``math.isclose(a, b, abs_tol=tolerance)`` with the default rel_tol."""
+
+        return np.abs(a - b) <= np.maximum(1e-9 * np.maximum(np.abs(a), np.abs(b)), tolerance)
+
+    def _line_orientations(
+        line_starts: np.ndarray, line_ends: np.ndarray, tolerance: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return masks of the vertical and horizontal lines."""
+
+        same_x = _within(line_starts[:, 0], line_ends[:, 0], tolerance)
+        same_y = _within(line_starts[:, 1], line_ends[:, 1], tolerance)
+        return same_x & ~same_y, same_y & ~same_x
+
+    def _segment_distances(points: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """``(P, S)`` distances from each point to each segment, using the same formula as GEOS."""
+
+        px, py = points[:, 0, None], points[:, 1, None]
+        ax, ay = starts[:, 0], starts[:, 1]
+        dx, dy = ends[:, 0] - ax, ends[:, 1] - ay
+        len2 = dx * dx + dy * dy
+        degenerate = len2 == 0
+        len2 = np.where(degenerate, 1.0, len2)
+        r = ((px - ax) * dx + (py - ay) * dy) / len2
+        s = ((ay - py) * dx - (ax - px) * dy) / len2
+        to_start = np.sqrt((px - ax) ** 2 + (py - ay) ** 2)
+        to_end = np.sqrt((px - ends[:, 0]) ** 2 + (py - ends[:, 1]) ** 2)
+        across = np.abs(s) * np.sqrt(len2)
+        return np.where(degenerate | (r <= 0), to_start, np.where(r >= 1, to_end, across))
+
+    def _circle_parameters(circles: list[ParsedEntity]) -> tuple[np.ndarray, np.ndarray]:
+        """Return each circle's vertex centroid and the gap between its first two vertices.
+
+        The sampled vertices of all circles are reduced in one pass per
+        quantity instead of once per circle.
+        """
+
+        if not circles:
+            return np.empty((0, 2)), np.empty(0)
+        counts = np.fromiter((len(circle.vertices) for circle in circles), dtype=np.intp, count=len(circles))
+        coords = np.concatenate([circle.vertices for circle in circles])
+        starts = np.cumsum(counts) - counts
+        centers = np.add.reduceat(coords, starts, axis=0) / counts[:, None]
+        gaps = coords[starts + np.minimum(1, counts - 1)] - coords[starts]
+        return centers, np.hypot(gaps[:, 0], gaps[:, 1])
+
+    def _labels_in_circles(
+        text_xy: np.ndarray, circle_centers: np.ndarray, circle_radii: np.ndarray, tolerance: float
+    ) -> np.ndarray:
+        """Return a mask of the text points lying inside any circle.
+
+        An R-tree over the circle boxes prefilters the candidates so only
+        the circles around each label get the exact distance check.
+        """
+
+        labelled = np.zeros(len(text_xy), dtype=bool)
+        if not len(text_xy) or not len(circle_centers):
+            return labelled
+        reach = circle_radii + tolerance
+        boxes = np.hstack((circle_centers - reach[:, None], circle_centers + reach[:, None]))
+        circle_idx = _bulk_index(list(enumerate(map(tuple, boxes.tolist()))))
+        hits, counts = circle_idx.intersection_v(text_xy, text_xy)
+        texts = np.repeat(np.arange(len(text_xy)), counts.astype(np.intp))
+        circles = hits.astype(np.intp)
+        offsets = text_xy[texts] - circle_centers[circles]
+        inside = np.einsum("ij,ij->i", offsets, offsets) <= reach[circles] ** 2
+        labelled[texts[inside]] = True
+        return labelled
+
+
     def _find_grid_axes(entities: list[ParsedEntity], tolerance: float = 1e-3) -> list[_GridAxis]:
         label_re = re.compile(r"^[A-Z0-9']+$")
         texts = [entity for entity in entities if entity.entity_type == "TEXT" and label_re.match(entity.entity_id)]
         circles = [entity for entity in entities if entity.entity_type == "CIRCLE"]
-
-        axis_labels: list[tuple[str, Point]] = []
-        for text in texts:
-            text_center = Point(text.vertices[0])
-            for circle in circles:
-                circle_center = Point(np.mean(circle.vertices, axis=0))
-                radius = Point(circle.vertices[0]).distance(Point(circle.vertices[min(1, len(circle.vertices) - 1)]))
-                if text_center.distance(circle_center) <= radius + tolerance:
-                    axis_labels.append((text.entity_id, text_center))
-                    break
-
-        lines = [entity for entity in entities if entity.entity_type in {"LINE", "LWPOLYLINE"}]
-        candidates: list[tuple[LineString, bool]] = []
-        for line in lines:
-            if len(line.vertices) < 2:
-                continue
-            start, end = Vec3(line.vertices[0]), Vec3(line.vertices[-1])
-            vertical = isclose(start.x, end.x, abs_tol=tolerance) and not isclose(start.y, end.y, abs_tol=tolerance)
-            horizontal = isclose(start.y, end.y, abs_tol=tolerance) and not isclose(start.x, end.x, abs_tol=tolerance)
-            if vertical or horizontal:
-                candidates.append((LineString(line.vertices), vertical))
-
-        axes: list[_GridAxis] = []
-        for label, center in axis_labels:
-            best_match: tuple[LineString, bool] | None = None
-            best_distance = float("inf")
-            for line, is_vertical in candidates:
-                distance = line.distance(center)
-                if distance < best_distance:
-                    best_distance = distance
-                    best_match = (line, is_vertical)
-            if best_match and best_distance < 500:
-                axes.append(_GridAxis(label=label, is_vertical=best_match[1], line=best_match[0]))
-        return axes
+        lines = [
+            entity
+            for entity in entities
+            if entity.entity_type in {"LINE", "LWPOLYLINE"} and len(entity.vertices) >= 2
+        ]
+
+        text_xy = np.array([text.vertices[0] for text in texts], dtype=np.float64).reshape(-1, 2)
+        circle_centers, circle_radii = _circle_parameters(circles)
+        line_starts = np.array([line.vertices[0] for line in lines], dtype=np.float64).reshape(-1, 2)
+        line_ends = np.array([line.vertices[-1] for line in lines], dtype=np.float64).reshape(-1, 2)
+
+        vertical, horizontal = _line_orientations(line_starts, line_ends, tolerance)
+        candidate_idx = np.flatnonzero(vertical | horizontal)
+        label_idx = np.flatnonzero(_labels_in_circles(text_xy, circle_centers, circle_radii, tolerance))
+        if not len(candidate_idx) or not len(label_idx):
+            return []
+
+        # Segments of every candidate polyline, laid end to end
+        paths = [lines[i].vertices for i in candidate_idx]
+        seg_starts = np.concatenate([path[:-1] for path in paths])
+        seg_ends = np.concatenate([path[1:] for path in paths])
+        seg_offsets = np.cumsum([0] + [len(path) - 1 for path in paths[:-1]])
+
+        matched_labels: list[np.ndarray] = []
+        matched_lines: list[np.ndarray] = []
+        block = max(1, _GRID_DISTANCE_BLOCK // len(seg_starts))
+        for chunk in np.array_split(label_idx, range(block, len(label_idx), block)):
+            segment_distances = _segment_distances(text_xy[chunk], seg_starts, seg_ends)
+            distances = np.minimum.reduceat(segment_distances, seg_offsets, axis=1)
+            best = distances.argmin(axis=1)
+            close = distances[np.arange(len(chunk)), best] < 500
+            matched_labels.append(chunk[close])
+            matched_lines.append(candidate_idx[best[close]])
+
+        labels = np.concatenate(matched_labels)
+        matched = np.concatenate(matched_lines)
+        if not matched.size:
+            return []
+        paths = [lines[line].vertices for line in matched]
+        geoms = shapely.linestrings(
+            np.concatenate(paths), indices=np.repeat(np.arange(len(paths)), [len(path) for path in paths])
+        )
+        return [
+            _GridAxis(label=texts[label].entity_id, is_vertical=bool(vertical[line]), line=geom)
+            for label, line, geom in zip(labels, matched, geoms)
+        ]
 
 
     def _normalize_by_grid(
@@ -292,12 +514,15 @@ if CAD_STACK_AVAILABLE:
             return revised_entities
 
         def _reference_points(axes: list[_GridAxis]) -> tuple[Point | None, Point | None]:
-            horizontal = sorted((axis for axis in axes if not axis.is_vertical), key=lambda axis: axis.line.bounds[1])
-            vertical = sorted((axis for axis in axes if axis.is_vertical), key=lambda axis: axis.line.bounds[0])
+            lines = np.array([axis.line for axis in axes], dtype=object)
+            is_vertical = np.array([axis.is_vertical for axis in axes], dtype=bool)
+            bounds = shapely.bounds(lines)
+            # Stable sorts keep the original order among axes at the same offset
+            horizontal = lines[~is_vertical][np.argsort(bounds[~is_vertical, 1], kind="stable")]
+            vertical = lines[is_vertical][np.argsort(bounds[is_vertical, 0], kind="stable")]
             if len(horizontal) < 2 or len(vertical) < 2:
                 return None, None
-            first = horizontal[0].line.intersection(vertical[0].line)
-            last = horizontal[-1].line.intersection(vertical[-1].line)
+            first, last = shapely.intersection(horizontal[[0, -1]], vertical[[0, -1]])
             return first, last
 
         original_first, original_last = _reference_points(original_axes)
@@ -320,26 +545,71 @@ if CAD_STACK_AVAILABLE:
             @ Matrix44.translate(original_first.x, original_first.y, 0)
         )
 
-        transformed: list[ParsedEntity] = []
-        for entity in revised_entities:
-            new_vertices = [transform.transform(Vec3(x, y, 0)).vec2 for x, y in entity.vertices]
-            transformed.append(replace(entity, vertices=new_vertices))
-        return transformed
+        return _apply_affine(transform, revised_entities)
 
 
-    def _to_geometry(entity: ParsedEntity):
-        if len(entity.vertices) < 2:
-            return None
-        if len(entity.vertices) > 2 and entity.vertices[0] == entity.vertices[-1]:
+    def _apply_affine(transform: "Matrix44", entities: list[ParsedEntity]) -> list[ParsedEntity]:
+        """Apply ``transform`` to every entity's vertices in one matrix product.
+
+        Matrix44 maps row vectors, so for z=0 points the planar part is the
+        upper-left 2x2 block plus the first two entries of the translation row.
+        """
+
+        if not entities:
+            return []
+        matrix = np.array(list(transform.rows()), dtype=np.float64)
+        counts = [len(entity.vertices) for entity in entities]
+        stacked = np.concatenate([entity.vertices for entity in entities]) @ matrix[:2, :2] + matrix[3, :2]
+        chunks = np.split(stacked, np.cumsum(counts)[:-1])
+        return [replace(entity, vertices=chunk) for entity, chunk in zip(entities, chunks)]
+
+
+    def _to_geometries(entities: list[ParsedEntity]) -> np.ndarray:
+        """Build one geometry per entity with shapely's array constructors.
+
+        Closed paths become polygons, other paths of two or more vertices become
+        line strings; entries are ``None`` where no geometry can be built.
+        """
+
+        geoms = np.full(len(entities), None, dtype=object)
+        if not entities:
+            return geoms
+        counts = np.fromiter((len(entity.vertices) for entity in entities), dtype=np.intp, count=len(entities))
+        coords = np.concatenate([entity.vertices for entity in entities])
+        ends = np.cumsum(counts)
+        starts = ends - counts
+        closed = counts > 2
+        closed[closed] = np.all(coords[starts[closed]] == coords[ends[closed] - 1], axis=1)
+
+        def _build(mask: np.ndarray, constructor) -> None:
+            selected = np.flatnonzero(mask)
+            if selected.size:
+                indices = np.repeat(np.arange(selected.size), counts[selected])
+                geoms[selected] = constructor(coords[np.repeat(mask, counts)], indices=indices)
+
+        def _polygons(ring_coords: np.ndarray, indices: np.ndarray) -> np.ndarray:
+            return shapely.polygons(shapely.linearrings(ring_coords, indices=indices))
+
+        _build((counts >= 2) & ~closed, shapely.linestrings)
+        _build(closed & (counts >= 4), _polygons)
+        # linearrings rejects three-point closed paths that Polygon() pads itself
+        for i in np.flatnonzero(closed & (counts < 4)):
             try:
-                return Polygon(entity.vertices)
+                geoms[i] = Polygon(entities[i].vertices)
             except ValueError:
-                return None
-        return LineString(entity.vertices)
+                pass
+        return geoms
+
+    def _present_geometries(entities: list[ParsedEntity]) -> tuple[np.ndarray, np.ndarray]:
+        """Return the positions of entities with a non-empty geometry and those geometries."""
+
+        geoms = _to_geometries(entities)
+        present = np.flatnonzero(~shapely.is_missing(geoms) & ~shapely.is_empty(geoms))
+        return present, geoms[present]
 
 else:
 
-    def _extract_vertices(entity) -> list[tuple[float, float]] | None:  # pragma: no cover - stub branch
+    def _extract_vertices(entity, dxftype: str | None = None) -> npt.NDArray[np.float64] | None:  # pragma: no cover - stub branch
         return None
 
     def _normalize_by_grid(
@@ -347,8 +617,8 @@ else:
     ) -> list[ParsedEntity]:  # pragma: no cover - stub branch
         return revised_entities
 
-    def _to_geometry(entity: ParsedEntity):  # pragma: no cover - stub branch
-        return None
+    def _present_geometries(entities: list[ParsedEntity]):  # pragma: no cover - stub branch
+        return None, None
 
 
-__all__ = ["ParsedEntity", "parse_dxf", "normalize_entities_by_grid", "match_entities"]
+__all__ = ["ParsedEntity", "parse_dxf", "parse_pair", "iter_dxf", "normalize_entities_by_grid", "match_entities"]
@@ -3,7 +3,7 @@ PDF comparison service for detecting differences between floor plans
 """
 import cv2
 import numpy as np
-from pdf2image import convert_from_path
+import pymupdf
 from skimage.metrics import structural_similarity as ssim
 from pathlib import Path
 import logging
@@ -12,18 +12,36 @@ import json
 
 logger = logging.getLogger(__name__)
 
+# OPEN then CLOSE with a 5x5 square is erode5, dilate5, dilate5, erode5; the two
+# middle dilations compose into a single 9x9 one, saving a full-frame pass
+_MORPH_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+_MORPH_BRIDGE_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (9, 9))
+
+# Pixels whose grey levels differ by more than this count as changed
+_DIFF_THRESHOLD = 30
+
+# Contours at or below this area (in pixels at _REFERENCE_DPI) are treated as noise
+_MIN_CONTOUR_AREA = 100
+_REFERENCE_DPI = 300
+
+# BGR box colours indexed by sign(mean2 - mean1) + 1: darker (deletion), same
+# brightness (modification), brighter (addition)
+_CHANGE_COLORS = np.array([(0, 0, 255), (255, 255, 0), (0, 255, 0)])
+
 class PDFComparator:
     """
     A class to compare PDF files and detect differences
     """
     
-    def __init__(self, dpi: int = 300):
+    def __init__(self, dpi: int = 200, output_dpi: Optional[int] = None):
         """
         Initialize the comparator
         
-        :param dpi: Resolution for PDF to image conversion
+        :param dpi: Resolution for PDF to image conversion; bboxes and areas are in these pixels
+        :param output_dpi: Resolution of the annotated difference image (defaults to ``dpi``)
         """
         self.dpi = dpi
+        self.output_dpi = output_dpi or dpi
     
     def compare_pdfs(self, 
                      pdf1_path: str, 
@@ -50,31 +68,39 @@ class PDFComparator:
             if not pdf2_path.exists():
                 raise FileNotFoundError(f"Modified PDF not found: {pdf2_path}")
             
-            # Convert PDFs to images
+            # Convert PDFs to grayscale images; change detection needs nothing else
             logger.info("Converting PDFs to images...")
-            img1 = self._pdf_to_image(pdf1_path)
-            img2 = self._pdf_to_image(pdf2_path)
+            gray1 = self._pdf_to_image(pdf1_path)
+            gray2 = self._pdf_to_image(pdf2_path)
             
-            if img1 is None or img2 is None:
+            if gray1 is None or gray2 is None:
                 raise ValueError("Failed to convert PDFs to images")
             
+            # The colour rendering is only needed to annotate the saved image
+            canvas = None
+            if output_image_path:
+                canvas = self._pdf_to_image(pdf2_path, color=True, dpi=self.output_dpi)
+                if canvas is None:
+                    raise ValueError("Failed to convert PDFs to images")
+            
             # Detect changes
             logger.info("Detecting changes...")
-            diff_image, contours, stats = self._detect_changes(img1, img2)
+            diff_image, contours, areas, bboxes, stats = self._detect_changes(gray1, gray2, canvas)
             
             # Prepare results
             result = {
                 "original_pdf": str(pdf1_path),
                 "modified_pdf": str(pdf2_path),
+                "dpi": self.dpi,
                 "change_count": len(contours),
                 "total_area": stats["total_area"],
                 "change_percentage": stats["change_percentage"],
                 "contours": [
                     {
-                        "area": cv2.contourArea(contour),
-                        "bbox": cv2.boundingRect(contour)
+                        "area": area,
+                        "bbox": bbox
                     }
-                    for contour in contours
+                    for area, bbox in zip(areas.tolist(), bboxes)
                 ]
             }
             
@@ -84,7 +110,7 @@ class PDFComparator:
                 output_image_path.parent.mkdir(parents=True, exist_ok=True)
                 cv2.imwrite(str(output_image_path), diff_image)
                 result["difference_image"] = str(output_image_path)
-                logger.info(f"Difference image saved to {output_image_path}")
+                logger.info("Difference image saved to %s", output_image_path)
             
             # Save JSON report if requested
             if output_json_path:
@@ -93,94 +119,139 @@ class PDFComparator:
                 with open(output_json_path, 'w') as f:
                     json.dump(result, f, indent=2)
                 result["json_report"] = str(output_json_path)
-                logger.info(f"JSON report saved to {output_json_path}")
+                logger.info("JSON report saved to %s", output_json_path)
             
-            logger.info(f"Comparison completed: {len(contours)} changes detected")
+            logger.info("Comparison completed: %s changes detected", len(contours))
             return result
             
         except Exception as e:
-            logger.error(f"Error during PDF comparison: {str(e)}")
+            logger.error("Error during PDF comparison: %s", e)
             raise
     
-    def _pdf_to_image(self, pdf_path: Path) -> Optional[np.ndarray]:
+    def _pdf_to_image(
+        self, pdf_path: Path, color: bool = False, dpi: Optional[int] = None
+    ) -> Optional[np.ndarray]:
         """
-        Convert PDF to image
+        Render the first page of a PDF in-process with PyMuPDF
         
         :param pdf_path: Path to PDF file
+        :param color: Return a BGR image instead of a single-channel grayscale one
+        :param dpi: Render resolution (defaults to the comparator's ``dpi``)
         :return: Image as numpy array or None if failed
         """
         try:
-            images = convert_from_path(str(pdf_path), dpi=self.dpi, first_page=1, last_page=1)
-            if images:
-                # Convert PIL image to OpenCV format
-                img = cv2.cvtColor(np.array(images[0]), cv2.COLOR_RGB2BGR)
-                return img
-            return None
+            with pymupdf.open(pdf_path) as document:
+                if document.page_count == 0:
+                    return None
+                zoom = (dpi or self.dpi) / 72
+                pixmap = document[0].get_pixmap(
+                    matrix=pymupdf.Matrix(zoom, zoom),
+                    colorspace=pymupdf.csRGB if color else pymupdf.csGRAY,
+                    alpha=False,
+                )
+            # ``samples`` is a bytes copy that outlives the pixmap; rows may be padded to ``stride``
+            samples = np.frombuffer(pixmap.samples, dtype=np.uint8).reshape(pixmap.height, pixmap.stride)
+            pixels = samples[:, : pixmap.width * pixmap.n]
+            if not color:
+                return pixels
+            return cv2.cvtColor(pixels.reshape(pixmap.height, pixmap.width, 3), cv2.COLOR_RGB2BGR)
         except Exception as e:
-            logger.error(f"Error converting PDF to image: {str(e)}")
+            logger.error("Error converting PDF to image: %s", e)
             return None
     
-    def _detect_changes(self, img1: np.ndarray, img2: np.ndarray) -> Tuple[np.ndarray, List, dict]:
+    @staticmethod
+    def _change_mask(gray1: np.ndarray, gray2: np.ndarray) -> np.ndarray:
+        """
+        Build the binary change mask: thresholded difference, then a 5x5 open and close
+        
+        Rectangular kernels are already applied as separate row and column
+        passes inside OpenCV, so splitting them by hand only adds passes.
+        
+        :param gray1: First image (original)
+        :param gray2: Second image (modified)
+        :return: Mask with changed pixels set to 255
         """
-        Detect changes between two images
+        # Calculate difference and threshold it in the same buffer; cv2.compare-based
+        # masks need extra full frames for the offset images and measure several times slower
+        mask = cv2.absdiff(gray1, gray2)
+        cv2.threshold(mask, _DIFF_THRESHOLD, 255, cv2.THRESH_BINARY, dst=mask)
         
-        :param img1: First image (original)
-        :param img2: Second image (modified)
-        :return: Tuple of (difference image, contours, statistics)
+        # Morphological open + close to clean up, in place
+        cv2.erode(mask, _MORPH_KERNEL, dst=mask)
+        cv2.dilate(mask, _MORPH_BRIDGE_KERNEL, dst=mask)
+        cv2.erode(mask, _MORPH_KERNEL, dst=mask)
+        return mask
+    
+    @staticmethod
+    def _region_brightening(gray1: np.ndarray, gray2: np.ndarray, bboxes: List[Tuple[int, int, int, int]]) -> np.ndarray:
         """
-        # Convert to grayscale
-        gray1 = cv2.cvtColor(img1, cv2.COLOR_BGR2GRAY)
-        gray2 = cv2.cvtColor(img2, cv2.COLOR_BGR2GRAY)
+        Sum of ``gray2 - gray1`` over each bounding box, read from one summed-area table
+        
+        Both regions of a box have the same size, so the sign of this sum is the
+        sign of ``mean2 - mean1``. Sums are exact integers in float64.
         
-        # Calculate difference
-        diff = cv2.absdiff(gray1, gray2)
+        :param gray1: First image (original)
+        :param gray2: Second image (modified)
+        :param bboxes: ``(x, y, w, h)`` boxes
+        :return: One signed sum per box
+        """
+        if not bboxes:
+            return np.zeros(0)
+        delta = cv2.subtract(gray2, gray1, dtype=cv2.CV_16S)
+        table = cv2.integral(delta, sdepth=cv2.CV_64F)
+        x, y, w, h = np.asarray(bboxes, dtype=np.intp).T
+        return table[y + h, x + w] - table[y, x + w] - table[y + h, x] + table[y, x]
+    
+    def _detect_changes(
+        self, gray1: np.ndarray, gray2: np.ndarray, canvas: Optional[np.ndarray] = None
+    ) -> Tuple[Optional[np.ndarray], List, np.ndarray, List[Tuple[int, int, int, int]], dict]:
+        """
+        Detect changes between two grayscale images
         
-        # Apply threshold
-        _, thresh = cv2.threshold(diff, 30, 255, cv2.THRESH_BINARY)
+        :param gray1: First image (original)
+        :param gray2: Second image (modified)
+        :param canvas: BGR rendering of the modified page, annotated in place (optional)
+        :return: Tuple of (annotated canvas or None, contours, contour areas, bounding boxes, statistics)
+        """
+        # No pixel past the threshold means an empty mask, which morphology keeps
+        # empty; one read-only pass settles unchanged pages exactly
+        if cv2.norm(gray1, gray2, cv2.NORM_INF) <= _DIFF_THRESHOLD:
+            return canvas, [], np.zeros(0), [], {"total_area": 0.0, "change_percentage": 0.0}
         
-        # Morphological operations to clean up
-        kernel = np.ones((5, 5), np.uint8)
-        thresh = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, kernel)
-        thresh = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
+        thresh = self._change_mask(gray1, gray2)
         
         # Find contours
         contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
-        # Filter small contours
-        min_area = 100
-        contours = [c for c in contours if cv2.contourArea(c) > min_area]
-        
-        # Create difference image with color coding
-        result = img2.copy()
-        
-        # Color code differences
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            if area > min_area:
-                # Get bounding box
-                x, y, w, h = cv2.boundingRect(contour)
-                
-                # Sample region values to determine change type
-                region1 = gray1[y:y+h, x:x+w]
-                region2 = gray2[y:y+h, x:x+w]
-                
-                mean1 = np.mean(region1) if region1.size > 0 else 0
-                mean2 = np.mean(region2) if region2.size > 0 else 0
-                
-                # Color code based on change type
-                if mean2 > mean1:  # Brighter (addition)
-                    color = (0, 255, 0)  # Green
-                elif mean2 < mean1:  # Darker (deletion)
-                    color = (0, 0, 255)  # Red
-                else:  # Same brightness (modification)
-                    color = (255, 255, 0)  # Yellow
-                
-                # Draw rectangle
-                cv2.rectangle(result, (x, y), (x+w, y+h), color, 2)
+        # Filter small contours; the noise floor scales with pixel density to cover the same paper area
+        min_area = _MIN_CONTOUR_AREA * (self.dpi / _REFERENCE_DPI) ** 2
+        areas = np.fromiter((cv2.contourArea(c) for c in contours), dtype=np.float64, count=len(contours))
+        keep = areas > min_area
+        contours = [c for c, kept in zip(contours, keep) if kept]
+        areas = areas[keep]
+        bboxes = [cv2.boundingRect(c) for c in contours]
+        
+        # Create difference image with color coding, only when a canvas was rendered
+        result = canvas
+        if result is not None:
+            scale = self.output_dpi / self.dpi
+            thickness = max(2, round(2 * scale))
+            
+            # Color code based on change type, for all regions at once
+            brightening = self._region_brightening(gray1, gray2, bboxes)
+            colors = _CHANGE_COLORS[np.sign(brightening).astype(np.intp) + 1]
+            
+            # Rectangle corners mapped onto the canvas resolution
+            boxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+            starts = np.rint(boxes[:, :2] * scale).astype(int)
+            ends = np.rint((boxes[:, :2] + boxes[:, 2:]) * scale).astype(int)
+            
+            for start, end, color in zip(starts.tolist(), ends.tolist(), colors.tolist()):
+                cv2.rectangle(result, tuple(start), tuple(end), tuple(color), thickness)
         
         # Calculate statistics
-        total_area = sum(cv2.contourArea(c) for c in contours)
-        image_area = img1.shape[0] * img1.shape[1]
+        total_area = float(areas.sum())
+        image_area = gray1.shape[0] * gray1.shape[1]
         change_percentage = (total_area / image_area) * 100 if image_area > 0 else 0
         
         stats = {
@@ -188,7 +259,7 @@ class PDFComparator:
             "change_percentage": change_percentage
         }
         
-        return result, contours, stats
+        return result, contours, areas, bboxes, stats
 
 
 def compare_floor_plans(original_pdf: str, modified_pdf: str, **kwargs) -> dict:
@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable, Sequence
 
+import numpy as np
+
 from app.models import DiffEntity
 from app.services.parsing import ParsedEntity
 
@@ -16,6 +18,27 @@ except ImportError:  # pragma: no cover - executed when reportlab missing
     REPORTLAB_AVAILABLE = False
 
 
+if REPORTLAB_AVAILABLE:
+    # Colours are parsed once; lookups are plain dict/tuple access per render
+    _TEXT_COLOR = colors.HexColor("#0f172a")
+    _TITLE_COLOR = colors.HexColor("#e2e8f0")
+    _ORIGINAL_STROKE = colors.HexColor("#cbd5f5")
+    _REVISED_STROKE = colors.HexColor("#93c5fd")
+    _DIFF_PALETTE = {
+        "added": (colors.HexColor("#34d399"), colors.HexColor("#bbf7d0")),
+        "removed": (colors.HexColor("#f87171"), colors.HexColor("#fecaca")),
+        "modified": (colors.HexColor("#f59e0b"), colors.HexColor("#fde68a")),
+    }
+    _DEFAULT_DIFF_COLORS = (colors.black, _TITLE_COLOR)
+    _LEGEND_ENTRIES = (
+        (_ORIGINAL_STROKE, "原图"),
+        (_REVISED_STROKE, "改图"),
+        (_DIFF_PALETTE["added"][0], "新增"),
+        (_DIFF_PALETTE["removed"][0], "删除"),
+        (_DIFF_PALETTE["modified"][0], "修改"),
+    )
+
+
 @dataclass(slots=True)
 class _Viewport:
     min_x: float
@@ -62,25 +85,20 @@ def _render_with_reportlab(
     pdf.setFillColor(colors.white)
     pdf.rect(0, 0, viewport.page_width, viewport.page_height, fill=1, stroke=0)
 
-    pdf.setFillColor(colors.HexColor("#e2e8f0"))
-    pdf.setFont("Helvetica-Bold", 14)
-    pdf.drawString(36, viewport.page_height - 36, "Floor Plan Diff Overlay")
-    pdf.setFont("Helvetica", 10)
-    pdf.setFillColor(colors.HexColor("#0f172a"))
-    pdf.drawString(36, viewport.page_height - 52, f"Job ID: {job_id}")
+    header = pdf.beginText(36, viewport.page_height - 36)
+    header.setFillColor(_TITLE_COLOR)
+    header.setFont("Helvetica-Bold", 14)
+    header.textLine("Floor Plan Diff Overlay")
+    header.setTextOrigin(36, viewport.page_height - 52)
+    header.setFont("Helvetica", 10)
+    header.setFillColor(_TEXT_COLOR)
+    header.textOut(f"Job ID: {job_id}")
+    pdf.drawText(header)
 
-    _draw_entities(pdf, original_entities, viewport, stroke=colors.HexColor("#cbd5f5"), fill=None)
-    _draw_entities(pdf, revised_entities, viewport, stroke=colors.HexColor("#93c5fd"), fill=None)
+    _draw_entities(pdf, original_entities, viewport, stroke=_ORIGINAL_STROKE, fill=None)
+    _draw_entities(pdf, revised_entities, viewport, stroke=_REVISED_STROKE, fill=None)
 
-    diff_palette = {
-        "added": (colors.HexColor("#34d399"), colors.HexColor("#bbf7d0")),
-        "removed": (colors.HexColor("#f87171"), colors.HexColor("#fecaca")),
-        "modified": (colors.HexColor("#f59e0b"), colors.HexColor("#fde68a")),
-    }
-
-    for entity in diff_entities:
-        stroke_color, fill_color = diff_palette.get(entity.change_type, (colors.black, colors.HexColor("#e2e8f0")))
-        _draw_diff_entity(pdf, entity, viewport, stroke=stroke_color, fill=fill_color)
+    _draw_diff_entities(pdf, diff_entities, viewport)
 
     _draw_legend(pdf, viewport)
 
@@ -92,14 +110,12 @@ def _collect_points(
     original_entities: Sequence[ParsedEntity],
     revised_entities: Sequence[ParsedEntity],
     diff_entities: Sequence[DiffEntity],
-) -> list[tuple[float, float]]:
-    points: list[tuple[float, float]] = []
-    for collection in (original_entities, revised_entities):
-        for entity in collection:
-            points.extend(entity.vertices)
-    for entity in diff_entities:
-        points.extend(entity.polygon.points)
-    return points
+) -> np.ndarray:
+    arrays = [entity.vertices for collection in (original_entities, revised_entities) for entity in collection]
+    arrays.extend(np.asarray(entity.polygon.points, dtype=np.float64).reshape(-1, 2) for entity in diff_entities)
+    if not arrays:
+        return np.empty((0, 2))
+    return np.concatenate(arrays)
 
 
 def _compute_viewport(
@@ -108,13 +124,11 @@ def _compute_viewport(
     diff_entities: Sequence[DiffEntity],
 ) -> _Viewport:
     points = _collect_points(original_entities, revised_entities, diff_entities)
-    if not points:
+    if not len(points):
         return _Viewport(0.0, 0.0, 1.0, 612.0, 792.0)
 
-    xs = [point[0] for point in points]
-    ys = [point[1] for point in points]
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
+    min_x, min_y = points.min(axis=0).tolist()
+    max_x, max_y = points.max(axis=0).tolist()
 
     width = max(max_x - min_x, 1.0)
     height = max(max_y - min_y, 1.0)
@@ -127,10 +141,12 @@ def _compute_viewport(
     return _Viewport(min_x=min_x, min_y=min_y, scale=scale, page_width=page_width, page_height=page_height)
 
 
-def _transform(point: tuple[float, float], viewport: _Viewport) -> tuple[float, float]:
-    x = (point[0] - viewport.min_x) * viewport.scale + 72.0
-    y = (point[1] - viewport.min_y) * viewport.scale + 72.0
-    return (x, viewport.page_height - y)
+def _transform_array(points: np.ndarray, viewport: _Viewport) -> np.ndarray:
+    """Map ``(N, 2)`` drawing coordinates to page coordinates (PDF y axis points up)."""
+
+    page = (points - (viewport.min_x, viewport.min_y)) * viewport.scale + 72.0
+    page[:, 1] = viewport.page_height - page[:, 1]
+    return page
 
 
 def _draw_entities(
@@ -145,49 +161,74 @@ def _draw_entities(
     pdf.setStrokeColor(stroke)
     if fill is not None:
         pdf.setFillColor(fill)
-    for entity in entities:
-        if len(entity.vertices) < 2:
-            continue
-        path = pdf.beginPath()
-        first = _transform(entity.vertices[0], viewport)
-        path.moveTo(*first)
-        for vertex in entity.vertices[1:]:
-            path.lineTo(*_transform(vertex, viewport))
-        pdf.drawPath(path, fill=bool(fill), stroke=1)
-
 
-def _draw_diff_entity(pdf: "canvas.Canvas", entity: DiffEntity, viewport: _Viewport, *, stroke, fill) -> None:
-    if not entity.polygon.points:
+    # Two-vertex entities enclose no area, so they are batched into a single lines() call.
+    # Unfilled polylines share one path; filled ones keep their own so even-odd fills
+    # of overlapping entities do not cut holes into each other.
+    drawable = [entity.vertices for entity in entities if len(entity.vertices) >= 2]
+    if not drawable:
         return
-    path = pdf.beginPath()
-    first = _transform(entity.polygon.points[0], viewport)
-    path.moveTo(*first)
-    for point in entity.polygon.points[1:]:
-        path.lineTo(*_transform(point, viewport))
-    path.close()
-    pdf.setStrokeColor(stroke)
-    pdf.setFillColor(fill)
+    # One transform over every vertex, then sliced back into entities
+    page_points = _transform_array(np.concatenate(drawable), viewport).tolist()
+    ends = np.cumsum([len(vertices) for vertices in drawable]).tolist()
+
+    segments: list[tuple[float, float, float, float]] = []
+    shared = pdf.beginPath() if fill is None else None
+    shared_used = False
+    for start, end in zip([0, *ends[:-1]], ends):
+        points = page_points[start:end]
+        if len(points) == 2:
+            segments.append((*points[0], *points[1]))
+            continue
+        path = shared if shared is not None else pdf.beginPath()
+        path.moveTo(*points[0])
+        for point in points[1:]:
+            path.lineTo(*point)
+        if shared is None:
+            pdf.drawPath(path, fill=1, stroke=1)
+        shared_used = True
+
+    if segments:
+        pdf.lines(segments)
+    if shared is not None and shared_used:
+        pdf.drawPath(shared, fill=0, stroke=1)
+
+
+def _draw_diff_entities(pdf: "canvas.Canvas", entities: Sequence[DiffEntity], viewport: _Viewport) -> None:
+    # Diffs keep their order (fills overlap); colours are only reset when the change type changes
     pdf.setLineWidth(1.2)
-    pdf.drawPath(path, fill=1, stroke=1)
+    current_type: str | None = None
+    for entity in entities:
+        if not entity.polygon.points:
+            continue
+        if entity.change_type != current_type:
+            stroke, fill = _DIFF_PALETTE.get(entity.change_type, _DEFAULT_DIFF_COLORS)
+            pdf.setStrokeColor(stroke)
+            pdf.setFillColor(fill)
+            current_type = entity.change_type
+        points = _transform_array(np.asarray(entity.polygon.points, dtype=np.float64), viewport).tolist()
+        path = pdf.beginPath()
+        path.moveTo(*points[0])
+        for point in points[1:]:
+            path.lineTo(*point)
+        path.close()
+        pdf.drawPath(path, fill=1, stroke=1)
 
 
 def _draw_legend(pdf: "canvas.Canvas", viewport: _Viewport) -> None:
-    entries = [
-        ("#cbd5f5", "原图"),
-        ("#93c5fd", "改图"),
-        ("#34d399", "新增"),
-        ("#f87171", "删除"),
-        ("#f59e0b", "修改"),
-    ]
-    pdf.setFont("Helvetica", 9)
     x = 36
     y = 48
-    for color_hex, label in entries:
-        pdf.setFillColor(colors.HexColor(color_hex))
-        pdf.rect(x, y, 10, 10, stroke=0, fill=1)
-        pdf.setFillColor(colors.HexColor("#0f172a"))
-        pdf.drawString(x + 14, y, label)
-        x += 80
+    for index, (color, _) in enumerate(_LEGEND_ENTRIES):
+        pdf.setFillColor(color)
+        pdf.rect(x + index * 80, y, 10, 10, stroke=0, fill=1)
+
+    labels = pdf.beginText(x + 14, y)
+    labels.setFont("Helvetica", 9)
+    labels.setFillColor(_TEXT_COLOR)
+    for index, (_, label) in enumerate(_LEGEND_ENTRIES):
+        labels.setTextOrigin(x + 14 + index * 80, y)
+        labels.textOut(label)
+    pdf.drawText(labels)
 
 
 def _write_stub_pdf(job_id: str, entity_count: int, destination: Path) -> None:
@@ -201,56 +242,60 @@ def _write_stub_pdf(job_id: str, entity_count: int, destination: Path) -> None:
     destination.write_bytes(content)
 
 
+def _escape_pdf_text(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _serialize_object(index: int, body: bytes) -> bytes:
+    return b"%d 0 obj\n" % index + body + b"\nendobj\n"
+
+
+# Everything in the placeholder PDF except the content stream is constant, so
+# the header, the catalog/pages/page objects and the font object are
+# serialised once; object 4 (the text stream) is the only per-call part.
+_STUB_HEADER = b"%PDF-1.4\n"
+_STUB_PREFIX_OBJECTS = (
+    b"<< /Type /Catalog /Pages 2 0 R >>",
+    b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+    b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>",
+)
+_STUB_PREFIX_OFFSETS: list[int] = []
+_stub_prefix = bytearray(_STUB_HEADER)
+for _index, _body in enumerate(_STUB_PREFIX_OBJECTS, start=1):
+    _STUB_PREFIX_OFFSETS.append(len(_stub_prefix))
+    _stub_prefix += _serialize_object(_index, _body)
+_STUB_PREFIX = bytes(_stub_prefix)
+_STUB_FONT_OBJECT = _serialize_object(5, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+_STUB_XREF_HEAD = b"xref\n0 6\n0000000000 65535 f \n"
+_STUB_TRAILER = b"trailer\n<< /Size 6 /Root 1 0 R >>\nstartxref\n"
+del _stub_prefix, _index, _body
+
+
 def _build_pdf_content(lines: Iterable[str]) -> bytes:
-    import io
-
-    def _escape(text: str) -> str:
-        return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
-
-    buffer = io.BytesIO()
-    buffer.write(b"%PDF-1.4\n")
-
-    objects: list[bytes] = []
-
-    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
-    objects.append(b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>")
-
-    page_obj = b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>"
-    objects.append(page_obj)
-
-    text_lines = []
-    y = 760
-    for line in lines:
-        safe = _escape(line)
-        text_lines.append(f"BT /F1 14 Tf 72 {y} Td ({safe}) Tj ET")
-        y -= 20
-    stream = "\n".join(text_lines).encode("latin-1")
-    content_obj = b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
-    objects.append(content_obj)
-
-    font_obj = b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
-    objects.append(font_obj)
-
-    offsets = [0]
-    for index, body in enumerate(objects, start=1):
-        offsets.append(buffer.tell())
-        buffer.write(f"{index} 0 obj\n".encode("ascii"))
-        buffer.write(body)
-        buffer.write(b"\nendobj\n")
-
-    xref_start = buffer.tell()
-    buffer.write(f"xref\n0 {len(offsets)}\n".encode("ascii"))
-    buffer.write(b"0000000000 65535 f \n")
-    for offset in offsets[1:]:
-        buffer.write(f"{offset:010d} 00000 n \n".encode("ascii"))
-
-    buffer.write(b"trailer\n")
-    buffer.write(f"<< /Size {len(offsets)} /Root 1 0 R >>\n".encode("ascii"))
-    buffer.write(b"startxref\n")
-    buffer.write(f"{xref_start}\n".encode("ascii"))
-    buffer.write(b"%%EOF")
-
-    return buffer.getvalue()
+    # One BT/ET text object; each line moves 20pt down from the previous one
+    shows = [f"({_escape_pdf_text(line)}) Tj" for line in lines]
+    stream = (
+        ("BT /F1 14 Tf 72 760 Td " + " 0 -20 Td ".join(shows) + " ET").encode("latin-1") if shows else b""
+    )
+    content_object = _serialize_object(4, b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    content_offset = len(_STUB_PREFIX)
+    font_offset = content_offset + len(content_object)
+    xref_start = font_offset + len(_STUB_FONT_OBJECT)
+    offsets = (*_STUB_PREFIX_OFFSETS, content_offset, font_offset)
+    xref_entries = b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+
+    return b"".join(
+        (
+            _STUB_PREFIX,
+            content_object,
+            _STUB_FONT_OBJECT,
+            _STUB_XREF_HEAD,
+            xref_entries,
+            _STUB_TRAILER,
+            b"%d\n%%%%EOF" % xref_start,
+        )
+    )
 
 
 __all__ = ["render_diff_pdf"]
@@ -5,24 +5,34 @@ import os
 import tempfile
 from pathlib import Path
 from typing import Dict, Any
-from celery import current_task
+from celery import Task
+from app.core.settings import get_settings
 from app.modules.dwg_to_pdf.converter import convert_dwg_to_pdf
+from app.services import cached_job_service
+from app.tasks.jobs import mark_job_failed
+from app.worker import celery_app
 import logging
 
 logger = logging.getLogger(__name__)
 
-def process_dwg_conversion_with_params(job_id: str, dwg_path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+@celery_app.task(name="converter.convert_with_params", bind=True)
+def process_dwg_conversion_with_params(self: Task, job_id: str, dwg_path: str, params: Dict[str, Any]) -> Dict[str, Any]:
     """
     Process DWG file conversion with custom parameters
 
+    Runs on a Celery worker so the blocking AutoCAD conversion never holds up
+    the API; progress is mirrored into the job metadata.
+
     :param job_id: ID of the job
     :param dwg_path: Path to DWG file
     :param params: Conversion parameters
     :return: Processing results
     """
+    job_service = cached_job_service(get_settings().storage_dir)
     try:
         # Update task state
-        current_task.update_state(state='PROGRESS', meta={'status': '正在转换 DWG 文件'})
+        self.update_state(state='PROGRESS', meta={'status': '正在转换 DWG 文件'})
+        job_service.update_metadata(job_id, status="processing", progress=0.1)
 
         # Create output path
         dwg_file = Path(dwg_path)
@@ -35,11 +45,12 @@ def process_dwg_conversion_with_params(job_id: str, dwg_path: str, params: Dict[
             'paper_size': params.get('paper_size'),
             'margin': params.get('margin'),
             'grayscale': params.get('grayscale', False),
-            'monochrome': params.get('monochrome', False)
+            'monochrome': params.get('monochrome', False),
+            'layers': params.get('layers')
         }
 
         # Log conversion parameters
-        logger.info(f"Converting {dwg_path} with params: {conversion_params}")
+        logger.info("Converting %s with params: %s", dwg_path, conversion_params)
 
         # Convert DWG to PDF
         success = convert_dwg_to_pdf(dwg_path, str(output_path), **conversion_params)
@@ -48,27 +59,31 @@ def process_dwg_conversion_with_params(job_id: str, dwg_path: str, params: Dict[
             raise Exception("DWG 转 PDF 失败")
 
         # Update task state
-        current_task.update_state(state='PROGRESS', meta={'status': '正在保存结果'})
+        self.update_state(state='PROGRESS', meta={'status': '正在保存结果'})
 
         # Prepare results
+        try:
+            output_size = output_path.stat().st_size
+            output_exists = True
+        except FileNotFoundError:
+            output_size = 0
+            output_exists = False
         result = {
             "job_id": job_id,
             "status": "completed",
             "input_file": dwg_path,
             "output_file": str(output_path),
             "conversion_params": conversion_params,
-            "output_exists": output_path.exists(),
-            "output_size": output_path.stat().st_size if output_path.exists() else 0
+            "output_exists": output_exists,
+            "output_size": output_size
         }
 
-        logger.info(f"Job {job_id} completed successfully. Output: {output_path}")
+        job_service.update_metadata(job_id, status="completed", progress=1.0)
+        logger.info("Job %s completed successfully. Output: %s", job_id, output_path)
         return result
 
     except Exception as e:
-        logger.error(f"Error processing DWG conversion: {str(e)}")
-        return {
-            "job_id": job_id,
-            "status": "failed",
-            "error": str(e),
-            "input_file": dwg_path
-        }
\ No newline at end of file
+        logger.error("Error processing DWG conversion: %s", e)
+        mark_job_failed(job_service, job_id)
+        # Re-raise so Celery records FAILURE for the task, not SUCCESS
+        raise
@@ -3,28 +3,59 @@ Enhanced job tasks with AutoCAD integration
 """
 import os
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
-from celery import current_task
+from typing import Dict, Any, List, Tuple
+from celery import Task
+from app.core.settings import get_settings
 from app.modules.dwg_to_pdf.converter import convert_dwg_to_pdf
+from app.services import cached_job_service
 from app.services.pdf_comparison import compare_floor_plans
 from app.models.jobs import JobStatus
+from app.tasks.jobs import mark_job_failed
+from app.worker import celery_app
 import logging
 
 logger = logging.getLogger(__name__)
 
-def process_dwg_files_with_autocad(job_id: str, origin_path: str, target_path: str) -> Dict[str, Any]:
+# Used only with the opt-in parallel_dwg_conversion setting. Each thread owns one
+# AutoCAD session (converters are per thread), so a worker process holds two
+# sessions for its lifetime; a long-lived pool reuses them instead of leaving
+# sessions behind whenever a short-lived pool shuts down
+_CONVERSION_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="dwg-to-pdf")
+
+
+def _convert_all(jobs: List[Tuple[str, str]], *, parallel: bool = False) -> List[bool]:
+    """
+    Convert (input_path, output_path) pairs in order, or concurrently when ``parallel`` is on
+    
+    :param jobs: DWG input and PDF output paths
+    :param parallel: Run the conversions on the shared conversion threads
+    :return: Conversion result for each job, in input order
+    """
+    if not parallel:
+        return [convert_dwg_to_pdf(input_path, output_path) for input_path, output_path in jobs]
+    futures = [_CONVERSION_POOL.submit(convert_dwg_to_pdf, input_path, output_path) for input_path, output_path in jobs]
+    return [future.result() for future in futures]
+
+@celery_app.task(name="enhanced.process_dwg_files", bind=True)
+def process_dwg_files_with_autocad(self: Task, job_id: str, origin_path: str, target_path: str) -> Dict[str, Any]:
     """
     Process DWG files using AutoCAD for conversion and comparison
+
+    Runs on a Celery worker; progress is mirrored into the job metadata.
     
     :param job_id: ID of the job
     :param origin_path: Path to original DWG file
     :param target_path: Path to target DWG file
     :return: Processing results
     """
+    settings = get_settings()
+    job_service = cached_job_service(settings.storage_dir)
     try:
         # Update task state
-        current_task.update_state(state='PROGRESS', meta={'status': 'Converting original DWG to PDF'})
+        self.update_state(state='PROGRESS', meta={'status': 'Converting original and target DWG to PDF'})
+        job_service.update_metadata(job_id, status="processing", progress=0.1)
         
         # Create temporary directory for processing
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -36,25 +67,22 @@ def process_dwg_files_with_autocad(job_id: str, origin_path: str, target_path: s
             diff_image = temp_path / "diff.png"
             diff_json = temp_path / "diff.json"
             
-            # Convert original DWG to PDF
-            logger.info(f"Converting original DWG: {origin_path}")
-            success1 = convert_dwg_to_pdf(origin_path, str(origin_pdf))
+            # Convert both DWGs to PDF; they are independent converter runs
+            logger.info("Converting original DWG: %s", origin_path)
+            logger.info("Converting target DWG: %s", target_path)
+            success1, success2 = _convert_all(
+                [(origin_path, str(origin_pdf)), (target_path, str(target_pdf))],
+                parallel=settings.parallel_dwg_conversion,
+            )
             
             if not success1:
                 raise Exception("Failed to convert original DWG to PDF")
             
-            # Update task state
-            current_task.update_state(state='PROGRESS', meta={'status': 'Converting target DWG to PDF'})
-            
-            # Convert target DWG to PDF
-            logger.info(f"Converting target DWG: {target_path}")
-            success2 = convert_dwg_to_pdf(target_path, str(target_pdf))
-            
             if not success2:
                 raise Exception("Failed to convert target DWG to PDF")
             
             # Update task state
-            current_task.update_state(state='PROGRESS', meta={'status': 'Comparing PDFs'})
+            self.update_state(state='PROGRESS', meta={'status': 'Comparing PDFs'})
             
             # Compare PDFs
             logger.info("Comparing PDFs")
@@ -66,12 +94,12 @@ def process_dwg_files_with_autocad(job_id: str, origin_path: str, target_path: s
             )
             
             # Update task state
-            current_task.update_state(state='PROGRESS', meta={'status': 'Preparing results'})
+            self.update_state(state='PROGRESS', meta={'status': 'Preparing results'})
             
             # Prepare results
             result = {
                 "job_id": job_id,
-                "status": JobStatus.COMPLETED,
+                "status": JobStatus.COMPLETED.value,
                 "origin_pdf": str(origin_pdf),
                 "target_pdf": str(target_pdf),
                 "diff_image": str(diff_image),
@@ -79,13 +107,12 @@ def process_dwg_files_with_autocad(job_id: str, origin_path: str, target_path: s
                 "comparison": comparison_result
             }
             
-            logger.info(f"Job {job_id} completed successfully")
+            job_service.update_metadata(job_id, status="completed", progress=1.0)
+            logger.info("Job %s completed successfully", job_id)
             return result
             
     except Exception as e:
-        logger.error(f"Error processing DWG files: {str(e)}")
-        return {
-            "job_id": job_id,
-            "status": JobStatus.FAILED,
-            "error": str(e)
-        }
\ No newline at end of file
+        logger.error("Error processing DWG files: %s", e)
+        mark_job_failed(job_service, job_id)
+        # Re-raise so Celery records FAILURE for the task, not SUCCESS
+        raise
\ No newline at end of file
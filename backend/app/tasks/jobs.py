@@ -1,31 +1,38 @@
 from __future__ import annotations
 
 import json
+import logging
+import os
+import shutil
 import subprocess
-from dataclasses import asdict
-from datetime import datetime, timezone
-from hashlib import sha256
 from pathlib import Path
 from typing import Any, Dict, Iterable, Literal, cast
 
+from blake3 import blake3
 from celery import Task, chain
 
+from app.core.clock import utc_now_iso
 from app.core.settings import get_settings
 from app.models import (
     DiffEntity,
     DiffPolygon,
     DiffSummary,
     JobDiffPayload,
-    JobMetadata,
     StoredFile,
 )
-from app.services import JobService, ParsedEntity, match_entities, normalize_entities_by_grid, parse_dxf, render_diff_pdf
+from app.services import JobService, ParsedEntity, cached_job_service, match_entities, normalize_entities_by_grid, parse_pair, render_diff_pdf
+from app.services.jobs import CHECKSUM_ALGORITHM
 from app.worker import celery_app
 
+logger = logging.getLogger(__name__)
+
+# Keep the converter from flashing a console window on Windows workers
+_SUBPROCESS_FLAGS = subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
+
 
 def _service() -> JobService:
     settings = get_settings()
-    return JobService(Path(settings.storage_dir))
+    return cached_job_service(settings.storage_dir)
 
 
 def _storage_root() -> Path:
@@ -33,32 +40,100 @@ def _storage_root() -> Path:
     return Path(settings.storage_dir)
 
 
+# Successful resolutions only, so a converter installed later is picked up without a restart
+_resolved_converters: dict[str, Path] = {}
+
+
+def _resolve_converter(value: str) -> Path | None:
+    """Resolves a configured converter to an executable path (memoised per value once found)."""
+    resolved = _resolved_converters.get(value)
+    if resolved is not None:
+        return resolved
+    candidate = Path(value)
+    if candidate.exists():
+        resolved = candidate.resolve()
+    else:
+        found = shutil.which(value)
+        resolved = Path(found).resolve() if found else None
+    if resolved is not None:
+        _resolved_converters[value] = resolved
+    return resolved
+
+
 def _converter_path() -> Path | None:
     settings = get_settings()
     value = settings.converter_path
     if value:
-        candidate = Path(value)
-        if candidate.exists():
-            return candidate
+        return _resolve_converter(value)
 
     return None
 
 
-def _job_dir(job_id: str) -> Path:
-    return _storage_root() / "jobs" / job_id
+def _stage_input(source: Path, destination: Path) -> None:
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+def _run_converter_batch(
+    executable: Path,
+    inputs: list[tuple[str, Path]],
+    converted_dir: Path,
+) -> subprocess.CompletedProcess[str]:
+    """Converts all inputs with a single converter process.
+
+    The converter works on whole folders, so inputs are staged into one folder
+    (prefixed by kind to avoid name clashes) and the results are moved to
+    ``converted_dir/<kind>/<stem>.dxf`` afterwards.
+    """
+    staging_in = converted_dir / "_batch_in"
+    staging_out = converted_dir / "_batch_out"
+    shutil.rmtree(staging_in, ignore_errors=True)
+    shutil.rmtree(staging_out, ignore_errors=True)
+    staging_in.mkdir(parents=True)
+    staging_out.mkdir(parents=True)
+    try:
+        for kind, input_path in inputs:
+            _stage_input(input_path, staging_in / f"{kind}__{input_path.name}")
+
+        cmd = [str(executable), str(staging_in), str(staging_out), "ACAD2018", "DXF", "0", "1"]
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            check=True,
+            shell=False,
+            creationflags=_SUBPROCESS_FLAGS,
+        )
+
+        for kind, input_path in inputs:
+            produced = staging_out / f"{kind}__{input_path.stem}.dxf"
+            if produced.exists():
+                output_dir = converted_dir / kind
+                output_dir.mkdir(parents=True, exist_ok=True)
+                os.replace(produced, output_dir / f"{input_path.stem}.dxf")
+        return result
+    finally:
+        shutil.rmtree(staging_in, ignore_errors=True)
+        shutil.rmtree(staging_out, ignore_errors=True)
 
 
-def _timestamp() -> str:
-    return datetime.now(timezone.utc).isoformat()
+def _job_dir(job_id: str) -> Path:
+    return _storage_root() / "jobs" / job_id
 
 
 def _build_stored_file(path: Path, content_type: str | None = None, *, kind: str | None = None) -> StoredFile:
-    data = path.read_bytes()
+    size = path.stat().st_size
+    hasher = blake3(max_threads=blake3.AUTO)
+    if size:
+        hasher.update_mmap(path)
     return StoredFile(
         name=path.name,
         path=str(path.resolve()),
-        size=len(data),
-        checksum=sha256(data).hexdigest(),
+        size=size,
+        checksum=hasher.hexdigest(),
+        algorithm=CHECKSUM_ALGORITHM,
         content_type=content_type,
         kind=kind,
     )
@@ -69,24 +144,26 @@ def _log_event(
     step: str,
     status: str,
     *,
-    job: JobMetadata | None = None,
     level: Literal["info", "warning", "error"] = "info",
     updates: Dict[str, Any] | None = None,
     **fields: Any,
-) -> JobMetadata:
-    service = _service()
-    current_job = job or service.load_job(job_id)
+) -> None:
     entry = {
         "step": step,
         "status": status,
         "level": level,
-        "timestamp": _timestamp(),
+        "timestamp": utc_now_iso(),
         **fields,
     }
-    payload: Dict[str, Any] = {"logs": current_job.logs + [entry]}
-    if updates:
-        payload.update(updates)
-    return service.update_metadata(job_id, **payload)
+    _service().append_logs(job_id, [entry], **(updates or {}))
+
+
+def mark_job_failed(job_service: JobService, job_id: str) -> None:
+    """Best-effort ``failed`` status for a job whose task is about to raise."""
+    try:
+        job_service.update_metadata(job_id, status="failed")
+    except Exception as exc:
+        logger.error("Could not mark job %s as failed: %s", job_id, exc)
 
 
 def _handle_task_exception(
@@ -122,19 +199,40 @@ def _handle_task_exception(
 def convert_job_task(self: Task, job_id: str) -> Dict[str, Any]:
     """Converts DWG files to DXF using an external converter."""
     service = _service()
+    _log_event(job_id, "convert", "running", updates={"status": "processing", "progress": 0.1})
     job = service.load_job(job_id)
-    job = _log_event(job_id, "convert", "running", job=job, updates={"status": "processing", "progress": 0.1})
 
     converter_executable = _converter_path()
     using_stub = converter_executable is None
 
     converted_files: list[StoredFile] = []
-    all_entities = {}
+    dxf_paths: dict[str, Path] = {}
     files_to_convert = [("original", job.original_files[0]), ("revised", job.revised_files[0])]
+    converted_dir = _job_dir(job_id) / "converted"
+
+    result_stdout = ""
+    result_stderr = ""
+    if not using_stub:
+        # One converter process for the whole job instead of one per drawing
+        batch_inputs = [(kind, Path(file_to_convert.path)) for kind, file_to_convert in files_to_convert]
+        try:
+            result = _run_converter_batch(converter_executable, batch_inputs, converted_dir)
+            result_stdout = result.stdout
+            result_stderr = result.stderr
+        except (subprocess.CalledProcessError, FileNotFoundError) as exc:
+            error_output = exc.stderr if isinstance(exc, subprocess.CalledProcessError) else str(exc)
+            _handle_task_exception(
+                self,
+                job_id,
+                "convert",
+                exc,
+                progress=0.2,
+                context={"file": ", ".join(str(path) for _, path in batch_inputs), "details": error_output},
+            )
 
     for kind, file_to_convert in files_to_convert:
         input_path = Path(file_to_convert.path)
-        output_dir = _job_dir(job_id) / "converted" / kind
+        output_dir = converted_dir / kind
         output_dir.mkdir(parents=True, exist_ok=True)
 
         output_dxf_path = output_dir / f"{input_path.stem}.dxf"
@@ -142,21 +240,6 @@ def convert_job_task(self: Task, job_id: str) -> Dict[str, Any]:
         try:
             if using_stub:
                 _stub_convert(input_path, output_dxf_path)
-                result_stdout = ""
-                result_stderr = ""
-            else:
-                cmd = [
-                    str(converter_executable),
-                    str(input_path.parent),
-                    str(output_dir),
-                    "ACAD2018",
-                    "DXF",
-                    "0",
-                    "1",
-                ]
-                result = subprocess.run(cmd, capture_output=True, text=True, check=True, shell=False)
-                result_stdout = result.stdout
-                result_stderr = result.stderr
 
             if not output_dxf_path.exists():
                 if using_stub:
@@ -169,9 +252,7 @@ def convert_job_task(self: Task, job_id: str) -> Dict[str, Any]:
 
             stored_dxf = _build_stored_file(output_dxf_path, content_type="application/vnd.dxf", kind=f"converted_{kind}")
             converted_files.append(stored_dxf)
-
-            entities = parse_dxf(output_dxf_path, source=cast(Literal["original", "revised"], kind))
-            all_entities[f"{kind}_entities"] = [asdict(entity) for entity in entities]
+            dxf_paths[kind] = output_dxf_path
 
         except (subprocess.CalledProcessError, FileNotFoundError) as exc:
             error_output = exc.stderr if isinstance(exc, subprocess.CalledProcessError) else str(exc)
@@ -184,13 +265,15 @@ def convert_job_task(self: Task, job_id: str) -> Dict[str, Any]:
                 context={"file": str(input_path), "details": error_output},
             )
 
+    # Both drawings are parsed side by side once their DXF files exist
+    original_entities, revised_entities = parse_pair(dxf_paths["original"], dxf_paths["revised"])
+
     # --- Update metadata and prepare for next step ---
     latest_job = service.load_job(job_id)
-    job = _log_event(
+    _log_event(
         job_id,
         "convert",
         "done",
-        job=latest_job,
         updates={
             "progress": 0.35,
             "converted_files": latest_job.converted_files + converted_files,
@@ -202,8 +285,8 @@ def convert_job_task(self: Task, job_id: str) -> Dict[str, Any]:
 
     return {
         "job_id": job_id,
-        "original_entities": all_entities.get("original_entities", []),
-        "revised_entities": all_entities.get("revised_entities", []),
+        "original_entities": [_serialize_entity(entity) for entity in original_entities],
+        "revised_entities": [_serialize_entity(entity) for entity in revised_entities],
     }
 
 
@@ -213,10 +296,7 @@ def extract_job_task(self: Task, payload: Dict[str, Any]) -> Dict[str, Any]:
     original_entities = payload.get("original_entities", [])
     revised_entities = payload.get("revised_entities", [])
 
-    service = _service()
-    job = service.load_job(job_id)
-
-    job = _log_event(job_id, "extract", "running", job=job, updates={"progress": 0.45, "status": "processing"})
+    _log_event(job_id, "extract", "running", updates={"progress": 0.45, "status": "processing"})
 
     extract_dir = _job_dir(job_id) / "extracted"
     extracted_path = extract_dir / "entities.json"
@@ -244,12 +324,10 @@ def extract_job_task(self: Task, payload: Dict[str, Any]) -> Dict[str, Any]:
             context={"target": str(extracted_path)},
         )
 
-    latest_job = service.load_job(job_id)
-    job = _log_event(
+    _log_event(
         job_id,
         "extract",
         "done",
-        job=latest_job,
         updates={"progress": 0.65, "status": "processing"},
         output=str(extracted_path),
     )
@@ -258,15 +336,27 @@ def extract_job_task(self: Task, payload: Dict[str, Any]) -> Dict[str, Any]:
     return payload
 
 
+def _serialize_entity(entity: ParsedEntity) -> dict[str, Any]:
+    # Task payloads are JSON, so the vertex array travels as nested lists
+    return {
+        "entity_id": entity.entity_id,
+        "entity_type": entity.entity_type,
+        "vertices": entity.vertices.tolist(),
+        "layer": entity.layer,
+        "color": entity.color,
+        "linetype": entity.linetype,
+        "source": entity.source,
+    }
+
+
 def _deserialize_entities(entities: Iterable[dict[str, Any]]) -> list[ParsedEntity]:
     parsed_entities: list[ParsedEntity] = []
     for item in entities:
-        vertices = [tuple(vertex) for vertex in item.get("vertices", [])]
         parsed_entities.append(
             ParsedEntity(
                 entity_id=item.get("entity_id", ""),
                 entity_type=item.get("entity_type", "UNKNOWN"),
-                vertices=vertices,
+                vertices=item.get("vertices", []),
                 layer=item.get("layer"),
                 color=item.get("color"),
                 linetype=item.get("linetype"),
@@ -290,12 +380,10 @@ def match_job_task(self: Task, payload: Dict[str, Any]) -> Dict[str, Any]:
     extracted_path = payload.get("extracted_path")
 
     service = _service()
-    job = service.load_job(job_id)
-    job = _log_event(
+    _log_event(
         job_id,
         "match",
         "running",
-        job=job,
         updates={"progress": 0.8, "status": "processing"},
         source=extracted_path,
     )
@@ -309,9 +397,9 @@ def match_job_task(self: Task, payload: Dict[str, Any]) -> Dict[str, Any]:
     # --- Normalize revised entities to align with original ---
     normalized_revised_entities = revised_entities
     try:
-        job = _log_event(job_id, "normalize", "running", job=service.load_job(job_id), updates={"status": "processing"})
+        _log_event(job_id, "normalize", "running", updates={"status": "processing"})
         normalized_revised_entities = normalize_entities_by_grid(revised_entities, original_entities)
-        _log_event(job_id, "normalize", "done", job=service.load_job(job_id), updates={"status": "processing"})
+        _log_event(job_id, "normalize", "done", updates={"status": "processing"})
     except Exception as exc:  # pragma: no cover - normalization errors depend on CAD stack
         _handle_task_exception(self, job_id, "normalize", exc, progress=0.8)
 
@@ -331,7 +419,7 @@ def match_job_task(self: Task, payload: Dict[str, Any]) -> Dict[str, Any]:
                         entity_type=entity.entity_type,
                         change_type=cast(Literal["added", "removed", "modified"], change_type),
                         label=f"{entity.entity_type}-{entity.entity_id}",
-                        polygon=DiffPolygon(points=[tuple(point) for point in entity.vertices]),
+                        polygon=DiffPolygon(points=entity.vertices.tolist()),
                     )
                 )
 
@@ -391,11 +479,10 @@ def match_job_task(self: Task, payload: Dict[str, Any]) -> Dict[str, Any]:
     if pdf_file is not None:
         updated_reports = updated_reports + [pdf_file]
 
-    job = _log_event(
+    _log_event(
         job_id,
         "match",
         "done",
-        job=latest_job,
         updates={
             "status": "completed",
             "progress": 1.0,
@@ -405,9 +492,9 @@ def match_job_task(self: Task, payload: Dict[str, Any]) -> Dict[str, Any]:
     )
 
     if report_file:
-        payload.update({"status": job.status, "report_path": report_file.path})
+        payload.update({"status": "completed", "report_path": report_file.path})
     else:
-        payload.update({"status": job.status})
+        payload.update({"status": "completed"})
     return payload
 
 
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from app.core.clock import utc_now_iso
+
+
+def test_utc_now_iso_matches_datetime_isoformat():
+    before = datetime.now(timezone.utc)
+    value = utc_now_iso()
+    after = datetime.now(timezone.utc)
+
+    parsed = datetime.fromisoformat(value)
+    assert parsed.tzinfo == timezone.utc
+    assert before - timedelta(microseconds=1) <= parsed <= after
+    assert value.endswith("+00:00")
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.api.routes.converter import analyze_natural_language_request
+from app.core.settings import get_settings
+from app.main import app
+from app.models.jobs import JobCreate, JobStatus
+from app.services import JobService
+from app.tasks import converter_tasks
+
+
+@pytest.mark.parametrize(
+    ("request_text", "expected_margin"),
+    [
+        ("A4 边距 10mm", 10.0),
+        ("margin 1.5 cm please", 15.0),
+        ("边距12", 12.0),
+        ("A3 彩色", None),
+    ],
+)
+def test_analyze_request_detects_margin(request_text, expected_margin):
+    params = analyze_natural_language_request(request_text)
+
+    assert params["margin"] == expected_margin
+
+
+def test_analyze_request_detects_keywords_in_single_pass():
+    params = analyze_natural_language_request("A3 灰度打印，左对齐，不自动适应")
+
+    assert params["paper_size"] == "A3"
+    assert params["grayscale"] is True
+    assert params["monochrome"] is False
+    assert params["center"] is False
+    # "自动适应" overlaps "不自动" and keeps precedence as before
+    assert params["auto_fit"] is True
+
+
+@pytest.mark.parametrize(
+    ("request_text", "expected_size"),
+    [
+        ("A4纸 黑白", "A4"),
+        ("print on Letter paper", "Letter"),
+        ("A3 or A4", "A3"),
+        ("a4paper", None),
+        ("illegal size", None),
+    ],
+)
+def test_analyze_request_detects_paper_size(request_text, expected_size):
+    assert analyze_natural_language_request(request_text)["paper_size"] == expected_size
+
+
+def test_analyze_request_results_are_independent_copies():
+    first = analyze_natural_language_request("只导出'墙体'图层  A4")
+    first["layers"].append("mutated")
+    first["paper_size"] = "A0"
+
+    second = analyze_natural_language_request("只导出'墙体'图层 a4")
+
+    assert second["paper_size"] == "A4"
+    assert "mutated" not in second["layers"]
+
+
+@pytest.mark.asyncio
+async def test_analyze_request_endpoint_returns_params_and_summary():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/api/converter/analyze-request", json={"request": "A3 黑白 边距 15mm"})
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["params"]["paper_size"] == "A3"
+    assert payload["params"]["monochrome"] is True
+    assert payload["params"]["margin"] == 15.0
+    assert "纸张大小: A3" in payload["interpreted_requirements"]
+
+
+@pytest.fixture
+def storage_root(tmp_path, monkeypatch):
+    root = tmp_path / "storage"
+    monkeypatch.setenv("FLOORPLAN_STORAGE_DIR", str(root))
+    monkeypatch.setenv("FLOORPLAN_CELERY_TASK_ALWAYS_EAGER", "true")
+    get_settings.cache_clear()
+    yield root
+    get_settings.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_convert_dwg_queues_task_and_records_outcome(storage_root, monkeypatch):
+    monkeypatch.setattr(converter_tasks, "convert_dwg_to_pdf", lambda *args, **kwargs: False)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/api/converter/convert-dwg",
+            files={"dwg_file": ("plan.dwg", b"dwg-bytes", "application/dwg")},
+            data={"params": '{"paper_size": "A3"}'},
+        )
+        assert response.status_code == 200
+        job_id = response.json()["job_id"]
+
+        status = await client.get(f"/api/converter/job/{job_id}")
+
+    assert response.json()["status"] == "queued"
+    assert status.status_code == 200
+    assert status.json()["status"] == "failed"
+
+
+def test_failed_conversion_marks_task_failure(storage_root, monkeypatch):
+    monkeypatch.setattr(converter_tasks, "convert_dwg_to_pdf", lambda *args, **kwargs: False)
+    service = JobService(storage_root)
+    job = service.create_job_from_data(
+        JobCreate(id="job-fail", origin_filename="plan.dwg", target_filename="output.pdf", status=JobStatus.QUEUED)
+    )
+    dwg_path = service.create_job_dir(job.job_id) / "plan.dwg"
+
+    result = converter_tasks.process_dwg_conversion_with_params.apply(
+        args=(job.job_id, str(dwg_path), {}), throw=False
+    )
+
+    assert result.state == "FAILURE"
+    assert service.load_job(job.job_id).status == "failed"
@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.modules.dwg_to_pdf import converter as converter_module
+from app.modules.dwg_to_pdf.converter import DWGToPDFConverter
+
+
+class _FakeComError(Exception):
+    pass
+
+
+class _FakeLayouts:
+    def __init__(self, names: list[str]):
+        self._layouts = [SimpleNamespace(Name=name) for name in names]
+        self.lookups: list[object] = []
+
+    def Item(self, key):
+        self.lookups.append(key)
+        if isinstance(key, int):
+            return self._layouts[key]
+        for layout in self._layouts:
+            if layout.Name == key:
+                return layout
+        raise _FakeComError(key)
+
+
+class _FakeDocument:
+    LAYOUT_NAMES = ["Model", "Layout1"]
+
+    def __init__(self, path: str):
+        self.path = path
+        self.Layouts = _FakeLayouts(self.LAYOUT_NAMES)
+        self.Layers = [SimpleNamespace(Name=name, LayerOn=True) for name in ("Walls", "Doors", "Dims")]
+        self.ActiveLayout = None
+        self.closed = False
+
+    def Export(self, output_path: str, extension: str, selection: str) -> None:
+        with open(output_path, "wb") as handle:
+            handle.write(b"%PDF-fake")
+
+    def Close(self, SaveChanges: bool = False) -> None:
+        assert SaveChanges is False
+        self.closed = True
+
+
+class _FakeAutoCAD:
+    def __init__(self):
+        self.Visible = True
+        self.quit = False
+        self.opened: list[str] = []
+        self.Documents = SimpleNamespace(Open=self._open)
+
+    def _open(self, path: str) -> _FakeDocument:
+        self.opened.append(path)
+        self.last_document = _FakeDocument(path)
+        return self.last_document
+
+    def GetAcadState(self):
+        return SimpleNamespace(IsQuiescent=True)
+
+    def Quit(self) -> None:
+        self.quit = True
+
+
+@pytest.fixture
+def fake_autocad(tmp_path, monkeypatch):
+    monkeypatch.setattr(converter_module, "DEFAULT_CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(converter_module, "AUTOCAD_AVAILABLE", True)
+    monkeypatch.setattr(converter_module, "_thread_state", threading.local())
+    converter_module._autocad_registered.cache_clear()
+    monkeypatch.setattr(converter_module, "_com_state", threading.local())
+    exit_handlers: list = []
+    monkeypatch.setattr(converter_module.atexit, "register", exit_handlers.append)
+    instances: list[_FakeAutoCAD] = []
+    private_instances: list[_FakeAutoCAD] = []
+
+    def _dispatch(prog_id):
+        if isinstance(prog_id, _FakeAutoCAD):  # Early-binding wrap of a DispatchEx result
+            return prog_id
+        assert prog_id == "AutoCAD.Application"
+        if instances:  # Dispatch attaches to the already running AutoCAD
+            return instances[0]
+        instance = _FakeAutoCAD()
+        instances.append(instance)
+        return instance
+
+    def _dispatch_ex(prog_id: str) -> _FakeAutoCAD:
+        assert prog_id == "AutoCAD.Application"
+        instance = _FakeAutoCAD()
+        private_instances.append(instance)
+        return instance
+
+    com_calls: list[str] = []
+    monkeypatch.setattr(converter_module, "gencache", SimpleNamespace(EnsureDispatch=_dispatch), raising=False)
+    monkeypatch.setattr(
+        converter_module,
+        "win32com",
+        SimpleNamespace(client=SimpleNamespace(DispatchEx=_dispatch_ex)),
+        raising=False,
+    )
+    monkeypatch.setattr(
+        converter_module,
+        "pythoncom",
+        SimpleNamespace(
+            CoInitialize=lambda: com_calls.append("init"),
+            CoUninitialize=lambda: com_calls.append("uninit"),
+            com_error=_FakeComError,
+            MakeIID=lambda prog_id: prog_id,
+        ),
+        raising=False,
+    )
+    yield SimpleNamespace(
+        instances=instances,
+        private_instances=private_instances,
+        com_calls=com_calls,
+        exit_handlers=exit_handlers,
+    )
+    converter_module._autocad_registered.cache_clear()
+
+
+def test_falls_back_to_late_binding_when_gencache_fails(monkeypatch):
+    late_bound = _FakeAutoCAD()
+
+    def _fail(prog_id: str):
+        raise OSError("typelib not registered")
+
+    monkeypatch.setattr(converter_module, "gencache", SimpleNamespace(EnsureDispatch=_fail), raising=False)
+    monkeypatch.setattr(
+        converter_module,
+        "win32com",
+        SimpleNamespace(client=SimpleNamespace(Dispatch=lambda prog_id: late_bound)),
+        raising=False,
+    )
+
+    assert converter_module._dispatch_autocad() is late_bound
+
+
+def _make_inputs(tmp_path, count: int) -> list[tuple[str, str]]:
+    jobs = []
+    for index in range(count):
+        source = tmp_path / f"plan_{index}.dwg"
+        source.write_bytes(f"dwg-{index}".encode())
+        jobs.append((str(source), str(tmp_path / "out" / f"plan_{index}.pdf")))
+    return jobs
+
+
+def test_convert_batch_reuses_single_autocad_instance(tmp_path, fake_autocad):
+    jobs = _make_inputs(tmp_path, 3)
+
+    results = DWGToPDFConverter().convert_batch(jobs)
+
+    assert results == [True, True, True]
+    assert len(fake_autocad.instances) == 1
+    assert len(fake_autocad.instances[0].opened) == 3
+    assert fake_autocad.instances[0].Visible is False
+
+
+def test_context_manager_keeps_instance_open_between_conversions(tmp_path, fake_autocad):
+    jobs = _make_inputs(tmp_path, 2)
+
+    with DWGToPDFConverter() as converter:
+        for input_path, output_path in jobs:
+            assert converter.convert(input_path, output_path)
+
+    assert len(fake_autocad.instances) == 1
+    assert fake_autocad.com_calls == ["init"]
+
+
+def test_com_is_initialized_once_per_thread(tmp_path, fake_autocad):
+    jobs = _make_inputs(tmp_path, 3)
+
+    for input_path, output_path in jobs:
+        assert DWGToPDFConverter().convert(input_path, output_path)
+
+    assert fake_autocad.com_calls == ["init"]
+
+
+def test_open_rejects_use_from_another_thread(fake_autocad):
+    converter = DWGToPDFConverter()
+    converter.open()
+    errors = []
+
+    worker = threading.Thread(target=lambda: errors.append(pytest.raises(RuntimeError, converter.open)))
+    worker.start()
+    worker.join()
+
+    assert len(errors) == 1
+
+
+def test_convert_many_single_worker_runs_in_process(tmp_path, fake_autocad):
+    jobs = _make_inputs(tmp_path, 3)
+
+    results = converter_module.convert_many(jobs, workers=1)
+
+    assert results == [True, True, True]
+    assert len(fake_autocad.instances) == 1
+
+
+def test_pool_worker_drives_a_private_autocad_and_quits_it_on_exit(tmp_path, fake_autocad):
+    jobs = _make_inputs(tmp_path, 2)
+
+    converter_module._init_worker()
+    results = [converter_module._convert_in_worker(job, {}) for job in jobs]
+
+    assert results == [True, True]
+    assert fake_autocad.instances == []
+    (instance,) = fake_autocad.private_instances
+    assert len(instance.opened) == 2
+    assert not instance.quit
+    for handler in reversed(fake_autocad.exit_handlers):
+        handler()
+    assert instance.quit
+    assert fake_autocad.com_calls == ["init", "uninit"]
+
+
+def test_convert_many_caps_worker_count(monkeypatch):
+    monkeypatch.setattr(converter_module.os, "cpu_count", lambda: 64)
+
+    assert converter_module._default_workers() == converter_module.MAX_AUTOCAD_WORKERS
+
+
+def test_identical_conversion_is_served_from_cache(tmp_path, fake_autocad):
+    (input_path, first_output), = _make_inputs(tmp_path, 1)
+    second_output = str(tmp_path / "again" / "plan.pdf")
+    converter = DWGToPDFConverter()
+
+    assert converter.convert(input_path, first_output)
+    assert converter.convert(input_path, second_output)
+
+    opened = [path for instance in fake_autocad.instances for path in instance.opened]
+    assert opened == [input_path]
+    assert Path(second_output).read_bytes() == b"%PDF-fake"
+
+
+def test_cache_hit_output_is_a_separate_copy(tmp_path, fake_autocad):
+    (input_path, first_output), = _make_inputs(tmp_path, 1)
+    second_output = tmp_path / "again" / "plan.pdf"
+    converter = DWGToPDFConverter()
+
+    assert converter.convert(input_path, first_output)
+    assert converter.convert(input_path, str(second_output))
+
+    cached, = converter.cache_dir.glob("*.pdf")
+    assert not cached.samefile(first_output)
+    assert not cached.samefile(second_output)
+
+
+def test_cache_miss_keeps_existing_output(tmp_path):
+    output = tmp_path / "plan.pdf"
+    output.write_bytes(b"%PDF-previous")
+
+    assert not DWGToPDFConverter._restore_from_cache(tmp_path / "missing.pdf", output)
+    assert output.read_bytes() == b"%PDF-previous"
+
+
+def test_cache_key_depends_on_options(tmp_path, fake_autocad):
+    (input_path, output_path), = _make_inputs(tmp_path, 1)
+    converter = DWGToPDFConverter()
+
+    assert converter.convert(input_path, output_path)
+    assert converter.convert(input_path, output_path, monochrome=True)
+
+    opened = [path for instance in fake_autocad.instances for path in instance.opened]
+    assert len(opened) == 2
+
+
+def test_cache_eviction_keeps_size_bound(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    for index in range(3):
+        entry = cache_dir / f"{index}.pdf"
+        entry.write_bytes(b"x" * 10)
+        os.utime(entry, (index, index))
+
+    converter_module._evict_cache(cache_dir, max_bytes=20)
+
+    assert sorted(p.name for p in cache_dir.iterdir()) == ["1.pdf", "2.pdf"]
+
+
+def test_layer_selection_switches_off_other_layers(tmp_path, fake_autocad):
+    (input_path, output_path), = _make_inputs(tmp_path, 1)
+
+    assert DWGToPDFConverter().convert(input_path, output_path, layers=["walls", "Doors"])
+
+    layers = fake_autocad.instances[0].last_document.Layers
+    assert {layer.Name: layer.LayerOn for layer in layers} == {"Walls": True, "Doors": True, "Dims": False}
+
+
+def test_unknown_layer_selection_keeps_all_layers(tmp_path, fake_autocad):
+    (input_path, output_path), = _make_inputs(tmp_path, 1)
+
+    assert DWGToPDFConverter().convert(input_path, output_path, layers=["Furniture"])
+
+    layers = fake_autocad.instances[0].last_document.Layers
+    assert all(layer.LayerOn for layer in layers)
+
+
+def test_model_layout_is_looked_up_by_name(tmp_path, fake_autocad):
+    (input_path, output_path), = _make_inputs(tmp_path, 1)
+
+    assert DWGToPDFConverter().convert(input_path, output_path)
+
+    document = fake_autocad.instances[0].last_document
+    assert document.Layouts.lookups == ["Model"]
+    assert document.ActiveLayout.Name == "Model"
+
+
+def test_first_layout_is_used_when_model_is_missing(tmp_path, fake_autocad, monkeypatch):
+    (input_path, output_path), = _make_inputs(tmp_path, 1)
+    monkeypatch.setattr(_FakeDocument, "LAYOUT_NAMES", ["Sheet1", "Sheet2"])
+
+    assert DWGToPDFConverter().convert(input_path, output_path)
+
+    document = fake_autocad.instances[0].last_document
+    assert document.Layouts.lookups == ["Model", 0]
+    assert document.ActiveLayout.Name == "Sheet1"
+
+
+def test_document_is_closed_when_export_fails(tmp_path, fake_autocad, monkeypatch):
+    (input_path, output_path), = _make_inputs(tmp_path, 1)
+
+    def _fail_export(self, output_path: str, extension: str, selection: str) -> None:
+        raise _FakeComError("plot failed")
+
+    monkeypatch.setattr(_FakeDocument, "Export", _fail_export)
+
+    assert DWGToPDFConverter().convert(input_path, output_path) is False
+    assert fake_autocad.instances[0].last_document.closed
+
+
+def test_cache_key_tracks_file_content(tmp_path):
+    drawing = tmp_path / "plan.dwg"
+    empty = tmp_path / "empty.dwg"
+    empty.write_bytes(b"")
+    drawing.write_bytes(b"first")
+    first = converter_module._cache_key(drawing, {}, drawing.stat().st_size)
+    drawing.write_bytes(b"other")
+
+    assert converter_module._cache_key(drawing, {}, drawing.stat().st_size) != first
+    assert converter_module._cache_key(empty, {}, 0) == converter_module._cache_key(empty, {}, 0)
+
+
+def test_get_converter_caches_missing_backend(monkeypatch):
+    monkeypatch.setattr(converter_module, "AUTOCAD_AVAILABLE", False)
+    converter_module._autocad_registered.cache_clear()
+    try:
+        assert converter_module.get_converter() is None
+        assert converter_module.convert_dwg_to_pdf("missing.dwg", "out.pdf") is False
+        assert converter_module._autocad_registered.cache_info().misses == 1
+    finally:
+        converter_module._autocad_registered.cache_clear()
+
+
+def test_get_converter_returns_thread_converter(fake_autocad):
+    converter = converter_module.get_converter()
+
+    assert isinstance(converter, DWGToPDFConverter)
+    assert converter_module.get_converter() is converter
@@ -14,3 +14,13 @@ async def test_health_check_ok():
     payload = response.json()
     assert payload["code"] == 0
     assert payload["data"]["status"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_health_check_returns_json_content_type():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/api/health")
+
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"code": 0, "data": {"status": "ok"}, "message": ""}
@@ -1,13 +1,26 @@
 from __future__ import annotations
 
+import io
+import shutil
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
 from pathlib import Path
 
+import orjson
+import ormsgpack
 import pytest
+from blake3 import blake3
 from httpx import ASGITransport, AsyncClient
 
+from app.api.routes.jobs import get_job_service
 from app.core.settings import get_settings
 from app.main import app
+from app.models import JobMetadata, StoredFile
 from app.services import JobService
+from app.services import jobs as jobs_service_module
+from app.services.jobs import JOB_ID_BATCH, new_job_id
 
 
 @pytest.fixture
@@ -60,6 +73,9 @@ async def test_create_job_persists_files_and_metadata(storage_root):
     stored_path = Path(metadata.original_files[0].path)
     assert stored_path.exists()
     assert stored_path.read_bytes() == b"original-bytes"
+    assert metadata.original_files[0].checksum == blake3(b"original-bytes").hexdigest()
+    assert metadata.original_files[0].algorithm == "blake3"
+    assert metadata.original_files[0].size == len(b"original-bytes")
 
 
 @pytest.mark.asyncio
@@ -165,4 +181,307 @@ async def test_download_pdf_artefact_returns_file(storage_root):
 
     assert artefact_resp.status_code == 200
     assert artefact_resp.headers["content-type"].startswith("application/pdf")
+    assert "cache-control" not in artefact_resp.headers
     assert artefact_resp.content
+
+
+def test_get_job_service_reuses_instance_per_storage_dir(storage_root, tmp_path, monkeypatch):
+    first = get_job_service()
+    assert get_job_service() is first
+
+    monkeypatch.setenv("FLOORPLAN_STORAGE_DIR", str(tmp_path / "other"))
+    get_settings.cache_clear()
+    assert get_job_service() is not first
+
+
+def test_new_job_id_returns_unique_uuid4_hex():
+    ids = [new_job_id() for _ in range(JOB_ID_BATCH * 3 + 1)]
+
+    assert len(set(ids)) == len(ids)
+    for job_id in ids:
+        parsed = uuid.UUID(hex=job_id)
+        assert parsed.version == 4
+        assert parsed.hex == job_id
+
+
+def test_metadata_round_trips_non_ascii_logs(storage_root):
+    service = JobService(storage_root)
+    now = datetime.now(timezone.utc)
+    metadata = JobMetadata(
+        job_id="job-unicode",
+        status="queued",
+        created_at=now,
+        updated_at=now,
+        original_files=[StoredFile(name="原图.dwg", path="/tmp/原图.dwg", size=1, checksum="abc")],
+        logs=[{"step": "convert", "status": "done", "message": "转换完成"}],
+    )
+    service.save_metadata(metadata)
+
+    loaded = service.load_job("job-unicode")
+
+    assert loaded == metadata
+
+
+def test_legacy_metadata_is_migrated_in_bulk(storage_root):
+    meta_dir = storage_root / "meta"
+    meta_dir.mkdir(parents=True)
+    now = datetime.now(timezone.utc)
+    for index in range(3):
+        legacy = JobMetadata(job_id=f"legacy-{index}", status="completed", created_at=now, updated_at=now)
+        (meta_dir / f"legacy-{index}.json").write_text(legacy.model_dump_json(), encoding="utf-8")
+    (meta_dir / "broken.json").write_text("{not json", encoding="utf-8")
+
+    service = JobService(storage_root)
+
+    total, jobs = service.list_jobs(limit=10)
+    assert total == 3
+    assert {job.job_id for job in jobs} == {"legacy-0", "legacy-1", "legacy-2"}
+
+    # Re-running the migration leaves already imported jobs untouched
+    service.update_metadata("legacy-0", status="failed")
+    JobService(storage_root)
+    assert service.load_job("legacy-0").status == "failed"
+
+
+def test_job_database_uses_wal_journal(storage_root):
+    service = JobService(storage_root)
+
+    with service._connect() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+
+def test_job_service_reuses_connection_per_thread(storage_root):
+    service = JobService(storage_root)
+    other_thread: list[object] = []
+
+    worker = threading.Thread(target=lambda: other_thread.append(service._connect()))
+    worker.start()
+    worker.join()
+
+    assert service._connect() is service._connect()
+    assert other_thread[0] is not service._connect()
+
+
+def test_copy_and_hash_handles_multiple_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs_service_module, "CHUNK_SIZE", 7)
+    data = bytes(range(256)) * 3
+    destination = tmp_path / "copy.bin"
+
+    size, checksum = jobs_service_module._copy_and_hash(io.BytesIO(data), destination)
+
+    assert size == len(data)
+    assert checksum == blake3(data).hexdigest()
+    assert destination.read_bytes() == data
+
+
+def test_stored_file_without_algorithm_defaults_to_sha256():
+    legacy = StoredFile.model_validate({"name": "a.dwg", "path": "/tmp/a.dwg", "size": 1, "checksum": "abc"})
+
+    assert legacy.algorithm == "sha256"
+
+
+def test_single_table_database_is_split_on_startup(storage_root):
+    meta_dir = storage_root / "meta"
+    meta_dir.mkdir(parents=True)
+    created = datetime(2024, 5, 1, 8, 30, 15, 123456, tzinfo=timezone.utc)
+    now = created.isoformat()
+    files = '[{"name": "a.dwg", "path": "/tmp/a.dwg", "size": 1, "checksum": "abc"}]'
+    with sqlite3.connect(meta_dir / "jobs.db") as conn:
+        conn.execute(
+            """
+            CREATE TABLE jobs (
+                job_id TEXT PRIMARY KEY, status TEXT NOT NULL, progress REAL NOT NULL,
+                created_at TEXT NOT NULL, updated_at TEXT NOT NULL, original_files TEXT NOT NULL,
+                revised_files TEXT NOT NULL, converted_files TEXT NOT NULL, reports TEXT NOT NULL,
+                logs TEXT NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            ("old-job", "completed", 1.0, now, now, files, "[]", "[]", "[]", '[{"step": "done"}]'),
+        )
+
+    service = JobService(storage_root)
+
+    job = service.load_job("old-job")
+    assert job.status == "completed"
+    assert job.original_files[0].name == "a.dwg"
+    assert job.logs == [{"step": "done"}]
+    assert job.created_at == created
+    status = service.get_job_status("old-job")
+    assert status.logs == [{"step": "done"}]
+    with service._connect() as conn:
+        assert conn.execute("SELECT typeof(updated_at) FROM jobs").fetchone()[0] == "integer"
+        data = conn.execute("SELECT data FROM job_json WHERE slot = 'original_files'").fetchone()[0]
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    assert ormsgpack.unpackb(data) == orjson.loads(files)
+    assert "jobs_legacy" not in tables
+    assert "idx_jobs_updated_at" not in tables
+
+
+def test_append_log_inserts_single_row(storage_root):
+    service = JobService(storage_root)
+    now = datetime.now(timezone.utc)
+    service.save_metadata(
+        JobMetadata(job_id="job-logs", status="processing", created_at=now, updated_at=now, logs=[{"step": "a"}])
+    )
+
+    service.append_log("job-logs", {"step": "convert", "status": "failed", "error": "converter crashed"})
+    service.append_log("job-logs", {"step": "match", "level": "info", "message": "ok"})
+    service.update_metadata("job-logs", progress=0.5)
+
+    assert [entry["step"] for entry in service.load_job("job-logs").logs] == ["a", "convert", "match"]
+    assert service.get_job_status("job-logs").last_error == "converter crashed"
+    with service._connect() as conn:
+        seqs = [row["seq"] for row in conn.execute("SELECT seq FROM job_logs WHERE job_id = 'job-logs' ORDER BY seq")]
+    assert seqs == [0, 1, 2]
+
+
+def test_append_log_rejects_unknown_job(storage_root):
+    service = JobService(storage_root)
+
+    with pytest.raises(FileNotFoundError):
+        service.append_log("missing", {"step": "convert", "status": "running"})
+    with service._connect() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM job_logs WHERE job_id = 'missing'").fetchone()[0] == 0
+
+
+def test_load_job_is_cached_until_updated_at_changes(storage_root, monkeypatch):
+    service = JobService(storage_root)
+    other_process = JobService(storage_root)
+    now = datetime.now(timezone.utc)
+    service.save_metadata(JobMetadata(job_id="job-cache", status="queued", created_at=now, updated_at=now))
+
+    first = service.load_job("job-cache")
+    with monkeypatch.context() as patched:
+        patched.setattr(JobService, "_load_slots", staticmethod(lambda *_: pytest.fail("slots reloaded")))
+        assert service.load_job("job-cache") == first
+
+    other_process.append_log("job-cache", {"step": "convert", "status": "running"})
+    refreshed = service.load_job("job-cache")
+    assert refreshed is not first
+    assert [entry["step"] for entry in refreshed.logs] == ["convert"]
+
+    other_process.update_metadata("job-cache", status="processing")
+    assert service.load_job("job-cache").status == "processing"
+
+
+def test_cached_metadata_is_not_shared_with_callers(storage_root):
+    service = JobService(storage_root)
+    now = datetime.now(timezone.utc)
+    saved = service.save_metadata(JobMetadata(job_id="job-copy", status="queued", created_at=now, updated_at=now))
+    saved.reports.append(StoredFile(name="stale.json", path="/tmp/stale.json", size=1, checksum="x"))
+
+    loaded = service.load_job("job-copy")
+    loaded.logs.append({"step": "mutated"})
+
+    reloaded = service.load_job("job-copy")
+    assert reloaded.reports == []
+    assert reloaded.logs == []
+
+
+def test_list_jobs_summary_reads_scalars_from_covering_index(storage_root):
+    service = JobService(storage_root)
+    now = datetime.now(timezone.utc)
+    service.save_metadata(
+        JobMetadata(job_id="job-summary", status="processing", progress=0.5, created_at=now, updated_at=now)
+    )
+
+    total, summaries = service.list_jobs_summary(limit=5)
+
+    assert total == 1
+    assert summaries[0].job_id == "job-summary"
+    assert summaries[0].progress == 0.5
+    assert summaries[0].updated_at == now
+    with service._connect() as conn:
+        plan = " ".join(
+            row[-1]
+            for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT job_id, status, progress, created_at, updated_at "
+                "FROM jobs ORDER BY updated_at DESC LIMIT 5"
+            )
+        )
+    assert "COVERING INDEX idx_jobs_updated_cover" in plan
+
+
+def test_last_error_skips_error_entries_without_text(storage_root):
+    service = JobService(storage_root)
+    now = datetime.now(timezone.utc)
+    service.save_metadata(JobMetadata(job_id="job-errors", status="failed", created_at=now, updated_at=now))
+
+    assert service.get_job_status("job-errors").last_error is None
+
+    service.append_log("job-errors", {"step": "convert", "level": "error", "details": "disk full"})
+    service.append_log("job-errors", {"step": "match", "level": "error", "message": ""})
+
+    assert service.get_job_status("job-errors").last_error == "disk full"
+
+
+def test_generated_stored_file_dumper_matches_model_dump():
+    stored = StoredFile(name="a.dwg", path="/tmp/a.dwg", size=3, checksum="abc", content_type=None, kind="original")
+
+    assert jobs_service_module._dump_stored_file(stored) == stored.model_dump()
+
+
+def test_stored_files_without_all_fields_are_validated():
+    item = {"name": "a.dwg", "path": "/tmp/a.dwg", "size": "3", "checksum": "abc"}
+    legacy = jobs_service_module._load_stored_file(item)
+    current = StoredFile(name="b.dwg", path="/tmp/b.dwg", size=3, checksum="def")
+
+    assert legacy.size == 3
+    assert legacy.algorithm == "sha256"
+    assert jobs_service_module._load_stored_file(jobs_service_module._dump_stored_file(current)) == current
+
+
+def test_append_logs_updates_fields_in_one_write(storage_root):
+    service = JobService(storage_root)
+    now = datetime.now(timezone.utc)
+    original = StoredFile(name="a.dwg", path="/tmp/a.dwg", size=1, checksum="x")
+    service.save_metadata(
+        JobMetadata(
+            job_id="job-batch",
+            status="queued",
+            created_at=now,
+            updated_at=now,
+            original_files=[original],
+            logs=[{"step": "upload", "status": "done"}],
+        )
+    )
+    report = StoredFile(name="diff.json", path="/tmp/diff.json", size=2, checksum="y", kind="diff")
+
+    service.append_logs(
+        "job-batch",
+        [{"step": "convert", "status": "running"}, {"step": "convert", "status": "done"}],
+        status="processing",
+        progress=0.35,
+        reports=[report],
+    )
+    service.append_logs("job-batch", [{"step": "match", "status": "running"}], progress=0.8)
+
+    stored = service.load_job("job-batch")
+    assert (stored.status, stored.progress) == ("processing", 0.8)
+    assert stored.updated_at > now
+    assert [entry["status"] for entry in stored.logs] == ["done", "running", "done", "running"]
+    assert stored.original_files == [original]
+    assert stored.reports == [report]
+
+
+def test_append_logs_rejects_unknown_jobs_and_fields(storage_root):
+    service = JobService(storage_root)
+    now = datetime.now(timezone.utc)
+    service.save_metadata(JobMetadata(job_id="job-fields", status="queued", created_at=now, updated_at=now))
+
+    with pytest.raises(FileNotFoundError):
+        service.append_logs("missing", [{"step": "convert"}], status="processing")
+    with pytest.raises(ValueError):
+        service.append_logs("job-fields", [], logs=[])
+    assert service.load_job("job-fields").logs == []
+
+
+def test_create_job_dir_recreates_a_removed_jobs_root(storage_root):
+    service = JobService(storage_root)
+    shutil.rmtree(storage_root / "jobs")
+
+    assert service.create_job_dir("job-dir").is_dir()
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+from app.services import parsing
+from app.services.parsing import ParsedEntity, iter_dxf, match_entities, parse_dxf, parse_pair
+
+
+def _entity(entity_id: str, vertices: list[tuple[float, float]]) -> ParsedEntity:
+    return ParsedEntity(entity_id=entity_id, entity_type="LINE", vertices=vertices)
+
+
+def test_match_entities_by_id_reports_added_removed_and_modified(monkeypatch):
+    monkeypatch.setattr(parsing, "CAD_STACK_AVAILABLE", False)
+    original = [_entity("a", [(0, 0), (1, 1)]), _entity("b", [(0, 0), (2, 2)]), _entity("c", [(1, 1), (2, 2)])]
+    revised = [_entity("d", [(0, 0), (1, 1)]), _entity("c", [(1, 1), (2, 3)]), _entity("a", [(0, 0), (1, 1)])]
+
+    matches = match_entities(original, revised)
+
+    assert [entity.entity_id for entity in matches["added"]] == ["d"]
+    assert [entity.entity_id for entity in matches["removed"]] == ["b"]
+    assert [entity.entity_id for entity in matches["modified"]] == ["c"]
+    assert match_entities([], []) == {"added": [], "removed": [], "modified": []}
+
+
+def test_parsed_entity_stores_vertices_as_contiguous_array():
+    entity = _entity("a", [(0, 0), (1.5, 2.5)])
+
+    assert entity.vertices.shape == (2, 2)
+    assert entity.vertices.dtype == np.float64
+    assert entity.vertices.flags["C_CONTIGUOUS"]
+    assert _entity("empty", []).vertices.shape == (0, 2)
+
+
+def test_iter_dxf_streams_the_same_entities_as_parse_dxf(monkeypatch):
+    monkeypatch.setattr(parsing, "CAD_STACK_AVAILABLE", False)
+    path = Path("plan-01.dxf")
+
+    streamed = iter_dxf(path, source="original")
+
+    assert not isinstance(streamed, list)
+    parsed = parse_dxf(path, source="original")
+    assert [(e.entity_id, e.vertices.tolist(), e.source) for e in streamed] == [
+        (e.entity_id, e.vertices.tolist(), e.source) for e in parsed
+    ]
+
+
+def test_parse_pair_returns_original_and_revised_entities(monkeypatch):
+    monkeypatch.setattr(parsing, "CAD_STACK_AVAILABLE", False)
+
+    original, revised = parse_pair(Path("plan-01.dxf"), Path("plan-02.dxf"))
+
+    assert {entity.source for entity in original} == {"original"}
+    assert {entity.source for entity in revised} == {"revised"}
+    assert [entity.entity_id for entity in revised] == [entity.entity_id for entity in parse_dxf(Path("plan-02.dxf"))]
+
+
+def test_match_entities_accepts_generators(monkeypatch):
+    monkeypatch.setattr(parsing, "CAD_STACK_AVAILABLE", False)
+    original = [_entity("a", [(0, 0), (1, 1)]), _entity("b", [(0, 0), (2, 2)])]
+    revised = [_entity("a", [(0, 0), (1, 1)]), _entity("c", [(1, 1), (2, 2)])]
+
+    matches = match_entities((entity for entity in original), (entity for entity in revised))
+
+    assert [entity.entity_id for entity in matches["added"]] == ["c"]
+    assert [entity.entity_id for entity in matches["removed"]] == ["b"]
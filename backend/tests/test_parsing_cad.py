@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+ezdxf = pytest.importorskip("ezdxf")
+pytest.importorskip("shapely")
+pytest.importorskip("rtree")
+
+from app.services import parsing  # noqa: E402
+from app.services.parsing import ParsedEntity, match_entities, parse_dxf  # noqa: E402
+
+_SQUARE = [(0, 0), (4, 0), (4, 4), (0, 4), (0, 0)]
+
+
+def _entity(entity_id: str, vertices: list[tuple[float, float]]) -> ParsedEntity:
+    return ParsedEntity(entity_id=entity_id, entity_type="LWPOLYLINE", vertices=vertices)
+
+
+def _ids(entities: list[ParsedEntity]) -> list[str]:
+    return [entity.entity_id for entity in entities]
+
+
+def test_match_entities_pairs_equal_geometries_one_to_one():
+    original = [
+        _entity("wall", [(0, 0), (10, 0)]),
+        _entity("room", _SQUARE),
+        _entity("door", [(20, 0), (20, 5)]),
+        _entity("empty", []),
+    ]
+    revised = [
+        # Same geometry under new handles still matches; the copy has nothing left to pair with
+        _entity("wall-2", [(0, 0), (10, 0)]),
+        _entity("wall-copy", [(0, 0), (10, 0)]),
+        # Reversed direction and a shifted ring start are the same geometry
+        _entity("room-2", [(0, 0), (0, 4), (4, 4), (4, 0), (0, 0)]),
+        _entity("window", [(30, 0), (30, 5)]),
+    ]
+
+    matches = match_entities(original, revised)
+
+    assert _ids(matches["added"]) == ["wall-copy", "window"]
+    assert _ids(matches["removed"]) == ["door"]
+    assert matches["modified"] == []
+
+
+def test_match_entities_thread_pool_agrees_with_serial_matching(monkeypatch):
+    rng = np.random.default_rng(3)
+    starts = rng.integers(0, 40, size=(300, 2)).astype(np.float64)
+    original = [_entity(f"o{i}", [tuple(start), tuple(start + (1, 0))]) for i, start in enumerate(starts)]
+    # Every third original moves, and duplicates compete for the same original
+    revised = [
+        _entity(f"r{i}", [tuple(start + (i % 3 == 0, 0)), tuple(start + (1 + (i % 3 == 0), 0))])
+        for i, start in enumerate(np.concatenate([starts, starts[:50]]))
+    ]
+
+    serial = match_entities(original, revised)
+    monkeypatch.setattr(parsing, "_PARALLEL_MATCH_THRESHOLD", 0)
+    monkeypatch.setattr(parsing, "_MATCH_QUERY_BLOCK", 16)
+    pooled = match_entities(original, revised)
+
+    assert serial["added"] and serial["removed"]
+    assert _ids(pooled["added"]) == _ids(serial["added"])
+    assert _ids(pooled["removed"]) == _ids(serial["removed"])
+
+
+def test_parse_dxf_extracts_vertices_per_entity_type(tmp_path):
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    msp.add_line((0, 0), (10, 0))
+    # Widths occupy the packed LWPOLYLINE columns that must not leak into the vertices
+    msp.add_lwpolyline([(0, 0, 0.5, 0.5, 0), (5, 0, 0.5, 0.5, 0), (5, 5, 0.5, 0.5, 0)], format="xyseb")
+    msp.add_polyline2d([(1, 1), (2, 1), (2, 2)])
+    msp.add_circle((3, 4), radius=2)
+    msp.add_arc((0, 0), radius=1, start_angle=0, end_angle=90)
+    path = tmp_path / "plan.dxf"
+    doc.saveas(path)
+
+    entities = {entity.entity_type: entity for entity in parse_dxf(path, source="original")}
+
+    assert set(entities) == {"LINE", "LWPOLYLINE", "POLYLINE", "CIRCLE", "ARC"}
+    assert {entity.source for entity in entities.values()} == {"original"}
+    assert entities["LINE"].vertices.tolist() == [[0, 0], [10, 0]]
+    assert entities["LWPOLYLINE"].vertices.tolist() == [[0, 0], [5, 0], [5, 5]]
+    assert entities["POLYLINE"].vertices.tolist() == [[1, 1], [2, 1], [2, 2]]
+    circle = entities["CIRCLE"].vertices
+    assert circle.shape == (64, 2)
+    np.testing.assert_allclose(np.hypot(circle[:, 0] - 3, circle[:, 1] - 4), 2)
+    arc = entities["ARC"].vertices
+    np.testing.assert_allclose(arc[[0, -1]], [[1, 0], [0, 1]], atol=1e-12)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pymupdf
+import pytest
+
+from app.services.pdf_comparison import PDFComparator
+
+
+def _write_plan(path: Path, *, with_extra_room: bool) -> Path:
+    document = pymupdf.open()
+    page = document.new_page(width=842, height=595)
+    page.draw_rect(pymupdf.Rect(50, 50, 400, 300), color=(0, 0, 0), width=2)
+    if with_extra_room:
+        page.draw_rect(pymupdf.Rect(500, 100, 700, 250), color=(0, 0, 0), fill=(0, 0, 0))
+    document.save(path)
+    return path
+
+
+def test_pdf_to_image_renders_grayscale_by_default(tmp_path):
+    plan = _write_plan(tmp_path / "plan.pdf", with_extra_room=False)
+    comparator = PDFComparator(dpi=72)
+
+    gray = comparator._pdf_to_image(plan)
+    color = comparator._pdf_to_image(plan, color=True)
+
+    assert gray.shape == (595, 842)
+    assert color.shape == (595, 842, 3)
+
+
+def test_compare_pdfs_reports_added_region(tmp_path):
+    original = _write_plan(tmp_path / "original.pdf", with_extra_room=False)
+    modified = _write_plan(tmp_path / "modified.pdf", with_extra_room=True)
+
+    result = PDFComparator(dpi=72).compare_pdfs(original, modified, output_image_path=tmp_path / "diff.png")
+
+    assert result["change_count"] == 1
+    x, y, w, h = result["contours"][0]["bbox"]
+    assert (x, y) == pytest.approx((500, 100), abs=3)
+    assert (w, h) == pytest.approx((200, 150), abs=3)
+    assert Path(result["difference_image"]).stat().st_size > 0
+
+
+def test_compare_pdfs_skips_detection_for_unchanged_pages(tmp_path, monkeypatch):
+    original = _write_plan(tmp_path / "original.pdf", with_extra_room=False)
+    modified = _write_plan(tmp_path / "modified.pdf", with_extra_room=False)
+    monkeypatch.setattr(PDFComparator, "_change_mask", staticmethod(lambda *_: pytest.fail("mask built")))
+
+    result = PDFComparator(dpi=72).compare_pdfs(original, modified, output_image_path=tmp_path / "diff.png")
+
+    assert result["change_count"] == 0
+    assert result["contours"] == []
+    assert cv2.imread(result["difference_image"]).shape == (595, 842, 3)
+
+
+def test_compare_pdfs_renders_annotation_at_output_dpi(tmp_path):
+    original = _write_plan(tmp_path / "original.pdf", with_extra_room=False)
+    modified = _write_plan(tmp_path / "modified.pdf", with_extra_room=True)
+
+    result = PDFComparator(dpi=72, output_dpi=144).compare_pdfs(
+        original, modified, output_image_path=tmp_path / "diff.png"
+    )
+
+    assert result["dpi"] == 72
+    assert cv2.imread(result["difference_image"]).shape == (1190, 1684, 3)
+
+
+def test_change_mask_matches_open_close_reference():
+    rng = np.random.default_rng(7)
+    gray1 = rng.integers(0, 256, (120, 160), dtype=np.uint8)
+    gray2 = gray1.copy()
+    gray2[rng.random(gray1.shape) < 0.2] = 0
+    gray2[30:70, 40:110] = 255
+
+    diff = cv2.absdiff(gray1, gray2)
+    _, expected = cv2.threshold(diff, 30, 255, cv2.THRESH_BINARY)
+    kernel = np.ones((5, 5), np.uint8)
+    expected = cv2.morphologyEx(expected, cv2.MORPH_OPEN, kernel)
+    expected = cv2.morphologyEx(expected, cv2.MORPH_CLOSE, kernel)
+
+    assert np.array_equal(PDFComparator._change_mask(gray1, gray2), expected)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from app.models import DiffEntity, DiffPolygon
+from app.services.parsing import ParsedEntity
+from app.services.reports import REPORTLAB_AVAILABLE, _build_pdf_content, render_diff_pdf
+
+
+def _xref_offsets(content: bytes) -> list[int]:
+    xref_start = int(content.rsplit(b"startxref\n", 1)[1].split(b"\n", 1)[0])
+    assert content[xref_start:].startswith(b"xref\n")
+    return [int(offset) for offset in re.findall(rb"(\d{10}) 00000 n", content[xref_start:])]
+
+
+def test_stub_pdf_xref_points_at_each_object():
+    content = _build_pdf_content(["Floor Plan Diff Overlay", "Job: (abc)", "Diff entities: 3"])
+
+    offsets = _xref_offsets(content)
+
+    assert len(offsets) == 5
+    for index, offset in enumerate(offsets, start=1):
+        assert content[offset:].startswith(b"%d 0 obj\n" % index)
+    assert content.endswith(b"%%EOF")
+
+
+def test_stub_pdf_escapes_text():
+    content = _build_pdf_content(["a (b) \\ c"])
+
+    assert b"(a \\(b\\) \\\\ c) Tj" in content
+
+
+def test_stub_pdf_emits_single_text_object():
+    content = _build_pdf_content(["one", "two", "three"])
+
+    assert content.count(b"BT ") == 1
+    assert content.count(b" ET") == 1
+    assert b"(one) Tj 0 -20 Td (two) Tj 0 -20 Td (three) Tj" in content
+
+
+@pytest.mark.skipif(not REPORTLAB_AVAILABLE, reason="reportlab not installed")
+def test_render_diff_pdf_uses_palette_for_change_types(tmp_path):
+    entity = ParsedEntity(entity_id="e1", entity_type="LINE", vertices=[(0.0, 0.0), (10.0, 10.0)])
+    square = DiffPolygon(points=[(0.0, 0.0), (5.0, 0.0), (5.0, 5.0)])
+    diffs = [
+        DiffEntity(entity_id="d1", entity_type="LINE", change_type="added", polygon=square),
+        DiffEntity(entity_id="d2", entity_type="LINE", change_type="modified", polygon=square),
+    ]
+    output_path = tmp_path / "report.pdf"
+
+    assert render_diff_pdf(
+        "job-1",
+        original_entities=[entity],
+        revised_entities=[entity],
+        diff_entities=diffs,
+        output_path=output_path,
+    )
+    assert output_path.read_bytes().startswith(b"%PDF")
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from app.models import Envelope, HealthData, JobCreatedPayload, ok
+
+
+def test_ok_matches_envelope_serialization():
+    payload = JobCreatedPayload(job_id="abc", status="queued")
+
+    assert ok(payload) == Envelope(data=payload).model_dump(mode="json")
+    assert ok(HealthData()) == Envelope(data=HealthData()).model_dump(mode="json")
+    assert ok() == Envelope().model_dump(mode="json")
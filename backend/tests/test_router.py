@@ -0,0 +1,9 @@
+from app.main import app
+
+
+def test_api_routes_are_mounted_once_under_their_prefix():
+    paths = [route.path for route in app.routes]
+
+    assert "/api/enhanced/process-dwg" in paths
+    assert "/api/converter/analyze-request" in paths
+    assert not any(path.startswith(("/api/enhanced/enhanced", "/api/converter/converter")) for path in paths)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import stat
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from app.core.settings import get_settings
+from app.tasks import enhanced_jobs
+from app.tasks import jobs as tasks_module
+from app.tasks.jobs import _run_converter_batch
+
+
+@pytest.fixture
+def fake_converter(tmp_path) -> Path:
+    """Folder-based converter stand-in that records each invocation."""
+    calls = tmp_path / "calls.log"
+    script = tmp_path / "fake_oda.py"
+    script.write_text(
+        "import sys, pathlib\n"
+        f"pathlib.Path({str(calls)!r}).open('a').write('call\\n')\n"
+        "src, dst = pathlib.Path(sys.argv[1]), pathlib.Path(sys.argv[2])\n"
+        "for item in src.glob('*.dwg'):\n"
+        "    (dst / (item.stem + '.dxf')).write_bytes(item.read_bytes())\n",
+        encoding="utf-8",
+    )
+    launcher = tmp_path / "fake_oda"
+    launcher.write_text(f"#!/bin/sh\nexec {sys.executable} {script} \"$@\"\n", encoding="utf-8")
+    launcher.chmod(launcher.stat().st_mode | stat.S_IEXEC)
+    return launcher
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a POSIX shell launcher")
+def test_run_converter_batch_converts_all_inputs_in_one_process(tmp_path, fake_converter):
+    original = tmp_path / "uploads" / "original" / "plan.dwg"
+    revised = tmp_path / "uploads" / "revised" / "plan.dwg"
+    for path, content in ((original, b"original"), (revised, b"revised")):
+        path.parent.mkdir(parents=True)
+        path.write_bytes(content)
+    converted_dir = tmp_path / "converted"
+
+    _run_converter_batch(fake_converter, [("original", original), ("revised", revised)], converted_dir)
+
+    assert (tmp_path / "calls.log").read_text().count("call") == 1
+    assert (converted_dir / "original" / "plan.dxf").read_bytes() == b"original"
+    assert (converted_dir / "revised" / "plan.dxf").read_bytes() == b"revised"
+    assert sorted(p.name for p in converted_dir.iterdir()) == ["original", "revised"]
+
+
+def test_converter_path_is_resolved_once_per_setting(tmp_path, monkeypatch):
+    executable = tmp_path / "ODAFileConverter.exe"
+    executable.write_bytes(b"")
+    monkeypatch.setenv("FLOORPLAN_CONVERTER_PATH", str(executable))
+    monkeypatch.setattr(tasks_module, "_resolved_converters", {})
+    get_settings.cache_clear()
+    try:
+        assert tasks_module._converter_path() == executable.resolve()
+        executable.unlink()
+        assert tasks_module._converter_path() == executable.resolve()
+    finally:
+        get_settings.cache_clear()
+
+
+def test_converter_path_falls_back_to_search_path(monkeypatch):
+    monkeypatch.setattr(tasks_module, "_resolved_converters", {})
+    monkeypatch.setattr(tasks_module.shutil, "which", lambda name: "/opt/oda/ODAFileConverter")
+
+    assert tasks_module._resolve_converter("ODAFileConverter") == Path("/opt/oda/ODAFileConverter").resolve()
+
+
+def test_missing_converter_is_looked_up_again(monkeypatch):
+    monkeypatch.setattr(tasks_module, "_resolved_converters", {})
+    monkeypatch.setattr(tasks_module.shutil, "which", lambda name: None)
+    assert tasks_module._resolve_converter("ODAFileConverter") is None
+
+    monkeypatch.setattr(tasks_module.shutil, "which", lambda name: "/opt/oda/ODAFileConverter")
+    assert tasks_module._resolve_converter("ODAFileConverter") == Path("/opt/oda/ODAFileConverter").resolve()
+
+
+def test_convert_all_runs_both_conversions_concurrently(monkeypatch):
+    # Both calls must be in flight at once for the barrier to release
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_convert(input_path: str, output_path: str) -> bool:
+        barrier.wait()
+        return input_path == "a.dwg"
+
+    monkeypatch.setattr(enhanced_jobs, "convert_dwg_to_pdf", fake_convert)
+
+    results = enhanced_jobs._convert_all([("a.dwg", "a.pdf"), ("b.dwg", "b.pdf")], parallel=True)
+
+    assert results == [True, False]
+
+
+def test_convert_all_runs_serially_by_default(monkeypatch):
+    calls: list[str] = []
+    monkeypatch.setattr(enhanced_jobs, "convert_dwg_to_pdf", lambda source, _: calls.append(source) or True)
+
+    results = enhanced_jobs._convert_all([("a.dwg", "a.pdf"), ("b.dwg", "b.pdf")])
+
+    assert results == [True, True]
+    assert calls == ["a.dwg", "b.dwg"]
@@ -36,6 +36,7 @@ export type StoredFile = {
   path: string;
   size: number;
   checksum: string;
+  algorithm?: string;
   content_type?: string | null;
   kind?: string | null;
 };